@@ -0,0 +1,138 @@
+"""
+Micro-benchmarks for ppss.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_ppss
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from ppss import ProteinParser, compile_protein, parse_protein, reset_default_parser
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def small_definitions(n: int, seed: int = 0):
+    """
+    Builds a list of short, randomly generated protein definitions.
+
+    Args:
+        n (int): The number of definitions to build.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        List[str]: The generated definitions.
+    """
+    rng = random.Random(seed)
+    subunits = ["B1", "B2", "B3", "AA23", "XYZ789"]
+    templates = [
+        "{0} + {1}",
+        "({0} | {1}) + [{2}]",
+        "{0}{{2}} + {1}",
+        "{0} + ({1} | {2}) + {3}",
+    ]
+    return [rng.choice(templates).format(*rng.sample(subunits, 4)) for _ in range(n)]
+
+def report(name: str, seconds: float, calls: int) -> None:
+    print(f"{name:<40} {seconds * 1e6 / calls:10.1f} us/call  ({calls} calls)")
+
+# ----------------------------
+# Benchmarks
+# ----------------------------
+
+def bench_parse_protein(n: int = 2000) -> None:
+    """
+    Compares a fresh ProteinParser per call with the shared parser used by parse_protein.
+    """
+    definitions = small_definitions(n)
+
+    start = time.perf_counter()
+    for definition in definitions:
+        ProteinParser().parse(definition)
+    report("new ProteinParser() per call", time.perf_counter() - start, n)
+
+    reset_default_parser()
+    start = time.perf_counter()
+    for definition in definitions:
+        parse_protein(definition)
+    report("parse_protein (shared parser)", time.perf_counter() - start, n)
+
+def bench_parser_startup(n: int = 20) -> None:
+    """
+    Compares building a ProteinParser from the shipped parser table with compiling the grammar.
+    """
+    start = time.perf_counter()
+    for _ in range(n):
+        ProteinParser(use_parser_table=False)
+    report("ProteinParser() compiling grammar", time.perf_counter() - start, n)
+
+    start = time.perf_counter()
+    for _ in range(n):
+        ProteinParser(use_parser_table=True)
+    report("ProteinParser() from parser table", time.perf_counter() - start, n)
+
+def bench_long_definition(n: int = 5000, calls: int = 3) -> None:
+    """
+    Times compiling, expanding, counting and ranking a long linear definition.
+    """
+    subunits = [f"B{i}" for i in range(n)]
+    definition = " + ".join(subunits)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        compiled = compile_protein(definition)
+    report(f"compile {n}-term definition", time.perf_counter() - start, calls)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        ProteinParser.expand_protein(compiled.component)
+    report(f"expand {n}-term definition", time.perf_counter() - start, calls)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        compile_protein(definition).count_structures()
+    report(f"compile and count {n}-term definition", time.perf_counter() - start, calls)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        compiled.rank(subunits)
+    report(f"rank in {n}-term definition", time.perf_counter() - start, calls)
+
+def bench_expand_to(protein_definition: str = "(B1 | B2 | B3){10} + [C1]") -> None:
+    """
+    Measures the throughput of writing every structure of a definition to a file, in
+    structures and megabytes per second, against joining the full list first.
+    """
+    compiled = compile_protein(protein_definition)
+
+    def throughput(name, write):
+        with tempfile.TemporaryFile("w") as f:
+            start = time.perf_counter()
+            written = write(f)
+            f.flush()
+            seconds = time.perf_counter() - start
+            megabytes = os.fstat(f.fileno()).st_size / 1e6
+        print(f"{name:<40} {written / seconds:10.0f} structures/s  {megabytes / seconds:8.1f} MB/s")
+
+    def write_list(f):
+        structures = ProteinParser.structures_to_strings(ProteinParser.expand_protein(compiled.component))
+        f.write("".join(structure + "\n" for structure in structures))
+        return len(structures)
+
+    throughput("expand_protein + write (text)", write_list)
+    for format in ("text", "tsv", "jsonl"):
+        throughput(f"expand_to ({format})", lambda f: compiled.expand_to(f, format=format))
+
+def main() -> None:
+    bench_parse_protein()
+    bench_parser_startup()
+    bench_long_definition()
+    bench_expand_to()
+
+if __name__ == "__main__":
+    main()
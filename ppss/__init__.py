@@ -1,3 +1,67 @@
-from .ppss import ProteinParser, parse_protein
+from .diskcache import DiskCache
+from .analysis import DefinitionAnalysis
+from .dag import StructureDAG
+from .encoded import EncodedStructures
+from .ppss import (
+    __version__,
+    ProteinParser,
+    StructureSequence,
+    CompiledDefinition,
+    ExpansionLimitError,
+    parse_protein,
+    compile_protein,
+    parse_dag,
+    parse_encoded,
+    expand_to,
+    iter_structures,
+    count_structures,
+    count_distinct,
+    sample,
+    sample_weighted,
+    probability,
+    top_k,
+    rank,
+    rank_all,
+    analyze,
+    composition_counts,
+    parse_unordered,
+    matches,
+    get_default_parser,
+    reset_default_parser,
+)
+from .batch import BatchResult, parse_many, iter_parse_many
 
-__all__ = ["ProteinParser", "parse_protein"]
\ No newline at end of file
+__all__ = [
+    "__version__",
+    "DiskCache",
+    "DefinitionAnalysis",
+    "StructureDAG",
+    "EncodedStructures",
+    "ProteinParser",
+    "StructureSequence",
+    "CompiledDefinition",
+    "ExpansionLimitError",
+    "parse_protein",
+    "compile_protein",
+    "parse_dag",
+    "parse_encoded",
+    "expand_to",
+    "iter_structures",
+    "count_structures",
+    "count_distinct",
+    "sample",
+    "sample_weighted",
+    "probability",
+    "top_k",
+    "rank",
+    "rank_all",
+    "analyze",
+    "composition_counts",
+    "parse_unordered",
+    "matches",
+    "get_default_parser",
+    "reset_default_parser",
+    "BatchResult",
+    "parse_many",
+    "iter_parse_many",
+]
\ No newline at end of file
@@ -0,0 +1,693 @@
+# This file was generated by scripts/generate_parser_table.py. Do not edit it by hand.
+
+GRAMMAR_SHA256 = '90c603b64018bc0c72cdb853cc6b7e97b0281c2e71f0769ad2128a974ffca902'
+LARK_VERSION = '1.3.1'
+
+DATA = {'__type__': 'Lark',
+ 'options': {'_plugins': {},
+             'ambiguity': 'auto',
+             'cache': False,
+             'cache_grammar': False,
+             'debug': False,
+             'edit_terminals': None,
+             'g_regex_flags': 0,
+             'import_paths': [],
+             'keep_all_tokens': False,
+             'lexer': 'contextual',
+             'lexer_callbacks': {},
+             'maybe_placeholders': True,
+             'ordered_sets': True,
+             'parser': 'lalr',
+             'postlex': None,
+             'priority': 'normal',
+             'propagate_positions': False,
+             'regex': False,
+             'source_path': None,
+             'start': ['start'],
+             'strict': False,
+             'transformer': None,
+             'tree_class': None,
+             'use_bytes': False},
+ 'parser': {'__type__': 'ParsingFrontend',
+            'lexer_conf': {'__type__': 'LexerConf',
+                           'g_regex_flags': 0,
+                           'ignore': ['WS'],
+                           'lexer_type': 'contextual',
+                           'terminals': [{'@': 0},
+                                         {'@': 1},
+                                         {'@': 2},
+                                         {'@': 3},
+                                         {'@': 4},
+                                         {'@': 5},
+                                         {'@': 6},
+                                         {'@': 7},
+                                         {'@': 8},
+                                         {'@': 9},
+                                         {'@': 10},
+                                         {'@': 11},
+                                         {'@': 12}],
+                           'use_bytes': False},
+            'parser': {'end_states': {'start': 19},
+                       'start_states': {'start': 22},
+                       'states': {0: {0: (1, {'@': 34}),
+                                      1: (1, {'@': 34}),
+                                      2: (1, {'@': 34}),
+                                      3: (1, {'@': 34}),
+                                      4: (1, {'@': 34}),
+                                      5: (1, {'@': 34})},
+                                  1: {0: (1, {'@': 26}),
+                                      1: (1, {'@': 26}),
+                                      2: (1, {'@': 26}),
+                                      3: (1, {'@': 26}),
+                                      4: (1, {'@': 26}),
+                                      5: (1, {'@': 26})},
+                                  2: {2: (1, {'@': 14})},
+                                  3: {6: (1, {'@': 37}), 7: (1, {'@': 37})},
+                                  4: {0: (1, {'@': 29}),
+                                      1: (1, {'@': 29}),
+                                      2: (1, {'@': 29}),
+                                      3: (1, {'@': 29}),
+                                      4: (1, {'@': 29}),
+                                      5: (1, {'@': 29})},
+                                  5: {0: (1, {'@': 31}),
+                                      1: (1, {'@': 31}),
+                                      2: (1, {'@': 31}),
+                                      3: (1, {'@': 31}),
+                                      4: (1, {'@': 31}),
+                                      5: (1, {'@': 31}),
+                                      8: (1, {'@': 31})},
+                                  6: {0: (1, {'@': 19}),
+                                      1: (1, {'@': 19}),
+                                      2: (1, {'@': 19}),
+                                      3: (1, {'@': 19}),
+                                      4: (0, 7),
+                                      5: (1, {'@': 19})},
+                                  7: {9: (0, 18),
+                                      10: (0, 5),
+                                      11: (0, 17),
+                                      12: (0, 28),
+                                      13: (0, 33),
+                                      14: (0, 1),
+                                      15: (0, 31),
+                                      16: (0, 23),
+                                      17: (0, 36)},
+                                  8: {9: (0, 18),
+                                      10: (0, 5),
+                                      11: (0, 0),
+                                      12: (0, 28),
+                                      13: (0, 33),
+                                      14: (0, 1),
+                                      15: (0, 31),
+                                      16: (0, 23),
+                                      17: (0, 36)},
+                                  9: {9: (0, 18),
+                                      10: (0, 5),
+                                      13: (0, 24),
+                                      15: (0, 31),
+                                      16: (0, 23),
+                                      18: (0, 25),
+                                      19: (0, 16)},
+                                  10: {7: (0, 40), 20: (0, 21)},
+                                  11: {0: (1, {'@': 28}),
+                                       1: (1, {'@': 28}),
+                                       2: (1, {'@': 28}),
+                                       3: (1, {'@': 28}),
+                                       4: (1, {'@': 28}),
+                                       5: (1, {'@': 28})},
+                                  12: {0: (1, {'@': 16}),
+                                       2: (1, {'@': 16}),
+                                       3: (0, 9),
+                                       5: (1, {'@': 16}),
+                                       21: (0, 30)},
+                                  13: {0: (1, {'@': 25}),
+                                       1: (1, {'@': 25}),
+                                       2: (1, {'@': 25}),
+                                       3: (1, {'@': 25}),
+                                       4: (1, {'@': 25}),
+                                       5: (1, {'@': 25}),
+                                       8: (0, 10)},
+                                  14: {0: (1, {'@': 17}),
+                                       2: (1, {'@': 17}),
+                                       3: (1, {'@': 17}),
+                                       5: (1, {'@': 17})},
+                                  15: {0: (1, {'@': 33}),
+                                       2: (1, {'@': 33}),
+                                       3: (1, {'@': 33}),
+                                       5: (1, {'@': 33})},
+                                  16: {0: (1, {'@': 18}),
+                                       1: (0, 37),
+                                       2: (1, {'@': 18}),
+                                       3: (1, {'@': 18}),
+                                       5: (1, {'@': 18})},
+                                  17: {0: (1, {'@': 35}),
+                                       1: (1, {'@': 35}),
+                                       2: (1, {'@': 35}),
+                                       3: (1, {'@': 35}),
+                                       4: (1, {'@': 35}),
+                                       5: (1, {'@': 35})},
+                                  18: {9: (0, 18),
+                                       10: (0, 5),
+                                       13: (0, 24),
+                                       15: (0, 31),
+                                       16: (0, 23),
+                                       18: (0, 12),
+                                       19: (0, 16),
+                                       22: (0, 29)},
+                                  19: {},
+                                  20: {0: (1, {'@': 27}),
+                                       1: (1, {'@': 27}),
+                                       2: (1, {'@': 27}),
+                                       3: (1, {'@': 27}),
+                                       4: (1, {'@': 27}),
+                                       5: (1, {'@': 27})},
+                                  21: {6: (0, 11), 7: (0, 3)},
+                                  22: {9: (0, 18),
+                                       10: (0, 5),
+                                       13: (0, 24),
+                                       15: (0, 31),
+                                       16: (0, 23),
+                                       18: (0, 12),
+                                       19: (0, 16),
+                                       22: (0, 2),
+                                       23: (0, 19),
+                                       24: (0, 35)},
+                                  23: {0: (1, {'@': 24}),
+                                       1: (1, {'@': 24}),
+                                       2: (1, {'@': 24}),
+                                       3: (1, {'@': 24}),
+                                       4: (1, {'@': 24}),
+                                       5: (1, {'@': 24}),
+                                       8: (0, 38)},
+                                  24: {0: (1, {'@': 20}),
+                                       1: (1, {'@': 20}),
+                                       2: (1, {'@': 20}),
+                                       3: (1, {'@': 20}),
+                                       4: (0, 8),
+                                       5: (1, {'@': 20}),
+                                       25: (0, 6)},
+                                  25: {0: (1, {'@': 32}),
+                                       2: (1, {'@': 32}),
+                                       3: (1, {'@': 32}),
+                                       5: (1, {'@': 32})},
+                                  26: {0: (1, {'@': 30}),
+                                       1: (0, 27),
+                                       2: (1, {'@': 30}),
+                                       3: (1, {'@': 30}),
+                                       4: (1, {'@': 30}),
+                                       5: (1, {'@': 30})},
+                                  27: {26: (0, 4)},
+                                  28: {0: (1, {'@': 22}),
+                                       1: (1, {'@': 22}),
+                                       2: (1, {'@': 22}),
+                                       3: (1, {'@': 22}),
+                                       4: (1, {'@': 22}),
+                                       5: (1, {'@': 22})},
+                                  29: {5: (0, 13)},
+                                  30: {0: (1, {'@': 15}),
+                                       2: (1, {'@': 15}),
+                                       3: (0, 32),
+                                       5: (1, {'@': 15})},
+                                  31: {0: (1, {'@': 23}),
+                                       1: (1, {'@': 23}),
+                                       2: (1, {'@': 23}),
+                                       3: (1, {'@': 23}),
+                                       4: (1, {'@': 23}),
+                                       5: (1, {'@': 23})},
+                                  32: {9: (0, 18),
+                                       10: (0, 5),
+                                       13: (0, 24),
+                                       15: (0, 31),
+                                       16: (0, 23),
+                                       18: (0, 15),
+                                       19: (0, 16)},
+                                  33: {0: (1, {'@': 21}),
+                                       1: (1, {'@': 21}),
+                                       2: (1, {'@': 21}),
+                                       3: (1, {'@': 21}),
+                                       4: (1, {'@': 21}),
+                                       5: (1, {'@': 21})},
+                                  34: {6: (0, 20), 7: (0, 3)},
+                                  35: {2: (1, {'@': 13})},
+                                  36: {9: (0, 18),
+                                       10: (0, 5),
+                                       13: (0, 24),
+                                       15: (0, 31),
+                                       16: (0, 23),
+                                       18: (0, 12),
+                                       19: (0, 16),
+                                       22: (0, 39)},
+                                  37: {26: (0, 14)},
+                                  38: {7: (0, 40), 20: (0, 34)},
+                                  39: {0: (0, 26)},
+                                  40: {6: (1, {'@': 36}), 7: (1, {'@': 36})}},
+                       'tokens': {0: 'RSQB',
+                                  1: 'AT',
+                                  2: '$END',
+                                  3: 'VBAR',
+                                  4: 'PLUS',
+                                  5: 'RPAR',
+                                  6: 'RBRACE',
+                                  7: 'DIGIT',
+                                  8: 'LBRACE',
+                                  9: 'LPAR',
+                                  10: 'SUBUNIT',
+                                  11: 'term',
+                                  12: 'optional_term',
+                                  13: 'required_term',
+                                  14: 'optional',
+                                  15: 'multiplicity',
+                                  16: 'subunit',
+                                  17: 'LSQB',
+                                  18: 'option',
+                                  19: 'concatenation',
+                                  20: '__multiplicity_plus_2',
+                                  21: '__alternation_star_0',
+                                  22: 'alternation',
+                                  23: 'start',
+                                  24: 'protein',
+                                  25: '__concatenation_star_1',
+                                  26: 'WEIGHT'}},
+            'parser_conf': {'__type__': 'ParserConf',
+                            'parser_type': 'lalr',
+                            'rules': [{'@': 13},
+                                      {'@': 14},
+                                      {'@': 15},
+                                      {'@': 16},
+                                      {'@': 17},
+                                      {'@': 18},
+                                      {'@': 19},
+                                      {'@': 20},
+                                      {'@': 21},
+                                      {'@': 22},
+                                      {'@': 23},
+                                      {'@': 24},
+                                      {'@': 25},
+                                      {'@': 26},
+                                      {'@': 27},
+                                      {'@': 28},
+                                      {'@': 29},
+                                      {'@': 30},
+                                      {'@': 31},
+                                      {'@': 32},
+                                      {'@': 33},
+                                      {'@': 34},
+                                      {'@': 35},
+                                      {'@': 36},
+                                      {'@': 37}],
+                            'start': ['start']}},
+ 'rules': [{'@': 13},
+           {'@': 14},
+           {'@': 15},
+           {'@': 16},
+           {'@': 17},
+           {'@': 18},
+           {'@': 19},
+           {'@': 20},
+           {'@': 21},
+           {'@': 22},
+           {'@': 23},
+           {'@': 24},
+           {'@': 25},
+           {'@': 26},
+           {'@': 27},
+           {'@': 28},
+           {'@': 29},
+           {'@': 30},
+           {'@': 31},
+           {'@': 32},
+           {'@': 33},
+           {'@': 34},
+           {'@': 35},
+           {'@': 36},
+           {'@': 37}]}
+
+MEMO = {0: {'__type__': 'TerminalDef',
+     'name': 'WS',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [1, 18446744073709551616],
+                 'flags': [],
+                 'raw': None,
+                 'value': '(?:[ \t\x0c\r\n])+'},
+     'priority': 0},
+ 1: {'__type__': 'TerminalDef',
+     'name': 'SUBUNIT',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [1, 18446744073709551616],
+                 'flags': [],
+                 'raw': '/[A-Za-z0-9]+/',
+                 'value': '[A-Za-z0-9]+'},
+     'priority': 0},
+ 2: {'__type__': 'TerminalDef',
+     'name': 'DIGIT',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [1, 1],
+                 'flags': [],
+                 'raw': None,
+                 'value': '(?:0|1|2|3|4|5|6|7|8|9)'},
+     'priority': 0},
+ 3: {'__type__': 'TerminalDef',
+     'name': 'WEIGHT',
+     'pattern': {'__type__': 'PatternRE',
+                 '_width': [1, 18446744073709551616],
+                 'flags': [],
+                 'raw': '/([0-9]+([.][0-9]*)?|[.][0-9]+)([eE][+-]?[0-9]+)?/',
+                 'value': '([0-9]+([.][0-9]*)?|[.][0-9]+)([eE][+-]?[0-9]+)?'},
+     'priority': 0},
+ 4: {'__type__': 'TerminalDef',
+     'name': 'VBAR',
+     'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '"|"', 'value': '|'},
+     'priority': 0},
+ 5: {'__type__': 'TerminalDef',
+     'name': 'AT',
+     'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '"@"', 'value': '@'},
+     'priority': 0},
+ 6: {'__type__': 'TerminalDef',
+     'name': 'PLUS',
+     'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '"+"', 'value': '+'},
+     'priority': 0},
+ 7: {'__type__': 'TerminalDef',
+     'name': 'LPAR',
+     'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '"("', 'value': '('},
+     'priority': 0},
+ 8: {'__type__': 'TerminalDef',
+     'name': 'RPAR',
+     'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '")"', 'value': ')'},
+     'priority': 0},
+ 9: {'__type__': 'TerminalDef',
+     'name': 'LBRACE',
+     'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '"{"', 'value': '{'},
+     'priority': 0},
+ 10: {'__type__': 'TerminalDef',
+      'name': 'RBRACE',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '"}"', 'value': '}'},
+      'priority': 0},
+ 11: {'__type__': 'TerminalDef',
+      'name': 'LSQB',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '"["', 'value': '['},
+      'priority': 0},
+ 12: {'__type__': 'TerminalDef',
+      'name': 'RSQB',
+      'pattern': {'__type__': 'PatternStr', 'flags': [], 'raw': '"]"', 'value': ']'},
+      'priority': 0},
+ 13: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'protein'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'start'}},
+ 14: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'alternation'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'protein'}},
+ 15: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'option'},
+                    {'__type__': 'NonTerminal', 'name': '__alternation_star_0'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'alternation'}},
+ 16: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'option'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'alternation'}},
+ 17: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'concatenation'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'AT'},
+                    {'__type__': 'Terminal', 'filter_out': False, 'name': 'WEIGHT'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'option'}},
+ 18: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'concatenation'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'option'}},
+ 19: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'required_term'},
+                    {'__type__': 'NonTerminal', 'name': '__concatenation_star_1'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'concatenation'}},
+ 20: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'required_term'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'concatenation'}},
+ 21: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'required_term'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'term'}},
+ 22: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'optional_term'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': True,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'term'}},
+ 23: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'multiplicity'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'required_term'}},
+ 24: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'subunit'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'required_term'}},
+ 25: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                    {'__type__': 'NonTerminal', 'name': 'alternation'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 2,
+      'origin': {'__type__': 'NonTerminal', 'name': 'required_term'}},
+ 26: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'optional'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'optional_term'}},
+ 27: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': 'subunit'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'LBRACE'},
+                    {'__type__': 'NonTerminal', 'name': '__multiplicity_plus_2'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RBRACE'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'multiplicity'}},
+ 28: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'LPAR'},
+                    {'__type__': 'NonTerminal', 'name': 'alternation'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RPAR'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'LBRACE'},
+                    {'__type__': 'NonTerminal', 'name': '__multiplicity_plus_2'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RBRACE'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'multiplicity'}},
+ 29: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'LSQB'},
+                    {'__type__': 'NonTerminal', 'name': 'alternation'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'AT'},
+                    {'__type__': 'Terminal', 'filter_out': False, 'name': 'WEIGHT'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'optional'}},
+ 30: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'LSQB'},
+                    {'__type__': 'NonTerminal', 'name': 'alternation'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'RSQB'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': 'optional'}},
+ 31: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'SUBUNIT'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': 'subunit'}},
+ 32: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'VBAR'},
+                    {'__type__': 'NonTerminal', 'name': 'option'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': '__alternation_star_0'}},
+ 33: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': '__alternation_star_0'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'VBAR'},
+                    {'__type__': 'NonTerminal', 'name': 'option'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': '__alternation_star_0'}},
+ 34: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': True, 'name': 'PLUS'},
+                    {'__type__': 'NonTerminal', 'name': 'term'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': '__concatenation_star_1'}},
+ 35: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': '__concatenation_star_1'},
+                    {'__type__': 'Terminal', 'filter_out': True, 'name': 'PLUS'},
+                    {'__type__': 'NonTerminal', 'name': 'term'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': '__concatenation_star_1'}},
+ 36: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'Terminal', 'filter_out': False, 'name': 'DIGIT'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 0,
+      'origin': {'__type__': 'NonTerminal', 'name': '__multiplicity_plus_2'}},
+ 37: {'__type__': 'Rule',
+      'alias': None,
+      'expansion': [{'__type__': 'NonTerminal', 'name': '__multiplicity_plus_2'},
+                    {'__type__': 'Terminal', 'filter_out': False, 'name': 'DIGIT'}],
+      'options': {'__type__': 'RuleOptions',
+                  'empty_indices': (),
+                  'expand1': False,
+                  'keep_all_tokens': False,
+                  'priority': None,
+                  'template_source': None},
+      'order': 1,
+      'origin': {'__type__': 'NonTerminal', 'name': '__multiplicity_plus_2'}}}
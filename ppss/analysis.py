@@ -0,0 +1,206 @@
+from collections import namedtuple
+from typing import Dict, Tuple
+
+from .components import (
+    ProteinComponent,
+    Subunit,
+    Concatenation,
+    Alternation,
+    Multiplicity,
+    OptionalComponent,
+    iter_postorder,
+)
+
+# ----------------------------
+# Static Analysis
+# ----------------------------
+
+DefinitionAnalysis = namedtuple("DefinitionAnalysis", ["min_length", "max_length", "nullable", "subunits"])
+DefinitionAnalysis.__doc__ = """
+Bounds on the structures of a protein definition, computed without expanding it.
+
+Every bound is tight: some structure has exactly min_length subunits, and for each
+subunit ID some structure has exactly its minimum number of copies.
+
+Attributes:
+    min_length (int): The fewest subunits in any structure.
+    max_length (int): The most subunits in any structure.
+    nullable (bool): Whether the empty structure is possible.
+    subunits (Dict[str, Tuple[int, int]]): The fewest and most copies of each subunit
+        ID in any structure, in order of first appearance in the definition.
+"""
+
+def analyze_component(component: ProteinComponent) -> DefinitionAnalysis:
+    """
+    Computes length and subunit copy number bounds for a ProteinComponent by interval
+    arithmetic over the tree, in time proportional to the size of the tree times the
+    number of distinct subunits.
+
+    Concatenations and multiplicities add the intervals of their parts, alternations
+    take the smallest minimum and largest maximum of their options, and optional
+    components lower the minimum to zero.
+
+    Args:
+        component (ProteinComponent): The protein component to analyse.
+
+    Returns:
+        DefinitionAnalysis: The bounds on its structures.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    # Each node maps to ((min length, max length), {subunit: (min copies, max copies)})
+    bounds: Dict[int, Tuple[Tuple[int, int], Dict[str, Tuple[int, int]]]] = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            result = ((1, 1), {node.id: (1, 1)})
+        elif isinstance(node, (Concatenation, Multiplicity)):
+            if isinstance(node, Concatenation):
+                parts = [(bounds[id(part)], 1) for part in node.components]
+            else:
+                parts = [(bounds[id(node.component)], node.count)]
+            low = high = 0
+            copies: Dict[str, Tuple[int, int]] = {}
+            for ((part_low, part_high), part_copies), times in parts:
+                low += part_low * times
+                high += part_high * times
+                for subunit, (fewest, most) in part_copies.items():
+                    previous_fewest, previous_most = copies.get(subunit, (0, 0))
+                    copies[subunit] = (previous_fewest + fewest * times, previous_most + most * times)
+            result = ((low, high), copies)
+        elif isinstance(node, Alternation):
+            options = [bounds[id(option)] for option in node.options]
+            low = min(option_low for (option_low, _), _ in options)
+            high = max(option_high for (_, option_high), _ in options)
+            copies = {}
+            for _, option_copies in options:
+                for subunit in option_copies:
+                    copies.setdefault(subunit, None)
+            for subunit in copies:
+                # An option without the subunit has zero copies of it
+                ranges = [option_copies.get(subunit, (0, 0)) for _, option_copies in options]
+                copies[subunit] = (min(fewest for fewest, _ in ranges), max(most for _, most in ranges))
+            result = ((low, high), copies)
+        elif isinstance(node, OptionalComponent):
+            (_, high), component_copies = bounds[id(node.component)]
+            result = ((0, high), {subunit: (0, most) for subunit, (_, most) in component_copies.items()})
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        bounds[id(node)] = result
+    (low, high), copies = bounds[id(component)]
+    return DefinitionAnalysis(low, high, low == 0, copies)
+
+# ----------------------------
+# Composition Counting
+# ----------------------------
+
+def _add_exponents(left: tuple, right: tuple) -> tuple:
+    # Exponents are sparse: sorted (subunit ID, power) pairs with nonzero powers
+    if not left:
+        return right
+    if not right:
+        return left
+    powers = dict(left)
+    for subunit, power in right:
+        powers[subunit] = powers.get(subunit, 0) + power
+    return tuple(sorted(powers.items()))
+
+def _multiply(left: Dict[tuple, int], right: Dict[tuple, int]) -> Dict[tuple, int]:
+    # Multiplies two polynomials keyed by their exponents
+    product: Dict[tuple, int] = {}
+    for left_exponents, left_coefficient in left.items():
+        for right_exponents, right_coefficient in right.items():
+            exponents = _add_exponents(left_exponents, right_exponents)
+            product[exponents] = product.get(exponents, 0) + left_coefficient * right_coefficient
+    return product
+
+def _power(base: Dict[tuple, int], exponent: int) -> Dict[tuple, int]:
+    # Multiplies by the base one copy at a time: the number of compositions grows
+    # with every copy, so this beats squaring, which multiplies two large polynomials
+    result = {(): 1}
+    for _ in range(exponent):
+        result = _multiply(result, base)
+    return result
+
+def composition_counts_component(component: ProteinComponent) -> Dict[Tuple[Tuple[str, int], ...], int]:
+    """
+    Counts the structures a ProteinComponent expands to by their composition, the
+    number of copies of each subunit regardless of order, without expanding them.
+
+    Each node is turned into a polynomial with one variable per subunit ID, in which the
+    coefficient of a monomial is the number of the node's structures with that
+    composition. A Subunit is its variable, a Concatenation multiplies its parts, a
+    Multiplicity raises its component to a power, an Alternation
+    adds its options and an OptionalComponent adds the constant 1 for the empty choice.
+
+    Args:
+        component (ProteinComponent): The protein component to analyse.
+
+    Returns:
+        Dict[Tuple[Tuple[str, int], ...], int]: The number of structures, including
+            duplicates, with each composition. A composition is a tuple of (subunit ID,
+            copies) pairs sorted by subunit ID, leaving out subunits with no copies, so
+            dict(composition) gives it as a dictionary. Compositions are in sorted order.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    polynomials: Dict[int, Dict[tuple, int]] = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            polynomial = {((node.id, 1),): 1}
+        elif isinstance(node, Concatenation):
+            # Parts with a single composition are summed in one pass, so long linear
+            # definitions do not rebuild a growing monomial at every step
+            powers: Dict[str, int] = {}
+            coefficient = 1
+            polynomial = None
+            for part in node.components:
+                part_polynomial = polynomials[id(part)]
+                if len(part_polynomial) == 1:
+                    (exponents, part_coefficient), = part_polynomial.items()
+                    coefficient *= part_coefficient
+                    for subunit, power in exponents:
+                        powers[subunit] = powers.get(subunit, 0) + power
+                else:
+                    polynomial = part_polynomial if polynomial is None else _multiply(polynomial, part_polynomial)
+            monomial = {tuple(sorted(powers.items())): coefficient}
+            polynomial = monomial if polynomial is None else _multiply(polynomial, monomial)
+        elif isinstance(node, Multiplicity):
+            polynomial = _power(polynomials[id(node.component)], node.count)
+        elif isinstance(node, (Alternation, OptionalComponent)):
+            options = node.options if isinstance(node, Alternation) else [node.component]
+            polynomial = {} if isinstance(node, Alternation) else {(): 1}
+            for option in options:
+                for exponents, coefficient in polynomials[id(option)].items():
+                    polynomial[exponents] = polynomial.get(exponents, 0) + coefficient
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        polynomials[id(node)] = polynomial
+    return dict(sorted(polynomials[id(component)].items()))
+
+def unordered_structures_component(component: ProteinComponent) -> Dict[str, int]:
+    """
+    Lists the distinct multisets of subunits a ProteinComponent expands to, ignoring
+    the order of subunits, with the number of ordered structures behind each one.
+
+    The multisets come from composition_counts_component(), so permutations are never
+    generated: (B1 | B2){n} gives n + 1 multisets rather than 2 ** n structures.
+
+    Args:
+        component (ProteinComponent): The protein component to expand.
+
+    Returns:
+        Dict[str, int]: The number of structures, including duplicates, with each
+            multiset. A multiset is written like a structure with its subunit IDs in
+            sorted order, such as "B1 + B1 + B2", and the multisets are in sorted order
+            of their subunit lists, starting with the empty structure if it is possible.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    multisets = sorted(
+        ([subunit for subunit, copies in composition for _ in range(copies)], count)
+        for composition, count in composition_counts_component(component).items()
+    )
+    return {" + ".join(subunits): count for subunits, count in multisets}
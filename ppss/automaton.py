@@ -0,0 +1,279 @@
+import threading
+from collections import namedtuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from .components import (
+    ProteinComponent,
+    Subunit,
+    Concatenation,
+    Alternation,
+    Multiplicity,
+    OptionalComponent,
+)
+
+# ----------------------------
+# Automaton Definition
+# ----------------------------
+
+DEAD_STATE = -1
+
+MinimizedDFA = namedtuple("MinimizedDFA", ["start", "accepting", "transitions"])
+MinimizedDFA.__doc__ = """
+The minimal deterministic automaton accepting the structures of a ProteinAutomaton.
+
+States are numbered so that every transition leads to a lower-numbered state, and the
+start state is the last one.
+
+Attributes:
+    start (int): The start state.
+    accepting (Tuple[bool, ...]): Whether each state ends a complete structure.
+    transitions (Tuple[Dict[str, int], ...]): The target of each state for each subunit
+        ID it has a transition for.
+"""
+
+class ProteinAutomaton:
+    """
+    A finite automaton over subunit IDs that accepts exactly the structures a
+    ProteinComponent expands to.
+
+    The component tree is compiled into a nondeterministic automaton (NFA) in which
+    each edge is labelled with a subunit ID, or None for an empty move. Because the
+    protein grammar has no unbounded repetition, the automaton is acyclic. A
+    deterministic automaton (DFA) is built from it on demand by subset construction,
+    one state and transition at a time, and cached so repeated matching against the
+    same definition runs in time linear in the length of the structure.
+
+    Attributes:
+        edges (List[List[Tuple[Optional[str], int]]]): The outgoing NFA edges of each
+            state as (subunit ID or None, target state) pairs, in expansion order.
+        start (int): The NFA start state.
+        accept (int): The NFA accepting state.
+    """
+
+    def __init__(self, component: ProteinComponent):
+        """
+        Compiles a ProteinComponent into an NFA.
+
+        Args:
+            component (ProteinComponent): The protein component to compile.
+
+        Raises:
+            ValueError: If an unknown ProteinComponent type is encountered.
+        """
+        self.edges = [[], []]
+        self.start = 0
+        self.accept = 1
+        self._build(component)
+        self._lock = threading.Lock()
+        self._dfa_ids: Dict[FrozenSet[int], int] = {}
+        self._dfa_sets: List[FrozenSet[int]] = []
+        self._dfa_accepting: List[bool] = []
+        self._dfa_transitions: List[Dict[str, int]] = []
+        self._dfa_state(self._closure((self.start,)))
+
+    def _new_state(self) -> int:
+        self.edges.append([])
+        return len(self.edges) - 1
+
+    def _build(self, component: ProteinComponent) -> None:
+        # Each task wires a component between two states. Tasks are pushed in reverse
+        # so that edges leaving a state are added in expansion order.
+        tasks = [(component, self.start, self.accept)]
+        while tasks:
+            node, source, target = tasks.pop()
+            if isinstance(node, Subunit):
+                self.edges[source].append((node.id, target))
+            elif isinstance(node, (Concatenation, Multiplicity)):
+                parts = node.components if isinstance(node, Concatenation) else [node.component] * node.count
+                if not parts:
+                    self.edges[source].append((None, target))
+                    continue
+                # Chain the parts through fresh intermediate states
+                states = [source] + [self._new_state() for _ in range(len(parts) - 1)] + [target]
+                for index in reversed(range(len(parts))):
+                    tasks.append((parts[index], states[index], states[index + 1]))
+            elif isinstance(node, Alternation):
+                tasks.extend((option, source, target) for option in reversed(node.options))
+            elif isinstance(node, OptionalComponent):
+                # None stands for the empty move that skips the component
+                tasks.append((None, source, target))
+                tasks.append((node.component, source, target))
+            elif node is None:
+                self.edges[source].append((None, target))
+            else:
+                raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+
+    @property
+    def state_count(self) -> int:
+        """
+        The number of NFA states.
+        """
+        return len(self.edges)
+
+    def _closure(self, states: Iterable[int]) -> FrozenSet[int]:
+        closure = set(states)
+        stack = list(closure)
+        while stack:
+            for label, target in self.edges[stack.pop()]:
+                if label is None and target not in closure:
+                    closure.add(target)
+                    stack.append(target)
+        return frozenset(closure)
+
+    def _dfa_state(self, states: FrozenSet[int]) -> int:
+        state = self._dfa_ids.get(states)
+        if state is None:
+            state = len(self._dfa_sets)
+            self._dfa_ids[states] = state
+            self._dfa_sets.append(states)
+            self._dfa_accepting.append(self.accept in states)
+            self._dfa_transitions.append({})
+        return state
+
+    def step(self, state: int, subunit: str) -> int:
+        """
+        Follows the DFA transition for one subunit, building it if it is not cached yet.
+
+        Args:
+            state (int): The current DFA state, starting from 0.
+            subunit (str): The next subunit ID.
+
+        Returns:
+            int: The next DFA state, or DEAD_STATE if no structure continues this way.
+        """
+        if state == DEAD_STATE:
+            return DEAD_STATE
+        transitions = self._dfa_transitions[state]
+        target = transitions.get(subunit)
+        if target is None:
+            with self._lock:
+                moved = [
+                    next_state
+                    for nfa_state in self._dfa_sets[state]
+                    for label, next_state in self.edges[nfa_state]
+                    if label == subunit
+                ]
+                target = self._dfa_state(self._closure(moved)) if moved else DEAD_STATE
+                transitions[subunit] = target
+        return target
+
+    def labels(self, state: int) -> List[str]:
+        """
+        Returns the subunit IDs a DFA state has transitions for, in sorted order.
+        """
+        if state == DEAD_STATE:
+            return []
+        return sorted({
+            label for nfa_state in self._dfa_sets[state] for label, _ in self.edges[nfa_state] if label is not None
+        })
+
+    @property
+    def dfa_state_count(self) -> int:
+        """
+        The number of DFA states built so far.
+        """
+        return len(self._dfa_sets)
+
+    def determinize(self, max_states: Optional[int] = None) -> bool:
+        """
+        Builds every reachable DFA state and transition, which is always possible
+        because the automaton is acyclic, but can take up to exponentially many states.
+
+        Args:
+            max_states (int, optional): Stop once more than this many DFA states have
+                been built. States built so far are kept.
+
+        Returns:
+            bool: True if the DFA was completed within max_states.
+        """
+        stack = [0]
+        visited = {0}
+        while stack:
+            state = stack.pop()
+            for label in self.labels(state):
+                target = self.step(state, label)
+                if max_states is not None and self.dfa_state_count > max_states:
+                    return False
+                if target != DEAD_STATE and target not in visited:
+                    visited.add(target)
+                    stack.append(target)
+        return True
+
+    def is_accepting(self, state: int) -> bool:
+        """
+        Returns whether a DFA state ends a complete structure.
+        """
+        return state != DEAD_STATE and self._dfa_accepting[state]
+
+    def matches(self, tokens: Sequence[str]) -> bool:
+        """
+        Checks whether a structure is produced by the compiled component.
+
+        Args:
+            tokens (Sequence[str]): The subunit IDs of the structure, in order.
+
+        Returns:
+            bool: True if the component expands to this structure.
+        """
+        state = 0
+        for subunit in tokens:
+            state = self.step(state, subunit)
+            if state == DEAD_STATE:
+                return False
+        return self.is_accepting(state)
+
+    def minimize(self) -> MinimizedDFA:
+        """
+        Builds the whole DFA and merges equivalent states into the minimal DFA.
+
+        The DFA is acyclic, so it is minimized in one pass from the final states back to
+        the start: a state is merged with an earlier one when both are accepting or both
+        are not and their transitions lead to the same merged states.
+
+        Returns:
+            MinimizedDFA: The minimal DFA.
+        """
+        self.determinize()
+        transitions = self._dfa_transitions
+        # Visit the DFA states reachable from the start, children before parents
+        postorder = []
+        visited = {0}
+        stack = [(0, iter(self.labels(0)))]
+        while stack:
+            state, remaining = stack[-1]
+            for label in remaining:
+                target = transitions[state][label]
+                if target not in visited:
+                    visited.add(target)
+                    stack.append((target, iter(self.labels(target))))
+                    break
+            else:
+                postorder.append(state)
+                stack.pop()
+
+        merged: Dict[int, int] = {}
+        interned: Dict[Tuple[bool, tuple], int] = {}
+        for state in postorder:
+            signature = (
+                self._dfa_accepting[state],
+                tuple((label, merged[transitions[state][label]]) for label in self.labels(state)),
+            )
+            merged[state] = interned.setdefault(signature, len(interned))
+        accepting = [False] * len(interned)
+        minimized_transitions: List[Dict[str, int]] = [{}] * len(interned)
+        for (state_accepting, state_transitions), state in interned.items():
+            accepting[state] = state_accepting
+            minimized_transitions[state] = dict(state_transitions)
+        return MinimizedDFA(merged[0], tuple(accepting), tuple(minimized_transitions))
+
+    def count_distinct(self) -> int:
+        """
+        Returns the number of distinct structures the automaton accepts, counted as
+        paths through the minimal DFA.
+        """
+        dfa = self.minimize()
+        # Transitions lead to lower-numbered states, so targets are counted first
+        counts: List[int] = []
+        for accepting, state_transitions in zip(dfa.accepting, dfa.transitions):
+            counts.append(int(accepting) + sum(counts[target] for target in state_transitions.values()))
+        return counts[dfa.start]
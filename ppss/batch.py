@@ -0,0 +1,170 @@
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .ppss import ProteinParser, get_default_parser
+
+# ----------------------------
+# Batch Results
+# ----------------------------
+
+BatchResult = namedtuple("BatchResult", ["index", "definition", "structures", "error"])
+BatchResult.__doc__ = """
+The outcome of parsing one definition in a batch.
+
+Attributes:
+    index (int): The position of the definition in the input.
+    definition (str): The protein definition string.
+    structures (Optional[List[str]]): The possible protein structures, or None if parsing failed.
+    error (Optional[Exception]): The exception raised while parsing, or None if parsing succeeded.
+"""
+
+# ----------------------------
+# Worker Functions
+# ----------------------------
+
+# The warm parser of each worker process, built once by _init_worker
+_worker_parser: Optional[ProteinParser] = None
+
+def _init_worker(parser_options: Dict[str, Any]) -> None:
+    global _worker_parser
+    _worker_parser = ProteinParser(**parser_options)
+
+def _parse_chunk(parser: ProteinParser, chunk: List[Tuple[int, str]]) -> List[BatchResult]:
+    results = []
+    for index, definition in chunk:
+        try:
+            results.append(BatchResult(index, definition, parser.parse(definition), None))
+        except Exception as e:
+            results.append(BatchResult(index, definition, None, e))
+    return results
+
+def _parse_chunk_in_worker(chunk: List[Tuple[int, str]]) -> List[BatchResult]:
+    return _parse_chunk(_worker_parser, chunk)
+
+def _chunked(definitions: Iterable[str], chunksize: int) -> Iterator[List[Tuple[int, str]]]:
+    numbered = enumerate(definitions)
+    while True:
+        chunk = list(islice(numbered, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+# ----------------------------
+# Batch Parsing Functions
+# ----------------------------
+
+def iter_parse_many(
+    definitions: Iterable[str],
+    jobs: Optional[int] = None,
+    chunksize: int = 64,
+    ordered: bool = True,
+    parser_options: Optional[Dict[str, Any]] = None,
+) -> Iterator[BatchResult]:
+    """
+    Parses many protein definitions in parallel, yielding results as they become available.
+
+    Definitions are sent to a pool of worker processes in chunks. Each worker builds one
+    ProteinParser when it starts and reuses it for every chunk it receives. At most two
+    chunks per worker are held at any time, counting both chunks being parsed and
+    finished chunks waiting for an earlier one to be yielded, so definitions can be a
+    generator over an arbitrarily large catalogue. A definition that fails to parse produces a result
+    carrying the exception instead of aborting the batch.
+
+    Args:
+        definitions (Iterable[str]): The protein definition strings to parse.
+        jobs (int, optional): The number of worker processes. Defaults to the number of
+            CPUs; with 1, definitions are parsed in the calling process.
+        chunksize (int): The number of definitions sent to a worker at a time.
+        ordered (bool): Yield results in input order. If False, results are yielded as
+            soon as their chunk completes; use BatchResult.index to match them up.
+        parser_options (Dict[str, Any], optional): Keyword arguments for the
+            ProteinParser built in each worker.
+
+    Returns:
+        Iterator[BatchResult]: The result for each definition.
+
+    Raises:
+        ValueError: If jobs or chunksize is not positive.
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"jobs must be positive, got {jobs}")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+    return _iter_parse_many(definitions, jobs, chunksize, ordered, parser_options or {})
+
+def _iter_parse_many(
+    definitions: Iterable[str],
+    jobs: int,
+    chunksize: int,
+    ordered: bool,
+    parser_options: Dict[str, Any],
+) -> Iterator[BatchResult]:
+    chunks = _chunked(definitions, chunksize)
+    if jobs == 1:
+        parser = ProteinParser(**parser_options) if parser_options else get_default_parser()
+        for chunk in chunks:
+            yield from _parse_chunk(parser, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(parser_options,)) as executor:
+        chunk_numbers = {}
+        in_flight = set()
+        completed = {}
+        submitted = next_chunk = 0
+        exhausted = False
+        while True:
+            # Keep a couple of chunks per worker queued without reading the whole input.
+            # Finished chunks held back for ordering count too, so one slow chunk
+            # cannot make the other results pile up.
+            while not exhausted and len(in_flight) + len(completed) < 2 * jobs:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                future = executor.submit(_parse_chunk_in_worker, chunk)
+                chunk_numbers[future] = submitted
+                in_flight.add(future)
+                submitted += 1
+            if not in_flight:
+                return
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                completed[chunk_numbers.pop(future)] = future.result()
+            if ordered:
+                while next_chunk in completed:
+                    yield from completed.pop(next_chunk)
+                    next_chunk += 1
+            else:
+                for chunk_number in sorted(completed):
+                    yield from completed.pop(chunk_number)
+
+def parse_many(
+    definitions: Iterable[str],
+    jobs: Optional[int] = None,
+    chunksize: int = 64,
+    parser_options: Optional[Dict[str, Any]] = None,
+) -> List[BatchResult]:
+    """
+    Parses many protein definitions in parallel and returns the results in input order.
+
+    See iter_parse_many() for details; use it directly to stream results instead.
+
+    Args:
+        definitions (Iterable[str]): The protein definition strings to parse.
+        jobs (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        chunksize (int): The number of definitions sent to a worker at a time.
+        parser_options (Dict[str, Any], optional): Keyword arguments for the
+            ProteinParser built in each worker.
+
+    Returns:
+        List[BatchResult]: One result per definition, in input order.
+
+    Raises:
+        ValueError: If jobs or chunksize is not positive.
+    """
+    return list(iter_parse_many(definitions, jobs=jobs, chunksize=chunksize, parser_options=parser_options))
@@ -0,0 +1,405 @@
+import math
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence
+
+# ----------------------------
+# Data Classes Definitions
+# ----------------------------
+
+class ProteinComponent:
+    """
+    Base class representing a component of a protein structure.
+    """
+    pass
+
+@dataclass
+class Subunit(ProteinComponent):
+    """
+    Represents a single subunit within a protein.
+
+    Attributes:
+        id (str): The identifier of the subunit (e.g., 'B1', 'AA23', 'XYZ789').
+    """
+    id: str
+
+@dataclass(init=False)
+class Concatenation(ProteinComponent):
+    """
+    Represents the concatenation of two or more protein components.
+
+    A Concatenation can still be built from, and inspected as, a binary left/right
+    pair: Concatenation(left=a, right=b) holds [a, b], and for longer concatenations
+    left is the concatenation of all but the last component.
+
+    Attributes:
+        components (List[ProteinComponent]): The concatenated components, in order.
+    """
+    components: List[ProteinComponent]
+
+    def __init__(
+        self,
+        left: Optional[ProteinComponent] = None,
+        right: Optional[ProteinComponent] = None,
+        components: Optional[List[ProteinComponent]] = None,
+    ):
+        """
+        Initializes the concatenation from either a left/right pair or a list of components.
+
+        Args:
+            left (ProteinComponent, optional): The left component in the concatenation.
+            right (ProteinComponent, optional): The right component in the concatenation.
+            components (List[ProteinComponent], optional): The concatenated components, in order.
+
+        Raises:
+            TypeError: If both or neither of left/right and components are given.
+            ValueError: If fewer than two components are given.
+        """
+        if components is None:
+            if left is None or right is None:
+                raise TypeError("Concatenation needs left and right, or components")
+            components = [left, right]
+        elif left is not None or right is not None:
+            raise TypeError("Concatenation takes left and right, or components, not both")
+        if len(components) < 2:
+            raise ValueError(f"Concatenation needs at least two components, got {len(components)}")
+        self.components = list(components)
+
+    @property
+    def left(self) -> ProteinComponent:
+        """
+        The left component: the first component, or the concatenation of all but the last.
+
+        For three or more components this builds a new Concatenation on every access,
+        which takes time linear in the number of components and returns a different
+        object each time. Use components to walk the tree, and never key lookups by
+        the id() of a left built this way.
+        """
+        if len(self.components) == 2:
+            return self.components[0]
+        return Concatenation(components=self.components[:-1])
+
+    @property
+    def right(self) -> ProteinComponent:
+        """
+        The right component: the last component of the concatenation.
+        """
+        return self.components[-1]
+
+@dataclass
+class Alternation(ProteinComponent):
+    """
+    Represents an alternation (choice) between multiple protein components.
+
+    Weights only affect sampling by weight and structure probabilities; every option
+    is expanded whatever its weight.
+
+    Attributes:
+        options (List[ProteinComponent]): A list of possible components to choose from.
+        weights (Optional[List[float]]): The relative weight of each option, or None if
+            every option is equally likely.
+    """
+    options: List[ProteinComponent]
+    weights: Optional[List[float]] = None
+
+    def __post_init__(self):
+        if self.weights is not None:
+            if len(self.weights) != len(self.options):
+                raise ValueError(f"Alternation has {len(self.options)} options but {len(self.weights)} weights")
+            if any(not 0 <= weight < math.inf for weight in self.weights) or not sum(self.weights) > 0:
+                raise ValueError(f"Alternation weights must be finite, non-negative and not all zero, got {self.weights}")
+
+@dataclass
+class Multiplicity(ProteinComponent):
+    """
+    Represents a protein component that is repeated multiple times.
+
+    Attributes:
+        component (ProteinComponent): The component to be repeated.
+        count (int): The number of times the component is repeated.
+    """
+    component: ProteinComponent
+    count: int
+
+@dataclass
+class OptionalComponent(ProteinComponent):
+    """
+    Represents an optional protein component that can be included or excluded.
+
+    Attributes:
+        component (ProteinComponent): The optional component.
+        weight (Optional[float]): The probability of including the component, between
+            0 and 1, or None for even odds. Like alternation weights, it only affects
+            sampling by weight and structure probabilities.
+    """
+    component: ProteinComponent
+    weight: Optional[float] = None
+
+    def __post_init__(self):
+        if self.weight is not None and not 0 <= self.weight <= 1:
+            raise ValueError(f"Optional component weight must be between 0 and 1, got {self.weight}")
+
+# ----------------------------
+# Tree Traversal
+# ----------------------------
+
+def component_children(component: ProteinComponent) -> Sequence[ProteinComponent]:
+    """
+    Returns the direct child components of a ProteinComponent.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    if isinstance(component, Subunit):
+        return ()
+    elif isinstance(component, Concatenation):
+        return component.components
+    elif isinstance(component, Alternation):
+        return component.options
+    elif isinstance(component, (Multiplicity, OptionalComponent)):
+        return (component.component,)
+    else:
+        raise ValueError(f"Unknown ProteinComponent type: {type(component)}")
+
+def iter_postorder(component: ProteinComponent) -> Iterator[ProteinComponent]:
+    """
+    Yields every distinct node of a component tree after all of its children,
+    using an explicit stack so deeply nested trees do not hit the recursion limit.
+
+    Args:
+        component (ProteinComponent): The root of the tree.
+
+    Yields:
+        ProteinComponent: Each node, children first.
+    """
+    seen = set()
+    stack = [(component, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            yield node
+        elif id(node) not in seen:
+            seen.add(id(node))
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(component_children(node)))
+
+def encode_component(component: ProteinComponent) -> List[tuple]:
+    """
+    Encodes a component tree as a flat list of records, children before parents.
+
+    Unlike the nested dataclasses, the encoding can be pickled whatever the depth of
+    the tree. Each record is a tuple whose first item names the node type and whose
+    remaining items refer to child nodes by their index in the list; the root is the
+    last record.
+
+    Args:
+        component (ProteinComponent): The root of the tree to encode.
+
+    Returns:
+        List[tuple]: The encoded records.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    records = []
+    indices = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            record = ("subunit", node.id)
+        elif isinstance(node, Concatenation):
+            record = ("concatenation", [indices[id(part)] for part in node.components])
+        elif isinstance(node, Alternation):
+            record = ("alternation", [indices[id(option)] for option in node.options])
+            if node.weights is not None:
+                record += (list(node.weights),)
+        elif isinstance(node, Multiplicity):
+            record = ("multiplicity", indices[id(node.component)], node.count)
+        elif isinstance(node, OptionalComponent):
+            record = ("optional", indices[id(node.component)])
+            if node.weight is not None:
+                record += (node.weight,)
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        indices[id(node)] = len(records)
+        records.append(record)
+    return records
+
+def decode_component(records: List[tuple]) -> ProteinComponent:
+    """
+    Rebuilds a component tree from the records produced by encode_component().
+
+    Args:
+        records (List[tuple]): The encoded records.
+
+    Returns:
+        ProteinComponent: The root of the rebuilt tree.
+
+    Raises:
+        ValueError: If a record has an unknown node type.
+    """
+    nodes = []
+    for record in records:
+        kind = record[0]
+        if kind == "subunit":
+            node = Subunit(id=record[1])
+        elif kind == "concatenation":
+            if len(record) == 3:
+                # Records written before concatenations were n-ary hold a left/right pair
+                node = Concatenation(left=nodes[record[1]], right=nodes[record[2]])
+            else:
+                node = Concatenation(components=[nodes[index] for index in record[1]])
+        elif kind == "alternation":
+            weights = record[2] if len(record) > 2 else None
+            node = Alternation(options=[nodes[index] for index in record[1]], weights=weights)
+        elif kind == "multiplicity":
+            node = Multiplicity(component=nodes[record[1]], count=record[2])
+        elif kind == "optional":
+            node = OptionalComponent(component=nodes[record[1]], weight=record[2] if len(record) > 2 else None)
+        else:
+            raise ValueError(f"Unknown ProteinComponent record type: {kind!r}")
+        nodes.append(node)
+    return nodes[-1]
+
+def normalize_component(component: ProteinComponent) -> ProteinComponent:
+    """
+    Builds a simplified copy of a component tree that expands to the same structures
+    in the same order.
+
+    Alternations with a single option are replaced by that option, alternations and
+    concatenations nested directly inside one of the same kind are merged into their
+    parent, and multiplicities with a count of one are replaced by their component.
+    When an alternation is merged, the weight of the nested alternation is shared
+    between its options in proportion to their own weights, so every option keeps its
+    probability. The merged alternation is given explicit weights whenever those
+    shares are not all equal, as in B1 | (B2 | B3).
+
+    Args:
+        component (ProteinComponent): The root of the tree to normalise.
+
+    Returns:
+        ProteinComponent: The root of the normalised tree.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    normalized = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            result = Subunit(id=node.id)
+        elif isinstance(node, Concatenation):
+            parts = []
+            for part in node.components:
+                part = normalized[id(part)]
+                if isinstance(part, Concatenation):
+                    parts.extend(part.components)
+                else:
+                    parts.append(part)
+            result = Concatenation(components=parts)
+        elif isinstance(node, Alternation):
+            options = []
+            weights = []
+            weighted = node.weights is not None
+            for index, option in enumerate(node.options):
+                option = normalized[id(option)]
+                weight = 1 if node.weights is None else node.weights[index]
+                if isinstance(option, Alternation):
+                    options.extend(option.options)
+                    if option.weights is None:
+                        weights.extend(weight / len(option.options) for _ in option.options)
+                    else:
+                        weighted = True
+                        total = sum(option.weights)
+                        weights.extend(weight * option_weight / total for option_weight in option.weights)
+                else:
+                    options.append(option)
+                    weights.append(weight)
+            # Merging an unweighted alternation of another size leaves its options
+            # with smaller shares than their siblings, which only weights can keep
+            weighted = weighted or len(set(weights)) > 1
+            if len(options) == 1:
+                result = options[0]
+            else:
+                result = Alternation(options=options, weights=weights if weighted else None)
+        elif isinstance(node, Multiplicity):
+            inner = normalized[id(node.component)]
+            result = inner if node.count == 1 else Multiplicity(component=inner, count=node.count)
+        elif isinstance(node, OptionalComponent):
+            result = OptionalComponent(component=normalized[id(node.component)], weight=node.weight)
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        normalized[id(node)] = result
+    return normalized[id(component)]
+
+# Binding strength of each kind of expression when formatted as text
+_ALTERNATION, _CONCATENATION, _ATOM = range(3)
+
+def format_count(count: int) -> str:
+    """
+    Formats a structure or subunit count for messages and reprs: exactly while it fits
+    in 64 bits, and as the power of two below it beyond that, since str() of a huge
+    integer is slow and fails past Python's integer string conversion limit.
+    """
+    if count.bit_length() <= 64:
+        return str(count)
+    return f"~2**{count.bit_length() - 1}"
+
+def format_weight(weight: float) -> str:
+    """
+    Formats a weight as it is written after "@" in protein definition syntax.
+    """
+    return str(int(weight)) if weight == int(weight) else repr(float(weight))
+
+def format_component(component: ProteinComponent) -> str:
+    """
+    Formats a component tree back into protein definition syntax, adding parentheses
+    only where they are needed.
+
+    Args:
+        component (ProteinComponent): The root of the tree to format.
+
+    Returns:
+        str: The protein definition text.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    formatted = {}
+
+    def grouped(node, level):
+        text, node_level = formatted[id(node)]
+        return f"({text})" if node_level < level else text
+
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            result = (node.id, _ATOM)
+        elif isinstance(node, Concatenation):
+            text = " + ".join(grouped(part, _CONCATENATION) for part in node.components)
+            result = (text, _CONCATENATION)
+        elif isinstance(node, Alternation):
+            if len(node.options) == 1:
+                result = formatted[id(node.options[0])]
+            elif node.weights is None:
+                result = (" | ".join(grouped(option, _ALTERNATION) for option in node.options), _ALTERNATION)
+            else:
+                texts = []
+                for option, weight in zip(node.options, node.weights):
+                    text = grouped(option, _ALTERNATION)
+                    # A weight straight after an optional term would be read as its own
+                    if text.endswith("]"):
+                        text = f"({text})"
+                    texts.append(f"{text}@{format_weight(weight)}")
+                result = (" | ".join(texts), _ALTERNATION)
+        elif isinstance(node, Multiplicity):
+            # The grammar only allows a count after a subunit or a parenthesised group
+            text = formatted[id(node.component)][0]
+            if not isinstance(node.component, Subunit):
+                text = f"({text})"
+            result = (f"{text}{{{node.count}}}", _ATOM)
+        elif isinstance(node, OptionalComponent):
+            text = f"[{formatted[id(node.component)][0]}]"
+            if node.weight is not None:
+                text += f"@{format_weight(node.weight)}"
+            result = (text, _ATOM)
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        formatted[id(node)] = result
+    return formatted[id(component)][0]
@@ -0,0 +1,236 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .automaton import ProteinAutomaton
+from .components import ProteinComponent, format_count
+
+# ----------------------------
+# Structure DAG Definition
+# ----------------------------
+
+class StructureDAG:
+    """
+    The structures a ProteinComponent expands to, stored as a directed acyclic graph
+    whose paths spell them out.
+
+    Every path from the start state to the final state is one structure: the subunit
+    IDs on its edges, in order, with None labelling edges that add no subunit. Paths
+    are enumerated in the same order, and with the same duplicates, as
+    ProteinParser.parse(). A structure shares the states of its prefix with every
+    structure built from the same choices so far, and states whose outgoing edges are
+    identical are merged, so common suffixes are stored once too. The graph grows with
+    the size of the definition rather than with the number of structures.
+
+    States are numbered in topological order: the start state is 0, the final state
+    is the last one, and every edge leads to a higher-numbered state.
+
+    Attributes:
+        edges (List[Tuple[Tuple[Optional[str], int], ...]]): The outgoing edges of each
+            state as (subunit ID or None, target state) pairs, in expansion order.
+        start (int): The start state.
+        final (int): The final state.
+    """
+
+    def __init__(self, edges: List[Tuple[Tuple[Optional[str], int], ...]]):
+        """
+        Initializes the DAG from its edge lists.
+
+        Args:
+            edges (List[Tuple[Tuple[Optional[str], int], ...]]): The outgoing edges of
+                each state, numbered in topological order from the start state 0 to
+                the final state, which has no edges.
+
+        Raises:
+            ValueError: If the states are not numbered in topological order, or the
+                final state has outgoing edges.
+        """
+        self.edges = [tuple((label, target) for label, target in state_edges) for state_edges in edges]
+        if not self.edges or self.edges[-1]:
+            raise ValueError("The last state of a StructureDAG must be a final state without edges")
+        for state, state_edges in enumerate(self.edges):
+            for _, target in state_edges:
+                if not state < target < len(self.edges):
+                    raise ValueError(f"Edge from state {state} to {target} is not in topological order")
+        self.start = 0
+        self.final = len(self.edges) - 1
+        self._path_counts: Optional[List[int]] = None
+
+    @classmethod
+    def from_component(cls, component: ProteinComponent) -> "StructureDAG":
+        """
+        Builds the DAG of the structures a ProteinComponent expands to.
+
+        Args:
+            component (ProteinComponent): The protein component to expand.
+
+        Returns:
+            StructureDAG: The DAG of its structures.
+
+        Raises:
+            ValueError: If an unknown ProteinComponent type is encountered.
+        """
+        return cls.from_automaton(ProteinAutomaton(component))
+
+    @classmethod
+    def from_automaton(cls, automaton: ProteinAutomaton) -> "StructureDAG":
+        """
+        Builds the DAG from the NFA of a ProteinAutomaton, keeping one path per path
+        through the NFA.
+
+        Args:
+            automaton (ProteinAutomaton): The compiled automaton.
+
+        Returns:
+            StructureDAG: The DAG of the structures the automaton was compiled from.
+        """
+        nfa_edges = automaton.edges
+        # Visit the NFA states reachable from the start, children before parents
+        postorder = []
+        visited = {automaton.start}
+        stack = [(automaton.start, iter(nfa_edges[automaton.start]))]
+        while stack:
+            state, remaining = stack[-1]
+            for _, target in remaining:
+                if target not in visited:
+                    visited.add(target)
+                    stack.append((target, iter(nfa_edges[target])))
+                    break
+            else:
+                postorder.append(state)
+                stack.pop()
+
+        # Merge states with identical outgoing edges, and skip states whose only edge
+        # is an empty move, working from the final state back to the start
+        merged: Dict[int, int] = {}
+        interned: Dict[tuple, int] = {}
+        for state in postorder:
+            state_edges = tuple((label, merged[target]) for label, target in nfa_edges[state])
+            if len(state_edges) == 1 and state_edges[0][0] is None:
+                merged[state] = state_edges[0][1]
+            else:
+                merged[state] = interned.setdefault(state_edges, len(interned))
+
+        # States were interned after their targets, and so the start last, so reversing
+        # the numbering makes every edge lead to a higher-numbered state
+        last = len(interned) - 1
+        edges: List[tuple] = [()] * len(interned)
+        for state_edges, state in interned.items():
+            edges[last - state] = tuple((label, last - target) for label, target in state_edges)
+        return cls(edges)
+
+    @property
+    def state_count(self) -> int:
+        """
+        The number of states.
+        """
+        return len(self.edges)
+
+    @property
+    def edge_count(self) -> int:
+        """
+        The number of edges.
+        """
+        return sum(len(state_edges) for state_edges in self.edges)
+
+    def _counts(self) -> List[int]:
+        # The number of paths from each state to the final state
+        if self._path_counts is None:
+            counts = [0] * len(self.edges)
+            counts[self.final] = 1
+            for state in range(self.final - 1, -1, -1):
+                counts[state] = sum(counts[target] for _, target in self.edges[state])
+            self._path_counts = counts
+        return self._path_counts
+
+    @property
+    def size(self) -> int:
+        """
+        The number of structures, including duplicates. Unlike len(), this is not limited to sys.maxsize.
+        """
+        return self._counts()[self.start]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _iter_paths(self) -> Iterator[List[str]]:
+        # Walks every path depth-first, yielding one shared list of subunit IDs that
+        # is only valid until the next path is requested
+        if self.start == self.final:
+            yield []
+            return
+        output: List[str] = []
+        stack = [iter(self.edges[self.start])]
+        lengths = [0]
+        while stack:
+            edge = next(stack[-1], None)
+            if edge is None:
+                stack.pop()
+                lengths.pop()
+                continue
+            label, target = edge
+            del output[lengths[-1]:]
+            if label is not None:
+                output.append(label)
+            if target == self.final:
+                yield output
+            else:
+                stack.append(iter(self.edges[target]))
+                lengths.append(len(output))
+
+    def __iter__(self) -> Iterator[str]:
+        return (" + ".join(path) for path in self._iter_paths())
+
+    def iter_subunits(self) -> Iterator[List[str]]:
+        """
+        Lazily yields the structures as lists of subunit IDs, in the same order as iteration.
+        """
+        return (list(path) for path in self._iter_paths())
+
+    def to_dict(self) -> dict:
+        """
+        Exports the DAG as plain lists and integers, e.g. for JSON.
+
+        Returns:
+            dict: The "edges" of each state as [subunit ID or None, target] pairs, and
+                the "start" and "final" states.
+        """
+        return {
+            "start": self.start,
+            "final": self.final,
+            "edges": [[[label, target] for label, target in state_edges] for state_edges in self.edges],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StructureDAG":
+        """
+        Rebuilds a DAG exported by to_dict().
+
+        Args:
+            data (dict): The exported DAG.
+
+        Returns:
+            StructureDAG: The rebuilt DAG.
+
+        Raises:
+            ValueError: If the exported edges are not a valid StructureDAG.
+        """
+        return cls([[(label, target) for label, target in state_edges] for state_edges in data["edges"]])
+
+    def to_dot(self) -> str:
+        """
+        Exports the DAG in the Graphviz DOT language, with empty moves drawn dashed.
+
+        Returns:
+            str: The DOT source of the graph.
+        """
+        lines = ["digraph structures {", "    rankdir=LR;", f"    {self.final} [shape=doublecircle];"]
+        for state, state_edges in enumerate(self.edges):
+            for label, target in state_edges:
+                if label is None:
+                    lines.append(f"    {state} -> {target} [style=dashed];")
+                else:
+                    lines.append(f'    {state} -> {target} [label="{label}"];')
+        lines.append("}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"<StructureDAG of {format_count(self.size)} structures in {self.state_count} states>"
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Optional
+
+# ----------------------------
+# Disk Cache Definition
+# ----------------------------
+
+class DiskCache:
+    """
+    A directory of pickled values addressed by the SHA-256 of their key, shared safely
+    between processes.
+
+    Each value lives in its own file, written to a temporary file first and then
+    renamed into place, so readers in other processes only ever see complete entries.
+    Reading an entry refreshes its modification time, and when the directory grows
+    beyond max_bytes the least recently used entries are deleted until it is back
+    under 90% of the limit.
+
+    Opening a cache and reading from it never scans the directory. The size is
+    measured by the first write of each DiskCache, then tracked from the sizes of the
+    entries it writes, and measured again whenever entries are evicted.
+
+    Values are stored with pickle, so only point a DiskCache at a directory that is
+    not writable by untrusted users.
+
+    Attributes:
+        directory (str): The directory holding the cache entries.
+        max_bytes (int): The size limit of the cache directory in bytes.
+    """
+
+    SUFFIX = ".pickle"
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initializes the cache, creating its directory if needed.
+
+        Args:
+            directory (str): The directory holding the cache entries.
+            max_bytes (int): The size limit of the cache directory in bytes.
+
+        Raises:
+            ValueError: If max_bytes is not positive.
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # The directory size as of the last scan plus the entries written since,
+        # or None until the first write scans the directory
+        self._approximate_bytes: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest[2:] + self.SUFFIX)
+
+    def _entries(self):
+        for prefix in os.listdir(self.directory):
+            subdirectory = os.path.join(self.directory, prefix)
+            if not os.path.isdir(subdirectory):
+                continue
+            for name in os.listdir(subdirectory):
+                if name.endswith(self.SUFFIX):
+                    path = os.path.join(subdirectory, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def size(self) -> int:
+        """
+        Returns the total size of the cache entries in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Looks up a value in the cache.
+
+        Args:
+            key (str): The key of the entry.
+            default (Any): The value returned when the key is missing.
+
+        Returns:
+            Any: The cached value, or default if there is no usable entry for the key.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError, ValueError):
+            # Unreadable entries, e.g. from an incompatible version, count as misses
+            self._remove(path)
+            return default
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Stores a value in the cache, replacing any existing entry for the key.
+
+        Args:
+            key (str): The key of the entry.
+            value (Any): The picklable value to store.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(temporary, path)
+        except BaseException:
+            self._remove(temporary)
+            raise
+        with self._lock:
+            if self._approximate_bytes is not None:
+                self._approximate_bytes += size
+            approximate_bytes = self._approximate_bytes
+        if approximate_bytes is None:
+            # The first write measures the directory, including the entry just written
+            approximate_bytes = self.size()
+            with self._lock:
+                self._approximate_bytes = approximate_bytes
+        if approximate_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Deletes the least recently used entries until the cache is under 90% of max_bytes.
+        """
+        # Scan without holding the lock; concurrent writers only update the running size
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+        with self._lock:
+            self._approximate_bytes = total
+
+    def clear(self) -> None:
+        """
+        Deletes every entry in the cache.
+        """
+        for path, _, _ in list(self._entries()):
+            self._remove(path)
+        with self._lock:
+            self._approximate_bytes = 0
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
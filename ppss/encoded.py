@@ -0,0 +1,200 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from .components import (
+    ProteinComponent,
+    Subunit,
+    Concatenation,
+    Alternation,
+    Multiplicity,
+    OptionalComponent,
+    iter_postorder,
+)
+
+# ----------------------------
+# Optional NumPy Dependency
+# ----------------------------
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "Integer-encoded structures require NumPy; install it with 'pip install ppss[numpy]'"
+        ) from None
+    return numpy
+
+# ----------------------------
+# Encoded Structures Definition
+# ----------------------------
+
+class EncodedStructures:
+    """
+    Protein structures encoded as integer subunit IDs in flat NumPy arrays.
+
+    The structures are stored ragged, like a CSR matrix: structure i is
+    values[offsets[i]:offsets[i + 1]], and each value indexes vocabulary. Structures
+    are in the same order as ProteinParser.parse().
+
+    Attributes:
+        values (numpy.ndarray): The int32 subunit codes of every structure, one after another.
+        offsets (numpy.ndarray): The int64 start of each structure in values, followed by
+            the total number of values.
+        vocabulary (List[str]): The subunit ID of each code.
+    """
+
+    def __init__(self, values: Any, offsets: Any, vocabulary: List[str]):
+        """
+        Initializes the encoded structures from their arrays.
+
+        Args:
+            values (numpy.ndarray): The int32 subunit codes of every structure, one after another.
+            offsets (numpy.ndarray): The int64 start of each structure in values, followed
+                by the total number of values.
+            vocabulary (List[str]): The subunit ID of each code.
+        """
+        self.values = values
+        self.offsets = offsets
+        self.vocabulary = vocabulary
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> Any:
+        """
+        Returns the subunit codes of one structure as a view into values.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("structure index out of range")
+        return self.values[self.offsets[index]:self.offsets[index + 1]]
+
+    @property
+    def lengths(self) -> Any:
+        """
+        The number of subunits in each structure, as an int64 array.
+        """
+        return self.offsets[1:] - self.offsets[:-1]
+
+    def to_padded(self, pad_value: int = -1) -> Any:
+        """
+        Returns the structures as a 2D int32 matrix with one row per structure.
+
+        Args:
+            pad_value (int): The value filling each row after the end of its structure.
+
+        Returns:
+            numpy.ndarray: A matrix with as many columns as the longest structure has subunits.
+        """
+        numpy = _require_numpy()
+        lengths = self.lengths
+        width = int(lengths.max()) if len(lengths) else 0
+        matrix = numpy.full((len(self), width), pad_value, dtype=numpy.int32)
+        rows = numpy.repeat(numpy.arange(len(self)), lengths)
+        columns = numpy.arange(len(self.values)) - numpy.repeat(self.offsets[:-1], lengths)
+        matrix[rows, columns] = self.values
+        return matrix
+
+    def decode(self, index: int) -> str:
+        """
+        Returns one structure as a string, as ProteinParser.parse() would.
+        """
+        return " + ".join(self.vocabulary[code] for code in self[index].tolist())
+
+    def __repr__(self) -> str:
+        return f"<EncodedStructures of {len(self)} structures over {len(self.vocabulary)} subunits>"
+
+# ----------------------------
+# Encoded Expansion
+# ----------------------------
+
+def _ragged_range(numpy, starts: Any, counts: Any) -> Any:
+    # Concatenates range(start, start + count) for each start and count
+    total = int(counts.sum())
+    shifts = starts - (numpy.cumsum(counts) - counts)
+    return numpy.repeat(shifts, counts) + numpy.arange(total, dtype=numpy.int64)
+
+def _ragged_product(numpy, parts: List[Tuple[Any, Any]]) -> Tuple[Any, Any]:
+    # Concatenates one row of every part, for every combination of rows, with the
+    # first part as the most significant. Each part is a (values, offsets) pair.
+    sizes = [len(offsets) - 1 for _, offsets in parts]
+    count = 1
+    for size in sizes:
+        count *= size
+    rows = numpy.arange(count, dtype=numpy.int64)
+    choices = []
+    lengths = numpy.zeros(count, dtype=numpy.int64)
+    stride = count
+    for (values, offsets), size in zip(parts, sizes):
+        stride //= size
+        choice = (rows // stride) % size
+        choices.append(choice)
+        lengths += (offsets[1:] - offsets[:-1])[choice]
+    result_offsets = numpy.zeros(count + 1, dtype=numpy.int64)
+    numpy.cumsum(lengths, out=result_offsets[1:])
+    result_values = numpy.empty(int(result_offsets[-1]), dtype=numpy.int32)
+    # Copy each part into place, after the parts before it in the same row
+    written = result_offsets[:-1].copy()
+    for (values, offsets), choice in zip(parts, choices):
+        part_lengths = (offsets[1:] - offsets[:-1])[choice]
+        source = _ragged_range(numpy, offsets[:-1][choice], part_lengths)
+        target = _ragged_range(numpy, written, part_lengths)
+        result_values[target] = values[source]
+        written += part_lengths
+    return result_values, result_offsets
+
+def expand_encoded(component: ProteinComponent, vocabulary: Optional[Dict[str, int]] = None) -> EncodedStructures:
+    """
+    Expands a ProteinComponent into integer-encoded structures, in the same order as
+    ProteinParser.expand_protein().
+
+    The expansion runs bottom-up over the tree like expand_protein(), but every node's
+    structures are built with vectorised NumPy operations on ragged int32 arrays, so
+    no Python list or string is created per structure.
+
+    Args:
+        component (ProteinComponent): The protein component to expand.
+        vocabulary (Dict[str, int], optional): The code of each subunit ID. Subunits
+            missing from it are added with the next free code, so the same dictionary
+            can be passed for many definitions to encode them consistently. Defaults to
+            a new vocabulary in order of first appearance.
+
+    Returns:
+        EncodedStructures: The encoded structures.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    numpy = _require_numpy()
+    if vocabulary is None:
+        vocabulary = {}
+    empty = (numpy.empty(0, dtype=numpy.int32), numpy.zeros(2, dtype=numpy.int64))
+    expansions = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            code = vocabulary.setdefault(node.id, len(vocabulary))
+            expanded = (numpy.array([code], dtype=numpy.int32), numpy.array([0, 1], dtype=numpy.int64))
+        elif isinstance(node, (Concatenation, Multiplicity)):
+            parts = node.components if isinstance(node, Concatenation) else [node.component] * node.count
+            expanded = _ragged_product(numpy, [expansions[id(part)] for part in parts]) if parts else empty
+        elif isinstance(node, (Alternation, OptionalComponent)):
+            # An optional component is its expansions followed by the empty structure
+            options = [expansions[id(option)] for option in node.options] if isinstance(node, Alternation) else [
+                expansions[id(node.component)], empty
+            ]
+            values = numpy.concatenate([values for values, _ in options])
+            offsets = [numpy.zeros(1, dtype=numpy.int64)]
+            start = 0
+            for option_values, option_offsets in options:
+                offsets.append(option_offsets[1:] + start)
+                start += len(option_values)
+            expanded = (values, numpy.concatenate(offsets))
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        expansions[id(node)] = expanded
+    values, offsets = expansions[id(component)]
+    codes = [""] * len(vocabulary)
+    for subunit, code in vocabulary.items():
+        codes[code] = subunit
+    return EncodedStructures(values, offsets, codes)
@@ -1,70 +1,39 @@
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+from collections import OrderedDict, abc, namedtuple
+from itertools import chain, product
+import lark
 from lark import Lark, Transformer, exceptions
-from dataclasses import dataclass
-from typing import List
-
-# ----------------------------
-# Data Classes Definitions
-# ----------------------------
-
-class ProteinComponent:
-    """
-    Base class representing a component of a protein structure.
-    """
-    pass
-
-@dataclass
-class Subunit(ProteinComponent):
-    """
-    Represents a single subunit within a protein.
-
-    Attributes:
-        id (str): The identifier of the subunit (e.g., 'B1', 'AA23', 'XYZ789').
-    """
-    id: str
-
-@dataclass
-class Concatenation(ProteinComponent):
-    """
-    Represents the concatenation of two protein components.
-
-    Attributes:
-        left (ProteinComponent): The left component in the concatenation.
-        right (ProteinComponent): The right component in the concatenation.
-    """
-    left: ProteinComponent
-    right: ProteinComponent
-
-@dataclass
-class Alternation(ProteinComponent):
-    """
-    Represents an alternation (choice) between multiple protein components.
-
-    Attributes:
-        options (List[ProteinComponent]): A list of possible components to choose from.
-    """
-    options: List[ProteinComponent]
-
-@dataclass
-class Multiplicity(ProteinComponent):
-    """
-    Represents a protein component that is repeated multiple times.
-
-    Attributes:
-        component (ProteinComponent): The component to be repeated.
-        count (int): The number of times the component is repeated.
-    """
-    component: ProteinComponent
-    count: int
-
-@dataclass
-class OptionalComponent(ProteinComponent):
-    """
-    Represents an optional protein component that can be included or excluded.
-
-    Attributes:
-        component (ProteinComponent): The optional component.
-    """
-    component: ProteinComponent
+from typing import IO, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .components import (
+    ProteinComponent,
+    Subunit,
+    Concatenation,
+    Alternation,
+    Multiplicity,
+    OptionalComponent,
+    iter_postorder,
+    normalize_component,
+    format_component,
+    format_count,
+    encode_component,
+    decode_component,
+)
+from .analysis import DefinitionAnalysis, analyze_component, composition_counts_component, unordered_structures_component
+from .automaton import ProteinAutomaton
+from .dag import StructureDAG
+from .encoded import EncodedStructures, expand_encoded
+from .unique import iter_unique_structures
+from .sampling import sample_indices, sample_weighted_component
+from .topk import top_k_component
+from .diskcache import DiskCache
+
+__version__ = "0.2.0"
 
 # ----------------------------
 # Transformer Definition
@@ -100,48 +69,64 @@ class ProteinTransformer(Transformer):
         if len(items) == 1:
             return items[0]
         else:
-            left = items[0]
-            for right in items[1:]:
-                left = Concatenation(left=left, right=right)
-            return left
+            return Concatenation(components=items)
 
     def alternation(self, items):
         """
         Transforms alternated components into an Alternation instance.
 
         Args:
-            items (List[ProteinComponent]): List of components to alternate between.
+            items (List[Tuple[ProteinComponent, Optional[float]]]): The components to
+                alternate between, each with its weight or None.
+
+        Returns:
+            Alternation: An instance representing the alternation. Options without a
+                weight have a weight of 1 if any option has one.
+        """
+        options = [option for option, _ in items]
+        if all(weight is None for _, weight in items):
+            return Alternation(options=options)
+        return Alternation(options=options, weights=[1.0 if weight is None else weight for _, weight in items])
+
+    def option(self, items):
+        """
+        Transforms one option of an alternation and its optional weight.
+
+        Args:
+            items (List[ProteinComponent, str]): The option, followed by its weight if it has one.
 
         Returns:
-            Alternation: An instance representing the alternation.
+            Tuple[ProteinComponent, Optional[float]]: The option and its weight, or None.
         """
-        return Alternation(options=items)
+        component, *weight = items
+        return component, float(weight[0]) if weight else None
 
     def multiplicity(self, items):
         """
         Transforms a multiplicity expression into a Multiplicity instance.
 
         Args:
-            items (List[ProteinComponent, str]): The component to repeat and the count as a string.
+            items (List[ProteinComponent, str]): The component to repeat followed by the digits of the count.
 
         Returns:
             Multiplicity: An instance representing the multiplicity.
         """
-        component, count = items
-        return Multiplicity(component=component, count=int(count))
+        component, *digits = items
+        return Multiplicity(component=component, count=int("".join(digits)))
 
     def optional(self, items):
         """
         Transforms an optional expression into an OptionalComponent instance.
 
         Args:
-            items (List[ProteinComponent]): The optional component.
+            items (List[ProteinComponent, str]): The optional component, followed by
+                the probability of including it if one is given.
 
         Returns:
             OptionalComponent: An instance representing the optional component.
         """
-        (component,) = items
-        return OptionalComponent(component=component)
+        component, *weight = items
+        return OptionalComponent(component=component, weight=float(weight[0]) if weight else None)
 
     def protein(self, items):
         """
@@ -183,7 +168,9 @@ grammar = """
 
     protein: alternation
 
-    alternation: concatenation ("|" concatenation)*
+    alternation: option ("|" option)*
+
+    option: concatenation ("@" WEIGHT)?
 
     concatenation: required_term ("+" term)*
 
@@ -199,7 +186,7 @@ grammar = """
     multiplicity: subunit "{" DIGIT+ "}"
                | "(" alternation ")" "{" DIGIT+ "}"
 
-    optional: "[" alternation "]"
+    optional: "[" alternation "]" ("@" WEIGHT)?
 
     subunit: SUBUNIT
 
@@ -207,130 +194,2154 @@ grammar = """
 
     DIGIT: "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
 
+    WEIGHT: /([0-9]+([.][0-9]*)?|[.][0-9]+)([eE][+-]?[0-9]+)?/
+
     %import common.WS
     %ignore WS
 """
 
+def grammar_digest(grammar_text: str = grammar) -> str:
+    """
+    Computes the digest used to check that a pre-generated parser table matches a grammar.
+
+    Args:
+        grammar_text (str): The grammar to hash. Defaults to the protein grammar.
+
+    Returns:
+        str: The hex-encoded SHA-256 digest of the grammar text.
+    """
+    return hashlib.sha256(grammar_text.encode("utf-8")).hexdigest()
+
+def _lark_series(version: str) -> str:
+    return ".".join(version.split(".")[:2])
+
+def load_parser_table(transformer: Optional[Transformer] = None) -> Optional[Lark]:
+    """
+    Loads the LALR parser from the pre-generated table shipped with the package.
+
+    The table is only used if it was generated from the current grammar with the
+    same Lark release series as the one installed; otherwise None is returned and
+    the caller should compile the grammar instead.
+
+    Args:
+        transformer (Transformer, optional): The transformer to apply while parsing.
+
+    Returns:
+        Optional[Lark]: The loaded parser, or None if the table is missing or stale.
+    """
+    try:
+        from . import _parser_table
+    except ImportError:
+        return None
+    if _parser_table.GRAMMAR_SHA256 != grammar_digest():
+        return None
+    if _lark_series(_parser_table.LARK_VERSION) != _lark_series(lark.__version__):
+        return None
+    try:
+        return Lark._load_from_dict(_parser_table.DATA, _parser_table.MEMO, transformer=transformer)
+    except (exceptions.LarkError, KeyError, TypeError, ValueError, AttributeError):
+        return None
+
 # ----------------------------
-# ProteinParser Class Definition
+# Structure Counting
 # ----------------------------
 
-class ProteinParser:
+def _structure_counts(component: ProteinComponent) -> Dict[int, int]:
     """
-    A class to parse protein definitions and generate possible protein structures.
+    Computes the number of structures each node of a component tree expands to.
+
+    Args:
+        component (ProteinComponent): The root of the tree.
+
+    Returns:
+        Dict[int, int]: The structure count of every node, keyed by the node's id().
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    counts = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            count = 1
+        elif isinstance(node, Concatenation):
+            count = 1
+            for part in node.components:
+                count *= counts[id(part)]
+        elif isinstance(node, Alternation):
+            count = sum(counts[id(option)] for option in node.options)
+        elif isinstance(node, Multiplicity):
+            # Every copy chooses its expansion independently
+            count = counts[id(node.component)] ** node.count
+        else:
+            # Either one of the component's expansions, or nothing at all
+            count = counts[id(node.component)] + 1
+        counts[id(node)] = count
+    return counts
+
+def _token_totals(component: ProteinComponent, counts: Dict[int, int]) -> Dict[int, int]:
+    """
+    Computes the total number of subunits, summed over every structure, that each node
+    of a component tree expands to.
+
+    Args:
+        component (ProteinComponent): The root of the tree.
+        counts (Dict[int, int]): Structure counts per node, as from _structure_counts().
+
+    Returns:
+        Dict[int, int]: The subunit total of every node, keyed by the node's id().
+    """
+    totals = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            total = 1
+        elif isinstance(node, Concatenation):
+            # Each part's subunits appear once for every combination of the other parts
+            count = counts[id(node)]
+            total = sum(totals[id(part)] * (count // counts[id(part)]) for part in node.components)
+        elif isinstance(node, Alternation):
+            total = sum(totals[id(option)] for option in node.options)
+        elif isinstance(node, Multiplicity):
+            base = counts[id(node.component)]
+            total = node.count * totals[id(node.component)] * base ** (node.count - 1) if node.count else 0
+        else:
+            total = totals[id(node.component)]
+        totals[id(node)] = total
+    return totals
+
+def _saturating_power(base: int, exponent: int, cap: int) -> int:
+    # Raises base to a power by squaring, never letting an intermediate exceed cap
+    result = 1
+    while exponent:
+        if exponent & 1:
+            result = min(result * base, cap)
+        exponent >>= 1
+        if exponent:
+            base = min(base * base, cap)
+    return result
+
+def _bounded_totals(component: ProteinComponent, cap: int) -> Tuple[int, int]:
+    """
+    Computes the number of structures a component tree expands to and the total number
+    of subunits in them, each capped at cap.
+
+    The counts are only ever added and multiplied, and never go negative, so capping
+    every intermediate result gives exactly min(count, cap). Multiplicities are raised
+    to their count by squaring, so the work grows with the size of the tree and the
+    number of bits in the counts, however large the real counts are.
+
+    Args:
+        component (ProteinComponent): The root of the tree.
+        cap (int): The largest value to compute exactly.
+
+    Returns:
+        Tuple[int, int]: The capped structure count and capped subunit total.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    values: Dict[int, Tuple[int, int]] = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            count, total = 1, 1
+        elif isinstance(node, Concatenation):
+            # Each part's subunits appear once for every combination of the other parts
+            count, total = 1, 0
+            for part in node.components:
+                part_count, part_total = values[id(part)]
+                total = min(total * part_count + count * part_total, cap)
+                count = min(count * part_count, cap)
+        elif isinstance(node, Alternation):
+            count = min(sum(values[id(option)][0] for option in node.options), cap)
+            total = min(sum(values[id(option)][1] for option in node.options), cap)
+        elif isinstance(node, Multiplicity):
+            base, base_total = values[id(node.component)]
+            count = _saturating_power(base, node.count, cap)
+            if node.count:
+                total = min(min(node.count, cap) * base_total, cap)
+                total = min(total * _saturating_power(base, node.count - 1, cap), cap)
+            else:
+                total = 0
+        elif isinstance(node, OptionalComponent):
+            component_count, total = values[id(node.component)]
+            count = min(component_count + 1, cap)
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        values[id(node)] = (count, total)
+    return values[id(component)]
+
+# Counts checked against expansion limits are exact below this bound
+_LIMIT_COUNT_CAP = 1 << 4096
+
+# ----------------------------
+# Lazy Expansion Engine
+# ----------------------------
+
+def _iter_expansions(component: ProteinComponent) -> Iterator[List[str]]:
+    """
+    Lazily expands a ProteinComponent, yielding structures in the same order as
+    ProteinParser.expand_protein.
+
+    The expansion is a depth-first backtracking search: the components still to be
+    emitted are kept as a linked list of (component, rest) pairs, and every
+    Alternation or OptionalComponent on the current path leaves a choice point
+    recording where to resume. Memory use is proportional to the depth of the
+    current path rather than to the number of structures.
+
+    Note that the same list object is yielded every time and is modified once the
+    generator resumes; callers that keep a structure must copy it.
+
+    Args:
+        component (ProteinComponent): The protein component to expand.
+
+    Yields:
+        List[str]: The subunit IDs of each possible structure.
+
+    Raises:
+        ValueError: If an unknown ProteinComponent type is encountered.
+    """
+    output = []
+    # Each choice point is [alternatives, next index, remaining goals, output length]
+    choices = []
+    goals = (component, None)
+    while True:
+        if goals is not None:
+            node, goals = goals
+            if isinstance(node, Subunit):
+                output.append(node.id)
+                continue
+            elif isinstance(node, Concatenation):
+                for part in reversed(node.components):
+                    goals = (part, goals)
+                continue
+            elif isinstance(node, Multiplicity):
+                for _ in range(node.count):
+                    goals = (node.component, goals)
+                continue
+            elif isinstance(node, Alternation):
+                alternatives = node.options
+            elif isinstance(node, OptionalComponent):
+                # Include the component first, then exclude it
+                alternatives = (node.component, None)
+            else:
+                raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+            if alternatives:
+                if len(alternatives) > 1:
+                    choices.append([alternatives, 1, goals, len(output)])
+                if alternatives[0] is not None:
+                    goals = (alternatives[0], goals)
+                continue
+        else:
+            yield output
+
+        # Backtrack to the most recent choice point with options left
+        if not choices:
+            return
+        choice = choices[-1]
+        alternatives, index, goals, length = choice
+        del output[length:]
+        if index + 1 < len(alternatives):
+            choice[1] = index + 1
+        else:
+            choices.pop()
+        if alternatives[index] is not None:
+            goals = (alternatives[index], goals)
+
+def _unrank(component: ProteinComponent, counts: Dict[int, int], index: int) -> List[str]:
+    """
+    Builds the structure at a given position in the expansion order of a component.
+
+    The index is decomposed top-down as a mixed-radix number: a Concatenation splits
+    it into one digit per component and a Multiplicity into one digit per copy, with
+    the last as the least significant, while an Alternation or OptionalComponent
+    subtracts the counts of the alternatives that come before the chosen one.
+
+    Args:
+        component (ProteinComponent): The protein component to unrank.
+        counts (Dict[int, int]): Structure counts per node, as from _structure_counts().
+        index (int): A position between 0 and the component's count, exclusive.
+
+    Returns:
+        List[str]: The subunit IDs of the structure at that position.
+    """
+    output = []
+    stack = [(component, index)]
+    while stack:
+        node, index = stack.pop()
+        if isinstance(node, Subunit):
+            output.append(node.id)
+        elif isinstance(node, (Concatenation, Multiplicity)):
+            parts = node.components if isinstance(node, Concatenation) else [node.component] * node.count
+            # The last part is the least significant digit, so it is pushed first
+            for part in reversed(parts):
+                index, digit = divmod(index, counts[id(part)])
+                stack.append((part, digit))
+        elif isinstance(node, Alternation):
+            for option in node.options:
+                if index < counts[id(option)]:
+                    stack.append((option, index))
+                    break
+                index -= counts[id(option)]
+        elif isinstance(node, OptionalComponent):
+            if index < counts[id(node.component)]:
+                stack.append((node.component, index))
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+    return output
+
+def _structure_tokens(structure: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Splits a structure string such as "B1 + B2" into its subunit IDs. Sequences of
+    subunit IDs are returned as a list unchanged.
+    """
+    if isinstance(structure, str):
+        return [token.strip() for token in structure.split("+")] if structure.strip() else []
+    return list(structure)
+
+def _evaluate_spans(component: ProteinComponent, evaluate) -> dict:
+    """
+    Evaluates a function of (node, start offset) over a component tree on demand,
+    memoising results and using an explicit stack instead of recursion.
+
+    evaluate(node, start) is a generator computing the value for one node and start
+    offset. It asks for each value it depends on by yielding a (child, child_start)
+    pair and receives that value back, and it returns its own value when it finishes.
+    A requested pair that has not been computed yet is pushed on the stack and
+    evaluated before its parent resumes, so every (node, start) pair reached from the
+    root is evaluated exactly once and no other pair is evaluated at all.
+
+    Args:
+        component (ProteinComponent): The root of the tree, evaluated at offset 0.
+        evaluate (Callable): The generator function computing the value of a node at
+            a start offset.
+
+    Returns:
+        dict: The value for the root at offset 0.
+    """
+    memo = {}
+    stack = [((id(component), 0), evaluate(component, 0))]
+    value = None
+    while stack:
+        key, frame = stack[-1]
+        try:
+            node, start = frame.send(value)
+        except StopIteration as finished:
+            memo[key] = value = finished.value
+            stack.pop()
+            continue
+        value = memo.get((id(node), start))
+        if value is None:
+            stack.append(((id(node), start), evaluate(node, start)))
+    return memo[(id(component), 0)]
+
+def _ranks(component: ProteinComponent, counts: Dict[int, int], tokens: List[str]) -> List[int]:
+    """
+    Finds every position at which a structure occurs in the expansion order of a component.
+
+    Rather than expanding the component, this matches the structure against the tree.
+    For each node and start offset reached, it records which end offsets the node can
+    match up to and the ranks, within the node's own expansion, that produce that match.
+    Ranks are combined exactly as _unrank() decomposes them.
+
+    Args:
+        component (ProteinComponent): The protein component to search.
+        counts (Dict[int, int]): Structure counts per node, as from _structure_counts().
+        tokens (List[str]): The subunit IDs of the structure to find.
+
+    Returns:
+        List[int]: The sorted positions of the structure, empty if it is never produced.
+    """
+    length = len(tokens)
+
+    def evaluate(node, start):
+        row = {}
+        if isinstance(node, Subunit):
+            if start < length and tokens[start] == node.id:
+                row[start + 1] = [0]
+        elif isinstance(node, (Concatenation, Multiplicity)):
+            # Match the parts one after another, each from every offset the previous
+            # parts can end at, with earlier parts as the more significant digits
+            parts = node.components if isinstance(node, Concatenation) else [node.component] * node.count
+            row = {start: [0]}
+            for part in parts:
+                base = counts[id(part)]
+                extended = {}
+                for middle, ranks in row.items():
+                    part_row = yield part, middle
+                    for end, digits in part_row.items():
+                        extended.setdefault(end, []).extend(
+                            rank * base + digit for rank in ranks for digit in digits
+                        )
+                row = extended
+                if not row:
+                    break
+        elif isinstance(node, Alternation):
+            offset = 0
+            for option in node.options:
+                option_row = yield option, start
+                for end, ranks in option_row.items():
+                    row.setdefault(end, []).extend(offset + rank for rank in ranks)
+                offset += counts[id(option)]
+        elif isinstance(node, OptionalComponent):
+            component_row = yield node.component, start
+            row = {end: list(ranks) for end, ranks in component_row.items()}
+            row.setdefault(start, []).append(counts[id(node.component)])
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        return row
+
+    return sorted(_evaluate_spans(component, evaluate).get(length, []))
+
+def _probability(component: ProteinComponent, tokens: List[str]) -> float:
+    """
+    Computes the probability that sampling a component by its weights produces a structure.
+
+    The structure is matched against the tree like _ranks() does, but each node and
+    start offset records, for every end offset, the probability that the node produces
+    exactly the tokens in between. Alternation options are weighted by their share of
+    the weights, or equally if there are none, and optional components are included
+    with the probability of their weight, or one half. Every way of producing the
+    structure is summed, so duplicates add up.
+
+    Args:
+        component (ProteinComponent): The protein component to match against.
+        tokens (List[str]): The subunit IDs of the structure.
+
+    Returns:
+        float: The probability of the structure, 0.0 if it is never produced.
+    """
+    length = len(tokens)
+
+    def evaluate(node, start):
+        row = {}
+        if isinstance(node, Subunit):
+            if start < length and tokens[start] == node.id:
+                row[start + 1] = 1.0
+        elif isinstance(node, (Concatenation, Multiplicity)):
+            parts = node.components if isinstance(node, Concatenation) else [node.component] * node.count
+            row = {start: 1.0}
+            for part in parts:
+                extended = {}
+                for middle, probability in row.items():
+                    part_row = yield part, middle
+                    for end, part_probability in part_row.items():
+                        extended[end] = extended.get(end, 0.0) + probability * part_probability
+                row = extended
+                if not row:
+                    break
+        elif isinstance(node, Alternation):
+            weights = node.weights or [1.0] * len(node.options)
+            total = sum(weights)
+            for option, weight in zip(node.options, weights):
+                if not weight:
+                    continue
+                option_row = yield option, start
+                for end, probability in option_row.items():
+                    row[end] = row.get(end, 0.0) + weight / total * probability
+        elif isinstance(node, OptionalComponent):
+            included = 0.5 if node.weight is None else node.weight
+            component_row = yield node.component, start
+            row = {end: included * probability for end, probability in component_row.items()}
+            row[start] = row.get(start, 0.0) + 1 - included
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        return row
+
+    return _evaluate_spans(component, evaluate).get(length, 0.0)
+
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Turns the subunit IDs of one structure into a line of each output format
+_STRUCTURE_FORMATTERS = {
+    "text": lambda structure: " + ".join(structure) + "\n",
+    "tsv": lambda structure: "\t".join(structure) + "\n",
+    "jsonl": lambda structure: _JSON_ENCODER.encode(structure) + "\n",
+}
+
+def _write_structures(
+    structures: Iterable[List[str]], fileobj: IO, format: str, buffer_size: int
+) -> int:
+    """
+    Writes structures to a file object, one per line, in batches of about buffer_size
+    characters so that memory use does not grow with the number of structures.
+
+    Args:
+        structures (Iterable[List[str]]): The subunit IDs of each structure.
+        fileobj (IO): A text or binary file object; binary output is UTF-8.
+        format (str): "text" for "B1 + B2" lines, "tsv" for tab-separated subunit IDs,
+            or "jsonl" for a JSON array of subunit IDs per line.
+        buffer_size (int): The number of characters collected before each write.
+
+    Returns:
+        int: The number of structures written.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    formatter = _STRUCTURE_FORMATTERS.get(format)
+    if formatter is None:
+        raise ValueError(f"Unknown output format {format!r}, expected one of {sorted(_STRUCTURE_FORMATTERS)}")
+    mode = getattr(fileobj, "mode", "")
+    binary = isinstance(fileobj, (io.RawIOBase, io.BufferedIOBase)) or (isinstance(mode, str) and "b" in mode)
+    lines = []
+    buffered = written = 0
+    for structure in structures:
+        line = formatter(structure)
+        lines.append(line)
+        buffered += len(line)
+        written += 1
+        if buffered >= buffer_size:
+            text = "".join(lines)
+            fileobj.write(text.encode("utf-8") if binary else text)
+            lines = []
+            buffered = 0
+    if lines:
+        text = "".join(lines)
+        fileobj.write(text.encode("utf-8") if binary else text)
+    return written
+
+def _range_length(indices: range) -> int:
+    # len() on a range is limited to sys.maxsize, so compute it directly
+    if indices.step > 0:
+        return max(0, (indices.stop - indices.start + indices.step - 1) // indices.step)
+    return max(0, (indices.start - indices.stop - indices.step - 1) // -indices.step)
+
+class StructureSequence(abc.Sequence):
+    """
+    A lazy, read-only sequence over the structures a ProteinComponent expands to.
+
+    Like range, it never stores its elements: the structure at any position is
+    built on demand by unranking, and slicing returns another StructureSequence.
+    Positions follow the same order as ProteinParser.parse().
 
     Attributes:
-        parser (Lark): An instance of the Lark parser configured with the protein grammar.
+        component (ProteinComponent): The protein component being expanded.
     """
 
-    def __init__(self):
+    def __init__(self, component: ProteinComponent):
         """
-        Initializes the ProteinParser with the predefined grammar and transformer.
+        Initializes the sequence, counting the structures of each node of the component.
+
+        Args:
+            component (ProteinComponent): The protein component to expand.
+
+        Raises:
+            ValueError: If an unknown ProteinComponent type is encountered.
         """
-        self.parser = Lark(grammar, parser='lalr', transformer=ProteinTransformer())
+        self.component = component
+        self._counts = _structure_counts(component)
+        self._indices = range(self._counts[id(component)])
 
-    def parse(self, protein_definition: str) -> List[str]:
+    @property
+    def size(self) -> int:
         """
-        Parses a protein definition string and returns all possible protein structures.
+        The number of structures in the sequence. Unlike len(), this is not limited to sys.maxsize.
+        """
+        return _range_length(self._indices)
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, "StructureSequence"]:
+        if isinstance(key, slice):
+            view = object.__new__(StructureSequence)
+            view.component = self.component
+            view._counts = self._counts
+            view._indices = self._indices[key]
+            return view
+        return " + ".join(_unrank(self.component, self._counts, self._indices[key]))
+
+    def __contains__(self, structure: object) -> bool:
+        return isinstance(structure, str) and bool(self.rank_all(structure))
+
+    def index(self, structure: Union[str, Sequence[str]], start: int = 0, stop: Optional[int] = None) -> int:
+        """
+        Returns the first position of a structure in the sequence, found without expansion.
 
         Args:
-            protein_definition (str): The protein definition string to parse.
+            structure (Union[str, Sequence[str]]): The structure, as a string or list of subunit IDs.
+            start (int): Only consider positions from this one onwards.
+            stop (int, optional): Only consider positions before this one.
 
         Returns:
-            List[str]: A list of possible protein structures as strings.
+            int: The first position of the structure.
 
         Raises:
-            ValueError: If the protein definition is invalid or cannot be parsed.
+            ValueError: If the structure is not in the sequence.
         """
-        try:
-            # Parse the expression using Lark
-            parsed_component = self.parser.parse(protein_definition)
-            
-            # Expand all possible structures
-            expanded = self.expand_protein(parsed_component)
-            
-            # Convert to string representations
-            structures = self.structures_to_strings(expanded)
-            
-            return structures
-        except exceptions.LarkError as e:
-            raise ValueError(f"Failed to parse protein definition: {e}")
-        except ValueError as ve:
-            raise ValueError(f"Error during expansion: {ve}")
+        bounds = range(self.size)[start:stop]
+        for position in self.rank_all(structure):
+            if position in bounds:
+                return position
+        raise ValueError(f"{structure!r} is not in the sequence")
 
-    @staticmethod
-    def expand_protein(component: ProteinComponent) -> List[List[str]]:
+    def count(self, structure: Union[str, Sequence[str]]) -> int:
+        """
+        Returns how many times a structure occurs in the sequence.
+        """
+        return len(self.rank_all(structure))
+
+    def rank_all(self, structure: Union[str, Sequence[str]]) -> List[int]:
         """
-        Recursively expands a ProteinComponent into all possible structures based on its type.
+        Returns every position of a structure in the sequence, found without expansion.
 
         Args:
-            component (ProteinComponent): The protein component to expand.
+            structure (Union[str, Sequence[str]]): The structure, as a string or list of subunit IDs.
 
         Returns:
-            List[List[str]]: A list of possible protein structures, each represented as a list of subunit IDs.
+            List[int]: The positions of the structure in increasing order, empty if it does not occur.
+        """
+        indices = self._indices
+        positions = []
+        for rank in _ranks(self.component, self._counts, _structure_tokens(structure)):
+            if rank in indices:
+                positions.append((rank - indices.start) // indices.step)
+        return sorted(positions)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._indices == range(self._counts[id(self.component)]):
+            return (" + ".join(structure) for structure in _iter_expansions(self.component))
+        return (" + ".join(_unrank(self.component, self._counts, index)) for index in self._indices)
+
+    def __repr__(self) -> str:
+        return f"<StructureSequence of {format_count(self.size)} structures>"
+
+# ----------------------------
+# Expansion Limits
+# ----------------------------
+
+class ExpansionLimitError(ValueError):
+    """
+    Raised when expanding a protein definition would exceed a limit on its size or on
+    the time spent expanding it.
+
+    Attributes:
+        limit (str): The limit that was exceeded: "max_structures", "max_tokens" or "timeout".
+        structures (int): The number of structures the definition expands to.
+        tokens (int): The total number of subunits in those structures.
+
+    Both counts are exact below 2**4096, or below the limit if it is larger. Beyond
+    that they are capped at the bound, so that checking a limit never has to work out
+    an astronomically large number.
+    """
+
+    def __init__(self, message: str, limit: str, structures: int, tokens: int):
+        super().__init__(message)
+        self.limit = limit
+        self.structures = structures
+        self.tokens = tokens
+
+    def __reduce__(self):
+        # Keep every attribute when the error is sent back from a worker process
+        return self.__class__, (self.args[0], self.limit, self.structures, self.tokens)
+
+def _describe_bounded(count: int, cap: int) -> str:
+    # Describes a count computed by _bounded_totals(), which may have hit the cap
+    return f"at least {format_count(cap)}" if count >= cap else format_count(count)
+
+# How many structures are expanded between checks of the clock
+_TIMEOUT_CHECK_INTERVAL = 256
+
+# ----------------------------
+# Compiled Definitions
+# ----------------------------
+
+class CompiledDefinition:
+    """
+    A parsed protein definition, kept together with indexes derived from it so that
+    repeated operations on the same definition do not parse it again.
+
+    The component tree is normalised when compiled; it expands to the same structures,
+    in the same order, as the definition it came from. Derived indexes (structure
+    counts, the automaton and the set of subunits) are built on first use and are not
+    pickled. Compiled definitions compare equal, and hash alike, when their normalised
+    trees are the same.
+
+    Attributes:
+        component (ProteinComponent): The root component of the normalised tree.
+        definition (str): The definition text in canonical form.
+    """
+
+    def __init__(self, component: ProteinComponent):
+        """
+        Initializes the compiled definition from a component tree.
+
+        Args:
+            component (ProteinComponent): The root component of the parsed definition.
 
         Raises:
             ValueError: If an unknown ProteinComponent type is encountered.
         """
-        if isinstance(component, Subunit):
-            return [[component.id]]
-        elif isinstance(component, Concatenation):
-            left_expansions = ProteinParser.expand_protein(component.left)
-            right_expansions = ProteinParser.expand_protein(component.right)
-            # Concatenate each left expansion with each right expansion
-            return [left + right for left in left_expansions for right in right_expansions]
-        elif isinstance(component, Alternation):
-            expansions = []
-            for option in component.options:
-                expansions.extend(ProteinParser.expand_protein(option))
-            return expansions
-        elif isinstance(component, Multiplicity):
-            base_expansions = ProteinParser.expand_protein(component.component)
-            expanded = []
-            for expansion in base_expansions:
-                # Repeat the expansion 'count' times
-                repeated = []
-                for _ in range(component.count):
-                    repeated += expansion
-                expanded.append(repeated)
-            return expanded
-        elif isinstance(component, OptionalComponent):
-            # Two possibilities: include or exclude the optional component
-            included = ProteinParser.expand_protein(component.component)
-            excluded = [[]]
-            return included + excluded
-        else:
-            raise ValueError(f"Unknown ProteinComponent type: {type(component)}")
+        self.component = normalize_component(component)
+        self.definition = format_component(self.component)
+        self._reset_indexes()
+
+    def _reset_indexes(self) -> None:
+        self._sequence: Optional[StructureSequence] = None
+        self._automaton: Optional[ProteinAutomaton] = None
+        self._subunits: Optional[FrozenSet[str]] = None
+        self._token_count: Optional[int] = None
+        self._distinct_count: Optional[int] = None
+
+    def __getstate__(self) -> dict:
+        # The tree is stored flat so that pickling does not recurse through deep nesting
+        return {"component": encode_component(self.component), "definition": self.definition}
+
+    def __setstate__(self, state: dict) -> None:
+        self.component = decode_component(state["component"])
+        self.definition = state["definition"]
+        self._reset_indexes()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompiledDefinition):
+            return NotImplemented
+        return self.definition == other.definition
+
+    def __hash__(self) -> int:
+        return hash(self.definition)
+
+    def __repr__(self) -> str:
+        return f"CompiledDefinition({self.definition!r})"
+
+    @property
+    def sequence(self) -> StructureSequence:
+        """
+        A lazy sequence over the structures of the definition, which also holds the
+        structure count of every node.
+        """
+        if self._sequence is None:
+            self._sequence = StructureSequence(self.component)
+        return self._sequence
 
-    @staticmethod
-    def structures_to_strings(structures: List[List[str]]) -> List[str]:
+    @property
+    def automaton(self) -> ProteinAutomaton:
         """
-        Converts a list of protein structures from list of subunits to string representations.
+        The automaton accepting exactly the structures of the definition.
+        """
+        if self._automaton is None:
+            self._automaton = ProteinAutomaton(self.component)
+        return self._automaton
+
+    @property
+    def subunits(self) -> FrozenSet[str]:
+        """
+        The IDs of every subunit that appears in the definition.
+        """
+        if self._subunits is None:
+            self._subunits = frozenset(
+                node.id for node in iter_postorder(self.component) if isinstance(node, Subunit)
+            )
+        return self._subunits
+
+    def structures(
+        self, lazy: bool = False, timeout: Optional[float] = None, unique: bool = False
+    ) -> Union[List[str], StructureSequence]:
+        """
+        Returns all possible protein structures, as ProteinParser.parse() does.
 
         Args:
-            structures (List[List[str]]): A list of protein structures, each as a list of subunit IDs.
+            lazy (bool): Return a StructureSequence that builds structures on demand
+                instead of a list.
+            timeout (float, optional): Give up building the list after this many seconds.
+                Ignored when lazy is True.
+            unique (bool): Return each distinct structure once, in sorted order; see
+                iter_unique_structures(). Cannot be combined with lazy.
 
         Returns:
-            List[str]: A list of protein structures represented as strings with subunits concatenated by '+'.
+            Union[List[str], StructureSequence]: The possible protein structures as strings.
+
+        Raises:
+            ExpansionLimitError: If the list is not built within the timeout.
+            ValueError: If both lazy and unique are set.
         """
-        return [" + ".join(structure) for structure in structures]
+        if lazy:
+            if unique:
+                raise ValueError("unique structures cannot be returned lazily; use iter_unique_structures()")
+            return self.sequence
+        if timeout is None:
+            if unique:
+                return list(self.iter_unique_structures())
+            return ProteinParser.structures_to_strings(ProteinParser.expand_protein(self.component))
+        # Expand lazily so the clock can be checked while the list grows
+        deadline = time.monotonic() + timeout
+        structures = []
+        for structure in self.iter_structures(unique=unique):
+            if len(structures) % _TIMEOUT_CHECK_INTERVAL == 0 and time.monotonic() > deadline:
+                count, tokens = _bounded_totals(self.component, _LIMIT_COUNT_CAP)
+                raise ExpansionLimitError(
+                    f"Expansion did not finish within {timeout} seconds "
+                    f"({len(structures)} of {_describe_bounded(count, _LIMIT_COUNT_CAP)} structures built)",
+                    "timeout",
+                    count,
+                    tokens,
+                )
+            structures.append(structure)
+        return structures
+
+    def check_limits(self, max_structures: Optional[int] = None, max_tokens: Optional[int] = None) -> None:
+        """
+        Checks the size of the expansion against limits, without expanding it.
 
-# ----------------------------
-# Parsing Function to Expose to Users
-# ----------------------------
+        Args:
+            max_structures (int, optional): The largest number of structures allowed.
+            max_tokens (int, optional): The largest total number of subunits allowed,
+                summed over every structure.
 
-def parse_protein(protein_definition: str) -> List[str]:
-    """
-    Parses a protein definition string and returns all possible protein structures.
+        Raises:
+            ExpansionLimitError: If the expansion exceeds a limit.
+        """
+        if max_structures is None and max_tokens is None:
+            return
+        # Counting stops just past the larger limit, so hostile definitions whose
+        # exact counts would take gigabytes are still checked in time linear in the tree
+        cap = max(_LIMIT_COUNT_CAP, (max_structures or 0) + 1, (max_tokens or 0) + 1)
+        structures, tokens = _bounded_totals(self.component, cap)
+        if max_structures is not None and structures > max_structures:
+            raise ExpansionLimitError(
+                f"Definition expands to {_describe_bounded(structures, cap)} structures, "
+                f"more than max_structures={max_structures}",
+                "max_structures",
+                structures,
+                tokens,
+            )
+        if max_tokens is not None and tokens > max_tokens:
+            raise ExpansionLimitError(
+                f"Definition expands to {_describe_bounded(tokens, cap)} subunits in total, "
+                f"more than max_tokens={max_tokens}",
+                "max_tokens",
+                structures,
+                tokens,
+            )
+
+    def dag(self) -> StructureDAG:
+        """
+        Returns the structures of the definition as a StructureDAG, which stores them in
+        memory proportional to the size of the definition and can be iterated, counted
+        and exported.
+        """
+        return StructureDAG.from_automaton(self.automaton)
+
+    def encoded(self, vocabulary: Optional[Dict[str, int]] = None) -> EncodedStructures:
+        """
+        Returns the structures of the definition as integer subunit codes in NumPy
+        arrays, in the same order as structures().
+
+        Args:
+            vocabulary (Dict[str, int], optional): The code of each subunit ID, extended
+                in place with any new subunits. Defaults to a new vocabulary.
+
+        Returns:
+            EncodedStructures: The encoded structures.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        return expand_encoded(self.component, vocabulary)
+
+    def expand_to(self, fileobj: IO, format: str = "text", buffer_size: int = 1 << 20) -> int:
+        """
+        Writes the possible protein structures to a file object, one per line, in the
+        same order as structures(), without building them all in memory.
+
+        Args:
+            fileobj (IO): A text or binary file object; binary output is UTF-8.
+            format (str): "text", "tsv" or "jsonl"; see ProteinParser.expand_to().
+            buffer_size (int): The number of characters collected before each write.
+
+        Returns:
+            int: The number of structures written.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        return _write_structures(_iter_expansions(self.component), fileobj, format, buffer_size)
+
+    def iter_structures(self, unique: bool = False) -> Iterator[str]:
+        """
+        Lazily yields the possible protein structures, in the same order as structures(),
+        or each distinct structure once, in sorted order, if unique is True.
+        """
+        if unique:
+            return self.iter_unique_structures()
+        return (" + ".join(structure) for structure in _iter_expansions(self.component))
+
+    def iter_unique_structures(
+        self,
+        max_dfa_states: Optional[int] = 1 << 16,
+        max_in_memory: int = 1 << 20,
+        directory: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Lazily yields each distinct structure once, in sorted order of subunit IDs.
+
+        Duplicates are avoided by walking the paths of the determinized automaton, each
+        of which spells a different structure. If determinizing needs more than
+        max_dfa_states states, the structures are expanded with their duplicates and
+        deduplicated in a set instead, which is spilled to sorted runs in temporary
+        files and merged whenever it holds more than max_in_memory structures.
+
+        Args:
+            max_dfa_states (int, optional): The most DFA states to build before falling
+                back to deduplication. None always builds the whole DFA.
+            max_in_memory (int): The most distinct structures the fallback holds in memory.
+            directory (str, optional): The directory for the fallback's temporary files.
+                Defaults to the system temporary directory.
+
+        Returns:
+            Iterator[str]: An iterator over the distinct structures as strings.
+        """
+        return iter_unique_structures(
+            self.automaton,
+            lambda: (" + ".join(structure) for structure in _iter_expansions(self.component)),
+            max_dfa_states,
+            max_in_memory,
+            directory,
+        )
+
+    def count_structures(self) -> int:
+        """
+        Returns the number of possible protein structures, including duplicates.
+        """
+        return self.sequence.size
+
+    def count_distinct(self) -> int:
+        """
+        Returns the number of distinct possible protein structures, counted over the
+        minimized automaton of the definition without expanding it.
+        """
+        if self._distinct_count is None:
+            self._distinct_count = self.automaton.count_distinct()
+        return self._distinct_count
+
+    def count_tokens(self) -> int:
+        """
+        Returns the total number of subunits in all possible protein structures,
+        including duplicates, without expanding them.
+        """
+        if self._token_count is None:
+            counts = self.sequence._counts
+            self._token_count = _token_totals(self.component, counts)[id(self.component)]
+        return self._token_count
+
+    def analyze(self) -> DefinitionAnalysis:
+        """
+        Returns the minimum and maximum number of subunits in a structure, whether the
+        empty structure is possible, and the minimum and maximum copies of each subunit,
+        computed without expanding the definition.
+        """
+        return analyze_component(self.component)
+
+    def composition_counts(self) -> Dict[Tuple[Tuple[str, int], ...], int]:
+        """
+        Returns how many structures have each composition, the number of copies of each
+        subunit regardless of order, computed without expanding the definition.
+        """
+        return composition_counts_component(self.component)
+
+    def unordered(self) -> Dict[str, int]:
+        """
+        Returns the distinct multisets of subunits, each written with its subunit IDs in
+        sorted order, and the number of structures with each, without generating
+        the permutations of any multiset.
+        """
+        return unordered_structures_component(self.component)
+
+    def matches(self, structure: Union[str, Sequence[str]]) -> bool:
+        """
+        Checks whether the definition produces a structure, in time linear in its length.
+
+        Args:
+            structure (Union[str, Sequence[str]]): The structure, as a string such as
+                "B1 + B2" or a sequence of subunit IDs.
+
+        Returns:
+            bool: True if the structure is one of the definition's structures.
+        """
+        tokens = _structure_tokens(structure)
+        if not self.subunits.issuperset(tokens):
+            return False
+        return self.automaton.matches(tokens)
+
+    def sample(self, k: int, seed: Optional[Union[int, str, bytes]] = None, replace: bool = True) -> List[str]:
+        """
+        Draws k structures uniformly at random from the list structures() returns,
+        building each one directly from its drawn position.
+
+        Args:
+            k (int): The number of structures to draw.
+            seed (Union[int, str, bytes], optional): Makes the draw reproducible.
+            replace (bool): Draw with replacement; see ProteinParser.sample().
+
+        Returns:
+            List[str]: The drawn structures.
+
+        Raises:
+            ValueError: If k is negative, or larger than count_structures() without replacement.
+        """
+        sequence = self.sequence
+        return [sequence[index] for index in sample_indices(sequence.size, k, seed, replace)]
+
+    def sample_weighted(self, k: int, seed: Optional[Union[int, str, bytes]] = None) -> List[str]:
+        """
+        Draws k structures by making each choice in the definition at random with its
+        weights; see ProteinParser.sample_weighted().
+        """
+        return sample_weighted_component(self.component, k, seed)
+
+    def probability(self, structure: Union[str, Sequence[str]]) -> float:
+        """
+        Returns the probability that sample_weighted() draws a structure, computed over
+        the tree without expanding the definition.
+
+        Args:
+            structure (Union[str, Sequence[str]]): The structure, as a string such as
+                "B1 + B2" or a sequence of subunit IDs.
+
+        Returns:
+            float: The probability of the structure, 0.0 if the definition never produces it.
+        """
+        tokens = _structure_tokens(structure)
+        if not self.subunits.issuperset(tokens):
+            return 0.0
+        return _probability(self.component, tokens)
+
+    def top_k(
+        self, k: int, score: Union[Mapping[str, float], Callable[[str], float]]
+    ) -> List[Tuple[str, float]]:
+        """
+        Returns the k structures with the highest total subunit score, best first, with
+        their scores; see ProteinParser.top_k().
+        """
+        return top_k_component(self.component, self.sequence._counts, k, score)
+
+    def rank(self, structure: Union[str, Sequence[str]]) -> int:
+        """
+        Returns the first position of a structure in the order structures() returns them.
+
+        Raises:
+            ValueError: If the definition never produces the structure.
+        """
+        return self.sequence.index(structure)
+
+    def rank_all(self, structure: Union[str, Sequence[str]]) -> List[int]:
+        """
+        Returns every position of a structure in the order structures() returns them.
+        """
+        return self.sequence.rank_all(structure)
+
+# ----------------------------
+# Parse Cache
+# ----------------------------
+
+ParseCacheInfo = namedtuple("ParseCacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+# Whitespace next to these characters never changes the meaning of a definition
+_OPERATOR_SPACING = re.compile(r"\s*([+|(){}\[\]@])\s*")
+
+def normalize_definition_text(protein_definition: str) -> str:
+    """
+    Normalises the whitespace in a protein definition string, so that definitions
+    differing only in spacing share a cache key.
+
+    Whitespace around operators and brackets is removed and other runs of whitespace
+    are collapsed to a single space. The result parses to the same structures.
+
+    Args:
+        protein_definition (str): The protein definition string.
+
+    Returns:
+        str: The normalised definition string.
+    """
+    return _OPERATOR_SPACING.sub(r"\1", " ".join(protein_definition.split()))
+
+class _CacheEntry:
+    __slots__ = ("compiled", "structures")
+
+    def __init__(self, compiled: CompiledDefinition):
+        self.compiled = compiled
+        self.structures: Optional[List[str]] = None
+
+# ----------------------------
+# ProteinParser Class Definition
+# ----------------------------
+
+class ProteinParser:
+    """
+    A class to parse protein definitions and generate possible protein structures.
+
+    Attributes:
+        parser (Lark): An instance of the Lark parser configured with the protein grammar.
+        cache_size (Optional[int]): The maximum number of definitions kept in the parse
+            cache, or None if caching is disabled.
+        cache_max_structures (int): The largest number of structures for which parse()
+            results are cached alongside the compiled definition.
+        disk_cache (Optional[DiskCache]): The on-disk cache of compiled definitions
+            shared with other processes, or None if disabled.
+    """
+
+    def __init__(
+        self,
+        use_parser_table: bool = True,
+        cache_size: Optional[int] = None,
+        cache_max_structures: int = 0,
+        disk_cache: Optional[Union[str, DiskCache]] = None,
+    ):
+        """
+        Initializes the ProteinParser with the predefined grammar and transformer.
+
+        Args:
+            use_parser_table (bool): Load the pre-generated parser table shipped with the
+                package instead of compiling the grammar, when it matches the grammar.
+            cache_size (int, optional): Enable a least-recently-used cache of compiled
+                definitions holding at most this many entries. Definitions are keyed by
+                their text with whitespace normalised.
+            cache_max_structures (int): Also cache the list returned by parse() for
+                cached definitions with at most this many structures. Defaults to 0,
+                which caches compiled definitions only.
+            disk_cache (Union[str, DiskCache], optional): Also keep compiled definitions
+                (and parse() results, as limited by cache_max_structures) in an on-disk
+                cache shared between processes, given as a DiskCache or a directory.
+                Entries are keyed by the normalised definition text, the grammar and the
+                package version.
+
+        Raises:
+            ValueError: If cache_size is not positive.
+        """
+        transformer = ProteinTransformer()
+        self.parser = load_parser_table(transformer) if use_parser_table else None
+        if self.parser is None:
+            self.parser = Lark(grammar, parser='lalr', transformer=transformer)
+        if cache_size is not None and cache_size < 1:
+            raise ValueError(f"cache_size must be positive, got {cache_size}")
+        self.cache_size = cache_size
+        self.cache_max_structures = cache_max_structures
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_hits = self._cache_misses = self._cache_evictions = 0
+        if isinstance(disk_cache, str):
+            disk_cache = DiskCache(disk_cache)
+        self.disk_cache = disk_cache
+        self._disk_cache_prefix = f"{__version__}\0{grammar_digest()}\0"
+
+    def parse(
+        self,
+        protein_definition: str,
+        lazy: bool = False,
+        max_structures: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        unique: bool = False,
+    ) -> Union[List[str], StructureSequence]:
+        """
+        Parses a protein definition string and returns all possible protein structures.
+
+        A few characters of definition can describe more structures than fit in memory,
+        so definitions from untrusted sources should be parsed with limits. The size
+        limits are checked against counts computed from the parsed definition before
+        anything is expanded, and the timeout is checked while the list is built.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            lazy (bool): Return a StructureSequence that builds structures on demand
+                instead of a list.
+            max_structures (int, optional): Refuse definitions with more structures than this.
+            max_tokens (int, optional): Refuse definitions whose structures have more
+                subunits than this in total.
+            timeout (float, optional): Give up if building the list takes longer than
+                this many seconds. Ignored when lazy is True.
+            unique (bool): Return each distinct structure once, in sorted order of
+                subunit IDs, instead of every structure in expansion order. Duplicates
+                are avoided by expanding the determinized automaton of the definition,
+                falling back to a memory-bounded deduplication when the automaton is
+                too large to determinize. Cannot be combined with lazy.
+
+        Returns:
+            Union[List[str], StructureSequence]: The possible protein structures as strings.
+
+        Raises:
+            ExpansionLimitError: If the expansion exceeds one of the limits. It carries
+                the number of structures and subunits the definition expands to. The
+                size limits count duplicates, even when unique is set.
+            ValueError: If the protein definition is invalid or cannot be parsed, or
+                both lazy and unique are set.
+        """
+        compiled = None
+        if max_structures is not None or max_tokens is not None:
+            compiled = self.compile(protein_definition)
+            compiled.check_limits(max_structures, max_tokens)
+        caching = self.cache_size is not None or self.disk_cache is not None
+        if caching and self.cache_max_structures and not lazy and not unique:
+            structures = self._cached_structures(protein_definition)
+            if structures is not None:
+                return list(structures)
+        if compiled is None:
+            compiled = self.compile(protein_definition)
+        try:
+            return compiled.structures(lazy=lazy, timeout=timeout, unique=unique)
+        except ExpansionLimitError:
+            raise
+        except ValueError as ve:
+            raise ValueError(f"Error during expansion: {ve}")
+
+    def compile(self, protein_definition: str) -> CompiledDefinition:
+        """
+        Parses a protein definition string into a CompiledDefinition that can be reused
+        to count, iterate, rank and match structures without parsing the text again.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+
+        Returns:
+            CompiledDefinition: The compiled definition.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        if self.cache_size is None:
+            return self._compile_uncached(protein_definition)
+        return self._cache_entry(protein_definition).compiled
+
+    def _disk_cache_key(self, kind: str, protein_definition: str) -> str:
+        return f"{self._disk_cache_prefix}{kind}\0{normalize_definition_text(protein_definition)}"
+
+    def _compile_uncached(self, protein_definition: str) -> CompiledDefinition:
+        if self.disk_cache is None:
+            return CompiledDefinition(self.parse_component(protein_definition))
+        key = self._disk_cache_key("compiled", protein_definition)
+        compiled = self.disk_cache.get(key)
+        if not isinstance(compiled, CompiledDefinition):
+            compiled = CompiledDefinition(self.parse_component(protein_definition))
+            self.disk_cache.put(key, compiled)
+        return compiled
+
+    def _cached_structures(self, protein_definition: str) -> Optional[List[str]]:
+        # Returns the cached parse() result, computing and caching it if it is within
+        # cache_max_structures, or None if the definition has too many structures.
+        entry = self._cache_entry(protein_definition) if self.cache_size is not None else None
+        if entry is not None and entry.structures is not None:
+            return entry.structures
+        structures = None
+        if self.disk_cache is not None:
+            key = self._disk_cache_key("structures", protein_definition)
+            structures = self.disk_cache.get(key)
+            if not isinstance(structures, list):
+                structures = None
+        if structures is None:
+            compiled = entry.compiled if entry is not None else self._compile_uncached(protein_definition)
+            if compiled.count_structures() > self.cache_max_structures:
+                return None
+            structures = compiled.structures()
+            if self.disk_cache is not None:
+                self.disk_cache.put(key, structures)
+        if entry is not None:
+            entry.structures = structures
+        return structures
+
+    def _cache_entry(self, protein_definition: str) -> _CacheEntry:
+        key = normalize_definition_text(protein_definition)
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return entry
+            self._cache_misses += 1
+        # Compile outside the lock so a slow definition does not block other lookups
+        entry = _CacheEntry(self._compile_uncached(protein_definition))
+        with self._cache_lock:
+            entry = self._cache.setdefault(key, entry)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
+        return entry
+
+    def cache_info(self) -> ParseCacheInfo:
+        """
+        Returns statistics about the parse cache.
+
+        Returns:
+            ParseCacheInfo: A named tuple of hits, misses, evictions, maxsize and currsize.
+        """
+        with self._cache_lock:
+            return ParseCacheInfo(
+                self._cache_hits, self._cache_misses, self._cache_evictions, self.cache_size, len(self._cache)
+            )
+
+    def cache_clear(self) -> None:
+        """
+        Empties the parse cache and resets its statistics.
+        """
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_hits = self._cache_misses = self._cache_evictions = 0
+
+    def parse_component(self, protein_definition: str) -> ProteinComponent:
+        """
+        Parses a protein definition string into its ProteinComponent tree without expanding it.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+
+        Returns:
+            ProteinComponent: The root component of the parsed definition.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        try:
+            return self.parser.parse(protein_definition)
+        except exceptions.LarkError as e:
+            raise ValueError(f"Failed to parse protein definition: {e}")
+
+    def parse_dag(self, protein_definition: str) -> StructureDAG:
+        """
+        Parses a protein definition string and returns its possible protein structures
+        as a StructureDAG.
+
+        Structures that share a prefix or suffix share the states of the graph that
+        spell it out, so the result takes memory proportional to the size of the
+        definition, however many structures it has. Iterating over the DAG yields the
+        same structures, in the same order, as parse().
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+
+        Returns:
+            StructureDAG: The possible protein structures.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).dag()
+
+    def parse_encoded(
+        self, protein_definition: str, vocabulary: Optional[Dict[str, int]] = None
+    ) -> EncodedStructures:
+        """
+        Parses a protein definition string and returns its possible protein structures
+        with subunit IDs encoded as integers, for vectorised processing with NumPy.
+
+        The structures are expanded directly into a flat int32 array of subunit codes
+        and an array of offsets marking where each structure starts, in the same order
+        as parse(), without building a string or list per structure. Use
+        EncodedStructures.to_padded() for a 2D matrix instead.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            vocabulary (Dict[str, int], optional): The code of each subunit ID. Subunits
+                missing from it are added with the next free code, so passing the same
+                dictionary for many definitions encodes them consistently.
+
+        Returns:
+            EncodedStructures: The encoded structures.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).encoded(vocabulary)
+
+    def expand_to(
+        self, protein_definition: str, fileobj: IO, format: str = "text", buffer_size: int = 1 << 20
+    ) -> int:
+        """
+        Parses a protein definition string and writes its possible protein structures to
+        a file object, one per line, in the same order as parse().
+
+        Structures are expanded lazily and written in batches, so memory use stays
+        bounded however many structures there are.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            fileobj (IO): A text or binary file object; binary output is UTF-8.
+            format (str): "text" for lines such as "B1 + B2", "tsv" for tab-separated
+                subunit IDs, or "jsonl" for a JSON array of subunit IDs per line.
+            buffer_size (int): The number of characters collected before each write.
+
+        Returns:
+            int: The number of structures written.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed, or the
+                format is unknown.
+        """
+        return self.compile(protein_definition).expand_to(fileobj, format, buffer_size)
+
+    def iter_structures(self, protein_definition: str, unique: bool = False) -> Iterator[str]:
+        """
+        Parses a protein definition string and lazily yields its possible protein structures.
+
+        The structures are produced one at a time, in the same order as parse(), so
+        only the structure currently being built is held in memory.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            unique (bool): Yield each distinct structure once, in sorted order, as
+                parse() does with unique=True.
+
+        Returns:
+            Iterator[str]: An iterator over the possible protein structures as strings.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).iter_structures(unique=unique)
+
+    def count_structures(self, protein_definition: str) -> int:
+        """
+        Parses a protein definition string and returns how many structures parse() would
+        produce, without expanding them.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+
+        Returns:
+            int: The number of possible protein structures, including duplicates.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).count_structures()
+
+    def count_distinct(self, protein_definition: str) -> int:
+        """
+        Parses a protein definition string and returns how many distinct structures it
+        produces, without expanding them.
+
+        The definition is compiled into a deterministic automaton over subunit IDs,
+        which is minimized and then counted by dynamic programming over its acyclic
+        states. Every path through a deterministic automaton spells a different
+        structure, so duplicates are never counted. The count is exact however large
+        the expansion is, although determinizing can take many more states than the
+        definition has terms when alternatives share long prefixes.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+
+        Returns:
+            int: The number of distinct possible protein structures, as parse() with
+                unique=True would return.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).count_distinct()
+
+    def analyze(self, protein_definition: str) -> DefinitionAnalysis:
+        """
+        Parses a protein definition string and returns bounds on its structures, computed
+        by interval arithmetic over the parsed definition without expanding it.
+
+        The result gives the fewest and most subunits in any structure, whether the
+        empty structure is possible, and the fewest and most copies of each subunit ID,
+        so definitions can be filtered by size cheaply.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+
+        Returns:
+            DefinitionAnalysis: A named tuple of min_length, max_length, nullable and subunits.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).analyze()
+
+    def composition_counts(self, protein_definition: str) -> Dict[Tuple[Tuple[str, int], ...], int]:
+        """
+        Parses a protein definition string and counts its structures by composition,
+        the number of copies of each subunit regardless of their order.
+
+        The counts come from multiplying polynomials over the parsed definition, with
+        one variable per subunit ID, so they are found without enumerating the ordered
+        structures. The work grows with the number of distinct compositions rather than
+        the number of structures.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+
+        Returns:
+            Dict[Tuple[Tuple[str, int], ...], int]: The number of structures, including
+                duplicates, with each composition. A composition is a sorted tuple of
+                (subunit ID, copies) pairs, so dict(composition) turns it into a
+                dictionary such as {"B1": 2, "B2": 1}.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).composition_counts()
+
+    def parse_unordered(self, protein_definition: str) -> Dict[str, int]:
+        """
+        Parses a protein definition string and returns its structures with the order of
+        subunits ignored, for assemblies where only the subunits present matter.
+
+        Each distinct multiset of subunits is listed once, with its subunit IDs sorted,
+        together with the number of ordered structures parse() would return for it. The
+        multisets are enumerated from the composition counts, so a definition like
+        "(B1 | B2){n}" gives n + 1 results rather than 2 ** n.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+
+        Returns:
+            Dict[str, int]: The number of structures, including duplicates, with each
+                multiset, such as {"B1 + B1": 1, "B1 + B2": 2, "B2 + B2": 1}. The
+                multisets are in sorted order of their subunit lists.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).unordered()
+
+    def matches(self, protein_definition: str, structure: Union[str, Sequence[str]]) -> bool:
+        """
+        Checks whether a protein definition produces a structure, without expanding it.
+
+        The definition is compiled to an automaton over subunit IDs, so checking runs in
+        time linear in the length of the structure. To check many structures against the
+        same definition, use compile() and CompiledDefinition.matches() to avoid
+        recompiling it.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            structure (Union[str, Sequence[str]]): The structure, as a string such as
+                "B1 + B2" or a sequence of subunit IDs.
+
+        Returns:
+            bool: True if the structure is one of the definition's structures.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).matches(structure)
+
+    def sample(
+        self,
+        protein_definition: str,
+        k: int,
+        seed: Optional[Union[int, str, bytes]] = None,
+        replace: bool = True,
+    ) -> List[str]:
+        """
+        Parses a protein definition string and draws k of its structures uniformly at
+        random, without expanding it.
+
+        Every position in the list parse() would return is equally likely, so a
+        structure the definition produces twice is drawn twice as often. Each position
+        is drawn from the structure count of the definition and the structure is built
+        from it directly, as by indexing a lazy StructureSequence, so a draw takes time
+        proportional to the size of the definition rather than the number of structures.
+
+        Without replacement, the positions are the first k of a pseudorandom
+        permutation of all positions, computed one position at a time by a keyed Feistel
+        network, so no drawn position has to be remembered and k can be as large as the
+        number of structures.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            k (int): The number of structures to draw.
+            seed (Union[int, str, bytes], optional): Makes the draw reproducible. Defaults
+                to a random draw.
+            replace (bool): Draw with replacement, so the same position can be drawn
+                more than once. Set to False to draw k different positions.
+
+        Returns:
+            List[str]: The drawn structures, in the order they were drawn.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed, k is
+                negative, or k is larger than the number of structures without replacement.
+        """
+        return self.compile(protein_definition).sample(k, seed, replace)
+
+    def sample_weighted(
+        self, protein_definition: str, k: int, seed: Optional[Union[int, str, bytes]] = None
+    ) -> List[str]:
+        """
+        Parses a protein definition string and draws k structures by its weights.
+
+        Each structure is drawn by walking the parsed definition and making every choice
+        at random: an alternation picks an option in proportion to the weights written
+        after "@", such as "B1@3 | B2", and an optional component is included with the
+        probability written after it, such as "[B2]@0.9". Options without a weight have
+        a weight of 1, alternations without any weights pick uniformly and optional
+        components without a weight are included half of the time. A draw takes time
+        proportional to the size of the definition.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            k (int): The number of structures to draw.
+            seed (Union[int, str, bytes], optional): Makes the draw reproducible. Defaults
+                to a random draw.
+
+        Returns:
+            List[str]: The drawn structures, with replacement.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed, or k is negative.
+        """
+        return self.compile(protein_definition).sample_weighted(k, seed)
+
+    def probability(self, protein_definition: str, structure: Union[str, Sequence[str]]) -> float:
+        """
+        Parses a protein definition string and returns the probability that
+        sample_weighted() draws a structure, without expanding the definition.
+
+        The structure is matched against the parsed definition, multiplying the
+        probabilities of the choices along each way of producing it and adding up the
+        ways, in time polynomial in the length of the structure.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            structure (Union[str, Sequence[str]]): The structure, as a string such as
+                "B1 + B2" or a sequence of subunit IDs.
+
+        Returns:
+            float: The probability of the structure, 0.0 if the definition never produces it.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).probability(structure)
+
+    def top_k(
+        self,
+        protein_definition: str,
+        k: int,
+        score: Union[Mapping[str, float], Callable[[str], float]],
+    ) -> List[Tuple[str, float]]:
+        """
+        Parses a protein definition string and returns its k highest-scoring structures,
+        without expanding it.
+
+        The score of a structure is the sum of the scores of its subunits, such as their
+        abundances or log-likelihoods. The parsed definition is searched best-first:
+        every part keeps only its k best structures, alternations merge the lists of
+        their options and concatenations combine the lists of their parts with a
+        priority queue, so the top 100 of billions of structures are found in time
+        proportional to the size of the definition times k.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            k (int): The number of structures to return.
+            score (Union[Mapping[str, float], Callable[[str], float]]): The score of each
+                subunit ID, as a mapping such as a dict or a function.
+
+        Returns:
+            List[Tuple[str, float]]: Up to k (structure, score) pairs, best first.
+                Structures with equal scores are in the order parse() returns them, and
+                a structure the definition produces more than once is listed once for
+                each time.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed, k is
+                negative, or a subunit has no score.
+        """
+        return self.compile(protein_definition).top_k(k, score)
+
+    def rank(self, protein_definition: str, structure: Union[str, Sequence[str]]) -> int:
+        """
+        Returns the position of a structure in the list parse() would return, computed
+        from the parsed definition without expanding it.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            structure (Union[str, Sequence[str]]): The structure, as a string such as
+                "B1 + B2" or a list of subunit IDs.
+
+        Returns:
+            int: The first position of the structure.
+
+        Raises:
+            ValueError: If the protein definition is invalid, or never produces the structure.
+        """
+        return self.compile(protein_definition).rank(structure)
+
+    def rank_all(self, protein_definition: str, structure: Union[str, Sequence[str]]) -> List[int]:
+        """
+        Returns every position of a structure in the list parse() would return. A
+        structure occurs more than once when the definition can produce it in several ways.
+
+        Args:
+            protein_definition (str): The protein definition string to parse.
+            structure (Union[str, Sequence[str]]): The structure, as a string such as
+                "B1 + B2" or a list of subunit IDs.
+
+        Returns:
+            List[int]: The positions of the structure in increasing order, empty if it is never produced.
+
+        Raises:
+            ValueError: If the protein definition is invalid or cannot be parsed.
+        """
+        return self.compile(protein_definition).rank_all(structure)
+
+    @staticmethod
+    def count_component(component: ProteinComponent) -> int:
+        """
+        Counts the structures a ProteinComponent expands to in time linear in the size
+        of the tree.
+
+        Args:
+            component (ProteinComponent): The protein component to count.
+
+        Returns:
+            int: The number of possible protein structures, including duplicates.
+
+        Raises:
+            ValueError: If an unknown ProteinComponent type is encountered.
+        """
+        return _structure_counts(component)[id(component)]
+
+    @staticmethod
+    def expand_protein(component: ProteinComponent) -> List[List[str]]:
+        """
+        Expands a ProteinComponent into all possible structures based on its type.
+
+        The tree is walked bottom-up with an explicit stack, so arbitrarily deep or long
+        definitions do not hit Python's recursion limit.
+
+        Args:
+            component (ProteinComponent): The protein component to expand.
+
+        Returns:
+            List[List[str]]: A list of possible protein structures, each represented as a list of subunit IDs.
+
+        Raises:
+            ValueError: If an unknown ProteinComponent type is encountered.
+        """
+        expansions = {}
+        for node in iter_postorder(component):
+            if isinstance(node, Subunit):
+                expanded = [[node.id]]
+            elif isinstance(node, Concatenation):
+                # Build each structure in one pass from one expansion of every component
+                parts = [expansions[id(part)] for part in node.components]
+                expanded = [list(chain.from_iterable(combination)) for combination in product(*parts)]
+            elif isinstance(node, Alternation):
+                expanded = []
+                for option in node.options:
+                    expanded.extend(expansions[id(option)])
+            elif isinstance(node, Multiplicity):
+                # Each of the 'count' copies chooses its expansion independently
+                base_expansions = expansions[id(node.component)]
+                expanded = [
+                    list(chain.from_iterable(combination))
+                    for combination in product(base_expansions, repeat=node.count)
+                ]
+            elif isinstance(node, OptionalComponent):
+                # Two possibilities: include or exclude the optional component
+                expanded = expansions[id(node.component)] + [[]]
+            else:
+                raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+            expansions[id(node)] = expanded
+        return expansions[id(component)]
+
+    @staticmethod
+    def iter_expand_protein(component: ProteinComponent) -> Iterator[List[str]]:
+        """
+        Lazily expands a ProteinComponent into its possible structures, in the same
+        order as expand_protein().
+
+        Args:
+            component (ProteinComponent): The protein component to expand.
+
+        Returns:
+            Iterator[List[str]]: An iterator over the possible protein structures, each
+                represented as a list of subunit IDs.
+
+        Raises:
+            ValueError: If an unknown ProteinComponent type is encountered.
+        """
+        return (list(structure) for structure in _iter_expansions(component))
+
+    @staticmethod
+    def structures_to_strings(structures: List[List[str]]) -> List[str]:
+        """
+        Converts a list of protein structures from list of subunits to string representations.
+
+        Args:
+            structures (List[List[str]]): A list of protein structures, each as a list of subunit IDs.
+
+        Returns:
+            List[str]: A list of protein structures represented as strings with subunits concatenated by '+'.
+        """
+        return [" + ".join(structure) for structure in structures]
+
+# ----------------------------
+# Shared Parser Instance
+# ----------------------------
+
+_default_parser: Optional[ProteinParser] = None
+_default_parser_lock = threading.Lock()
+
+def get_default_parser() -> ProteinParser:
+    """
+    Returns the process-wide ProteinParser, building it on first use.
+
+    The grammar is only compiled once per process; subsequent calls return the
+    same instance. Construction is guarded by a lock so concurrent first calls
+    from several threads still build a single parser.
+
+    Returns:
+        ProteinParser: The shared parser instance.
+    """
+    global _default_parser
+    parser = _default_parser
+    if parser is None:
+        with _default_parser_lock:
+            parser = _default_parser
+            if parser is None:
+                parser = ProteinParser()
+                _default_parser = parser
+    return parser
+
+def reset_default_parser() -> None:
+    """
+    Discards the process-wide ProteinParser so that the next call to
+    get_default_parser() builds a fresh one.
+    """
+    global _default_parser
+    with _default_parser_lock:
+        _default_parser = None
+
+# ----------------------------
+# Parsing Function to Expose to Users
+# ----------------------------
+
+def parse_protein(
+    protein_definition: str,
+    lazy: bool = False,
+    max_structures: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    timeout: Optional[float] = None,
+    unique: bool = False,
+) -> Union[List[str], StructureSequence]:
+    """
+    Parses a protein definition string and returns all possible protein structures.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        lazy (bool): Return a StructureSequence that builds structures on demand
+            instead of a list.
+        max_structures (int, optional): Refuse definitions with more structures than this.
+        max_tokens (int, optional): Refuse definitions whose structures have more
+            subunits than this in total.
+        timeout (float, optional): Give up if building the list takes longer than this
+            many seconds. Ignored when lazy is True.
+        unique (bool): Return each distinct structure once, in sorted order of subunit IDs.
+
+    Returns:
+        Union[List[str], StructureSequence]: The possible protein structures as strings.
+
+    Raises:
+        ExpansionLimitError: If the expansion exceeds one of the limits.
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().parse(
+        protein_definition,
+        lazy=lazy,
+        max_structures=max_structures,
+        max_tokens=max_tokens,
+        timeout=timeout,
+        unique=unique,
+    )
+
+def compile_protein(protein_definition: str) -> CompiledDefinition:
+    """
+    Parses a protein definition string into a reusable CompiledDefinition.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+
+    Returns:
+        CompiledDefinition: The compiled definition.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().compile(protein_definition)
+
+def parse_dag(protein_definition: str) -> StructureDAG:
+    """
+    Parses a protein definition string and returns its possible protein structures as a
+    StructureDAG, whose size grows with the definition rather than the number of structures.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+
+    Returns:
+        StructureDAG: The possible protein structures.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().parse_dag(protein_definition)
+
+def parse_encoded(protein_definition: str, vocabulary: Optional[Dict[str, int]] = None) -> EncodedStructures:
+    """
+    Parses a protein definition string and returns its possible protein structures as
+    integer subunit codes in NumPy arrays, in the same order as parse_protein().
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        vocabulary (Dict[str, int], optional): The code of each subunit ID, extended in
+            place with any new subunits. Defaults to a new vocabulary.
+
+    Returns:
+        EncodedStructures: The encoded structures.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().parse_encoded(protein_definition, vocabulary)
+
+def expand_to(protein_definition: str, fileobj: IO, format: str = "text", buffer_size: int = 1 << 20) -> int:
+    """
+    Parses a protein definition string and writes its possible protein structures to a
+    file object, one per line, in the same order as parse_protein().
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        fileobj (IO): A text or binary file object; binary output is UTF-8.
+        format (str): "text", "tsv" or "jsonl".
+        buffer_size (int): The number of characters collected before each write.
+
+    Returns:
+        int: The number of structures written.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed, or the
+            format is unknown.
+    """
+    return get_default_parser().expand_to(protein_definition, fileobj, format, buffer_size)
+
+def iter_structures(protein_definition: str, unique: bool = False) -> Iterator[str]:
+    """
+    Parses a protein definition string and lazily yields its possible protein structures,
+    in the same order as parse_protein().
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        unique (bool): Yield each distinct structure once, in sorted order of subunit IDs.
+
+    Returns:
+        Iterator[str]: An iterator over the possible protein structures as strings.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().iter_structures(protein_definition, unique=unique)
+
+def count_structures(protein_definition: str) -> int:
+    """
+    Parses a protein definition string and returns how many structures parse_protein()
+    would produce, without expanding them.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+
+    Returns:
+        int: The number of possible protein structures, including duplicates.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().count_structures(protein_definition)
+
+def count_distinct(protein_definition: str) -> int:
+    """
+    Parses a protein definition string and returns how many distinct structures it
+    produces, without expanding them.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+
+    Returns:
+        int: The number of distinct possible protein structures.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().count_distinct(protein_definition)
+
+def sample(
+    protein_definition: str, k: int, seed: Optional[Union[int, str, bytes]] = None, replace: bool = True
+) -> List[str]:
+    """
+    Parses a protein definition string and draws k of its structures uniformly at random,
+    without expanding it.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        k (int): The number of structures to draw.
+        seed (Union[int, str, bytes], optional): Makes the draw reproducible.
+        replace (bool): Draw with replacement. Set to False to draw k different
+            positions of the list parse_protein() would return.
+
+    Returns:
+        List[str]: The drawn structures.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed, or k is
+            out of range.
+    """
+    return get_default_parser().sample(protein_definition, k, seed, replace)
+
+def sample_weighted(protein_definition: str, k: int, seed: Optional[Union[int, str, bytes]] = None) -> List[str]:
+    """
+    Parses a protein definition string and draws k structures by making each choice
+    at random with the weights of the definition.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        k (int): The number of structures to draw.
+        seed (Union[int, str, bytes], optional): Makes the draw reproducible.
+
+    Returns:
+        List[str]: The drawn structures.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed, or k is negative.
+    """
+    return get_default_parser().sample_weighted(protein_definition, k, seed)
+
+def probability(protein_definition: str, structure: Union[str, Sequence[str]]) -> float:
+    """
+    Parses a protein definition string and returns the probability that
+    sample_weighted() draws a structure, without expanding the definition.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        structure (Union[str, Sequence[str]]): The structure, as a string or list of subunit IDs.
+
+    Returns:
+        float: The probability of the structure.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().probability(protein_definition, structure)
+
+def top_k(
+    protein_definition: str, k: int, score: Union[Mapping[str, float], Callable[[str], float]]
+) -> List[Tuple[str, float]]:
+    """
+    Parses a protein definition string and returns its k structures with the highest
+    total subunit score, without expanding it.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        k (int): The number of structures to return.
+        score (Union[Mapping[str, float], Callable[[str], float]]): The score of each subunit ID.
+
+    Returns:
+        List[Tuple[str, float]]: Up to k (structure, score) pairs, best first.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed, k is
+            negative, or a subunit has no score.
+    """
+    return get_default_parser().top_k(protein_definition, k, score)
+
+def rank(protein_definition: str, structure: Union[str, Sequence[str]]) -> int:
+    """
+    Returns the position of a structure in the list parse_protein() would return,
+    computed from the parsed definition without expanding it.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        structure (Union[str, Sequence[str]]): The structure, as a string such as
+            "B1 + B2" or a list of subunit IDs.
+
+    Returns:
+        int: The first position of the structure.
+
+    Raises:
+        ValueError: If the protein definition is invalid, or never produces the structure.
+    """
+    return get_default_parser().rank(protein_definition, structure)
+
+def rank_all(protein_definition: str, structure: Union[str, Sequence[str]]) -> List[int]:
+    """
+    Returns every position of a structure in the list parse_protein() would return.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+        structure (Union[str, Sequence[str]]): The structure, as a string such as
+            "B1 + B2" or a list of subunit IDs.
+
+    Returns:
+        List[int]: The positions of the structure in increasing order, empty if it is never produced.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().rank_all(protein_definition, structure)
+
+def analyze(protein_definition: str) -> DefinitionAnalysis:
+    """
+    Parses a protein definition string and returns bounds on the length of its structures
+    and on the copies of each subunit, without expanding it.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+
+    Returns:
+        DefinitionAnalysis: A named tuple of min_length, max_length, nullable and subunits.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().analyze(protein_definition)
+
+def composition_counts(protein_definition: str) -> Dict[Tuple[Tuple[str, int], ...], int]:
+    """
+    Parses a protein definition string and counts its structures by composition, without
+    enumerating them.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+
+    Returns:
+        Dict[Tuple[Tuple[str, int], ...], int]: The number of structures with each
+            composition, given as a sorted tuple of (subunit ID, copies) pairs.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().composition_counts(protein_definition)
+
+def parse_unordered(protein_definition: str) -> Dict[str, int]:
+    """
+    Parses a protein definition string and returns each distinct multiset of its
+    subunits, with sorted subunit IDs, and the number of structures with it.
+
+    Args:
+        protein_definition (str): The protein definition string to parse.
+
+    Returns:
+        Dict[str, int]: The number of structures with each multiset, in sorted order.
+
+    Raises:
+        ValueError: If the protein definition is invalid or cannot be parsed.
+    """
+    return get_default_parser().parse_unordered(protein_definition)
+
+def matches(protein_definition: str, structure: Union[str, Sequence[str]]) -> bool:
+    """
+    Checks whether a protein definition produces a structure, without expanding it.
 
     Args:
         protein_definition (str): The protein definition string to parse.
+        structure (Union[str, Sequence[str]]): The structure, as a string such as
+            "B1 + B2" or a sequence of subunit IDs.
 
     Returns:
-        List[str]: A list of possible protein structures as strings.
+        bool: True if the structure is one of the definition's structures.
 
     Raises:
         ValueError: If the protein definition is invalid or cannot be parsed.
     """
-    parser = ProteinParser()
-    return parser.parse(protein_definition)
\ No newline at end of file
+    return get_default_parser().matches(protein_definition, structure)
\ No newline at end of file
@@ -0,0 +1,177 @@
+import hashlib
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Union
+
+from .components import (
+    ProteinComponent,
+    Subunit,
+    Concatenation,
+    Alternation,
+    Multiplicity,
+    OptionalComponent,
+    iter_postorder,
+)
+
+# ----------------------------
+# Index Permutation
+# ----------------------------
+
+class IndexPermutation:
+    """
+    A pseudorandom bijection of range(size) onto itself, computed one index at a time.
+
+    Indices are permuted by a balanced Feistel network over the smallest even number of
+    bits that covers size, with round functions keyed by the seed. Results that fall
+    outside range(size) are fed through the network again (cycle walking) until they
+    land inside it, which keeps the mapping a bijection and takes fewer than four
+    passes on average. Nothing is stored per index, so any prefix of the permutation
+    is a sample without replacement of any size, even from astronomically large ranges.
+
+    Attributes:
+        size (int): The number of indices permuted.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size: int, seed: Optional[Union[int, str, bytes]] = None):
+        """
+        Initializes the permutation.
+
+        Args:
+            size (int): The number of indices permuted.
+            seed (Union[int, str, bytes], optional): Selects the permutation. Defaults
+                to a random one.
+
+        Raises:
+            ValueError: If size is not positive.
+        """
+        if size < 1:
+            raise ValueError(f"size must be positive, got {size}")
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        self._half_bits = (bits + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        self._half_bytes = (self._half_bits + 7) // 8
+        rng = random.Random(seed)
+        self._keys = [rng.getrandbits(128).to_bytes(16, "big") for _ in range(self.ROUNDS)]
+
+    def _round(self, key: bytes, value: int) -> int:
+        digest = hashlib.shake_128(key + value.to_bytes(self._half_bytes, "big")).digest(self._half_bytes)
+        return int.from_bytes(digest, "big") & self._half_mask
+
+    def _encrypt(self, index: int) -> int:
+        left, right = index >> self._half_bits, index & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(key, right)
+        return (left << self._half_bits) | right
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("permutation index out of range")
+        index = self._encrypt(index)
+        while index >= self.size:
+            index = self._encrypt(index)
+        return index
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[int]:
+        return (self[index] for index in range(self.size))
+
+# ----------------------------
+# Sampling
+# ----------------------------
+
+def sample_indices(
+    size: int, k: int, seed: Optional[Union[int, str, bytes]] = None, replace: bool = True
+) -> List[int]:
+    """
+    Draws k indices uniformly at random from range(size).
+
+    Args:
+        size (int): The number of indices to draw from.
+        k (int): The number of indices to draw.
+        seed (Union[int, str, bytes], optional): Makes the draw reproducible. Defaults to
+            a random draw.
+        replace (bool): Draw with replacement, so the same index can be drawn more than
+            once. Without replacement, the indices are the first k of an
+            IndexPermutation, so no drawn index has to be remembered.
+
+    Returns:
+        List[int]: The drawn indices, in the order they were drawn.
+
+    Raises:
+        ValueError: If k is negative, or larger than size without replacement.
+    """
+    if k < 0:
+        raise ValueError(f"k must not be negative, got {k}")
+    if replace:
+        rng = random.Random(seed)
+        return [rng.randrange(size) for _ in range(k)]
+    if k > size:
+        raise ValueError(f"Cannot draw {k} indices without replacement from {size}")
+    permutation = IndexPermutation(size, seed)
+    return [permutation[index] for index in range(k)]
+
+def sample_weighted_component(
+    component: ProteinComponent, k: int, seed: Optional[Union[int, str, bytes]] = None
+) -> List[str]:
+    """
+    Draws k structures from a ProteinComponent by making each choice at random with
+    the weights of the tree.
+
+    Each alternation picks an option in proportion to its weights, or uniformly if it
+    has none, and each optional component is included with the probability given by
+    its weight, or one half if it has none. Unlike sample_indices(), this does not
+    draw uniformly from the expansion: a structure is drawn with the probability
+    ProteinParser.probability() gives it.
+
+    Args:
+        component (ProteinComponent): The protein component to draw from.
+        k (int): The number of structures to draw.
+        seed (Union[int, str, bytes], optional): Makes the draw reproducible.
+
+    Returns:
+        List[str]: The drawn structures.
+
+    Raises:
+        ValueError: If k is negative or an unknown ProteinComponent type is encountered.
+    """
+    if k < 0:
+        raise ValueError(f"k must not be negative, got {k}")
+    # The running totals of each weighted alternation, to pick options by bisection
+    totals: Dict[int, List[float]] = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Alternation) and node.weights is not None:
+            totals[id(node)] = list(accumulate(node.weights))
+    rng = random.Random(seed)
+    structures = []
+    for _ in range(k):
+        output = []
+        stack = [component]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Subunit):
+                output.append(node.id)
+            elif isinstance(node, Concatenation):
+                stack.extend(reversed(node.components))
+            elif isinstance(node, Multiplicity):
+                stack.extend([node.component] * node.count)
+            elif isinstance(node, Alternation):
+                if node.weights is None:
+                    stack.append(node.options[rng.randrange(len(node.options))])
+                else:
+                    running = totals[id(node)]
+                    index = bisect_right(running, rng.random() * running[-1])
+                    # Guard against rounding past the last option
+                    stack.append(node.options[min(index, len(node.options) - 1)])
+            elif isinstance(node, OptionalComponent):
+                if rng.random() < (0.5 if node.weight is None else node.weight):
+                    stack.append(node.component)
+            else:
+                raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        structures.append(" + ".join(output))
+    return structures
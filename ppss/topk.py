@@ -0,0 +1,110 @@
+import heapq
+from itertools import islice
+from typing import Callable, Dict, List, Mapping, Tuple, Union
+
+from .components import (
+    ProteinComponent,
+    Subunit,
+    Concatenation,
+    Alternation,
+    Multiplicity,
+    OptionalComponent,
+    iter_postorder,
+)
+
+# Each candidate is (negated score, position in the node's expansion, subunit IDs), so
+# that sorting puts the best first and breaks ties by expansion order
+Candidate = Tuple[float, int, Tuple[str, ...]]
+
+# ----------------------------
+# Best-First Enumeration
+# ----------------------------
+
+def _best_products(left: List[Candidate], right: List[Candidate], right_count: int, k: int) -> List[Candidate]:
+    # Finds the k best concatenations of a left and a right candidate. Both lists are
+    # sorted, so the best unexplored pairs are always next to explored ones: starting
+    # from the two best candidates, each popped pair pushes its two successors
+    if not left or not right:
+        return []
+    heap = [(left[0][0] + right[0][0], left[0][1] * right_count + right[0][1], 0, 0)]
+    pushed = {(0, 0)}
+    best = []
+    while heap and len(best) < k:
+        negated, index, i, j = heapq.heappop(heap)
+        best.append((negated, index, left[i][2] + right[j][2]))
+        for next_i, next_j in ((i + 1, j), (i, j + 1)):
+            if next_i < len(left) and next_j < len(right) and (next_i, next_j) not in pushed:
+                pushed.add((next_i, next_j))
+                heapq.heappush(heap, (
+                    left[next_i][0] + right[next_j][0],
+                    left[next_i][1] * right_count + right[next_j][1],
+                    next_i,
+                    next_j,
+                ))
+    return best
+
+def top_k_component(
+    component: ProteinComponent,
+    counts: Dict[int, int],
+    k: int,
+    score: Union[Mapping[str, float], Callable[[str], float]],
+) -> List[Tuple[str, float]]:
+    """
+    Finds the k highest-scoring structures of a ProteinComponent, where the score of a
+    structure is the sum of the scores of its subunits.
+
+    Every node keeps only its own k best structures, best first. A Subunit has one, an
+    Alternation merges the lists of its options, an OptionalComponent adds the empty
+    structure to its component's list, and a Concatenation or Multiplicity combines its
+    parts one at a time with a priority queue that only visits the O(k) pairs of
+    candidates that can still be among the k best. The work grows with the size of the
+    tree and k, not with the number of structures.
+
+    Args:
+        component (ProteinComponent): The protein component to search.
+        counts (Dict[int, int]): Structure counts per node, used to tell where each
+            structure sits in the expansion order.
+        k (int): The number of structures to find.
+        score (Union[Mapping[str, float], Callable[[str], float]]): The score of each
+            subunit ID, as a mapping or a function.
+
+    Returns:
+        List[Tuple[str, float]]: Up to k (structure, score) pairs, best first. Structures
+            with the same score are in the order ProteinParser.parse() returns them, and a
+            structure the definition produces more than once can appear more than once.
+
+    Raises:
+        ValueError: If k is negative, a subunit has no score, or an unknown
+            ProteinComponent type is encountered.
+    """
+    if k < 0:
+        raise ValueError(f"k must not be negative, got {k}")
+    if k == 0:
+        return []
+    subunit_score = score if callable(score) else score.__getitem__
+    best: Dict[int, List[Candidate]] = {}
+    for node in iter_postorder(component):
+        if isinstance(node, Subunit):
+            try:
+                result = [(-subunit_score(node.id), 0, (node.id,))]
+            except KeyError:
+                raise ValueError(f"No score given for subunit {node.id!r}") from None
+        elif isinstance(node, (Concatenation, Multiplicity)):
+            parts = node.components if isinstance(node, Concatenation) else [node.component] * node.count
+            result = [(0, 0, ())]
+            for part in parts:
+                result = _best_products(result, best[id(part)], counts[id(part)], k)
+        elif isinstance(node, Alternation):
+            options = []
+            offset = 0
+            for option in node.options:
+                options.append([(negated, offset + index, tokens) for negated, index, tokens in best[id(option)]])
+                offset += counts[id(option)]
+            result = list(islice(heapq.merge(*options), k))
+        elif isinstance(node, OptionalComponent):
+            empty = (0, counts[id(node.component)], ())
+            result = list(islice(heapq.merge(best[id(node.component)], [empty]), k))
+        else:
+            raise ValueError(f"Unknown ProteinComponent type: {type(node)}")
+        best[id(node)] = result
+    return [(" + ".join(tokens), 0.0 - negated) for negated, _, tokens in best[id(component)]]
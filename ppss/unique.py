@@ -0,0 +1,133 @@
+import heapq
+import tempfile
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .automaton import ProteinAutomaton
+
+# ----------------------------
+# Duplicate-Free Expansion
+# ----------------------------
+
+def iter_dfa_structures(automaton: ProteinAutomaton) -> Iterator[List[str]]:
+    """
+    Walks the DFA of an automaton depth-first, following transitions in sorted order of
+    their subunit IDs, and yields the subunit IDs of every accepted structure.
+
+    Every path through a DFA spells a different structure, so each structure is
+    yielded exactly once, in sorted order of its subunit IDs. DFA states are built on
+    demand; call ProteinAutomaton.determinize() first to bound how many there are.
+
+    Args:
+        automaton (ProteinAutomaton): The compiled automaton.
+
+    Yields:
+        List[str]: The subunit IDs of each structure. The same list is reused, so it
+            is only valid until the next structure is requested.
+    """
+    output: List[str] = []
+    if automaton.is_accepting(0):
+        yield output
+    states = [0]
+    stack = [iter(automaton.labels(0))]
+    while stack:
+        label = next(stack[-1], None)
+        if label is None:
+            stack.pop()
+            states.pop()
+            continue
+        del output[len(stack) - 1:]
+        output.append(label)
+        state = automaton.step(states[-1], label)
+        if automaton.is_accepting(state):
+            yield output
+        states.append(state)
+        stack.append(iter(automaton.labels(state)))
+
+def _write_run(structures: Iterable[str], directory: Optional[str]):
+    # Writes a sorted run of structures to a temporary file, one per line, and
+    # rewinds it for reading
+    run = tempfile.TemporaryFile("w+", encoding="utf-8", dir=directory)
+    run.writelines(structure + "\n" for structure in sorted(structures))
+    run.seek(0)
+    return run
+
+def iter_deduplicated(
+    structures: Iterable[str], max_in_memory: int = 1 << 20, directory: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Yields each distinct structure of an iterable once, in sorted order.
+
+    Structures are collected in a set. Whenever the set holds more than max_in_memory
+    structures it is sorted and written to a temporary file as a run, and the runs are
+    merged at the end, dropping duplicates, so memory stays bounded however many
+    distinct structures there are. Structures written with " + " between subunit IDs
+    sort in the same order as their lists of subunit IDs.
+
+    Args:
+        structures (Iterable[str]): The structures, possibly with duplicates.
+        max_in_memory (int): The most distinct structures held in memory at once.
+        directory (str, optional): The directory for temporary files. Defaults to the
+            system temporary directory.
+
+    Yields:
+        str: Each distinct structure, in sorted order.
+
+    Raises:
+        ValueError: If max_in_memory is not positive.
+    """
+    if max_in_memory < 1:
+        raise ValueError(f"max_in_memory must be positive, got {max_in_memory}")
+    seen = set()
+    runs = []
+    try:
+        for structure in structures:
+            seen.add(structure)
+            if len(seen) > max_in_memory:
+                runs.append(_write_run(seen, directory))
+                seen = set()
+        if not runs:
+            yield from sorted(seen)
+            return
+        runs.append(_write_run(seen, directory))
+        seen = set()
+        previous = None
+        for line in heapq.merge(*runs):
+            if line != previous:
+                previous = line
+                yield line[:-1]
+    finally:
+        for run in runs:
+            run.close()
+
+def iter_unique_structures(
+    automaton: ProteinAutomaton,
+    structures: Callable[[], Iterable[str]],
+    max_dfa_states: Optional[int] = 1 << 16,
+    max_in_memory: int = 1 << 20,
+    directory: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Yields each distinct structure an automaton accepts once, in sorted order.
+
+    The automaton is determinized first, so that the structures can be read off the
+    paths of the DFA without ever producing a duplicate. If the DFA needs more than
+    max_dfa_states states, the structures are expanded with their duplicates instead
+    and deduplicated by iter_deduplicated(), within max_in_memory structures.
+
+    Args:
+        automaton (ProteinAutomaton): The compiled automaton.
+        structures (Callable[[], Iterable[str]]): Returns the structures with their
+            duplicates, for when the DFA is too large.
+        max_dfa_states (int, optional): The most DFA states to build before falling
+            back to deduplication. None builds the whole DFA.
+        max_in_memory (int): The most distinct structures the fallback holds in memory.
+        directory (str, optional): The directory for the fallback's temporary files.
+
+    Yields:
+        str: Each distinct structure, in sorted order.
+    """
+    if automaton.determinize(max_dfa_states):
+        for tokens in iter_dfa_structures(automaton):
+            yield " + ".join(tokens)
+    else:
+        yield from iter_deduplicated(structures(), max_in_memory, directory)
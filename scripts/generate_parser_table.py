@@ -0,0 +1,49 @@
+"""
+Generates ppss/_parser_table.py, the pre-compiled LALR parser table for the protein grammar.
+
+Run from the repository root whenever the grammar in ppss/ppss.py changes:
+
+    python scripts/generate_parser_table.py
+"""
+
+import os
+import pprint
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import lark
+from lark import Lark
+from lark.grammar import Rule
+from lark.lexer import TerminalDef
+
+from ppss.ppss import grammar, grammar_digest
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "ppss", "_parser_table.py")
+
+def generate_parser_table() -> str:
+    """
+    Compiles the protein grammar and renders its serialised LALR table as Python source.
+
+    Returns:
+        str: The source of the parser table module.
+    """
+    data, memo = Lark(grammar, parser='lalr').memo_serialize([TerminalDef, Rule])
+    return "\n".join([
+        "# This file was generated by scripts/generate_parser_table.py. Do not edit it by hand.",
+        "",
+        f"GRAMMAR_SHA256 = {grammar_digest()!r}",
+        f"LARK_VERSION = {lark.__version__!r}",
+        "",
+        f"DATA = {pprint.pformat(data, width=100)}",
+        "",
+        f"MEMO = {pprint.pformat(memo, width=100)}",
+        "",
+    ])
+
+def main() -> None:
+    with open(OUTPUT, "w") as f:
+        f.write(generate_parser_table())
+
+if __name__ == "__main__":
+    main()
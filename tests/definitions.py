@@ -0,0 +1,14 @@
+# Definitions shared by the tests that check an expansion method against parse_protein().
+# Between them they cover every component type, repeated and empty structures, and a
+# structure reachable through several branches
+DEFINITIONS = [
+    "B1 + B1",
+    "(B1 + C2) | (AA23 + XYZ789)",
+    "(B1 | B2){2} + [B3]",
+    "B1 + [B2] + [B3] + B4",
+    "AA23 + (XYZ789 | BB12) + [CC34]",
+    "(B1 | C3 + [B2 + (C1 | C2)]){3} + D1{0}",
+    "(B1 | B1 + [B2]) + [B2]",
+    "C0 + (C1 + [B1] | B2 + [B3]){2}",
+    "B1{0}",
+]
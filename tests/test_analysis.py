@@ -0,0 +1,86 @@
+from collections import Counter
+import pytest
+from ppss import (
+    DefinitionAnalysis, ProteinParser, analyze, composition_counts, compile_protein, parse_protein, parse_unordered
+)
+from .definitions import DEFINITIONS
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_analysis_matches_expansion(protein_definition):
+    structures = [structure.split(" + ") if structure else [] for structure in parse_protein(protein_definition)]
+    analysis = analyze(protein_definition)
+    lengths = [len(structure) for structure in structures]
+    assert analysis.min_length == min(lengths)
+    assert analysis.max_length == max(lengths)
+    assert analysis.nullable == (0 in lengths)
+    compositions = [Counter(structure) for structure in structures]
+    present = {subunit for composition in compositions for subunit in composition}
+    assert present <= set(analysis.subunits)
+    for subunit, (fewest, most) in analysis.subunits.items():
+        copies = [composition[subunit] for composition in compositions]
+        assert (fewest, most) == (min(copies), max(copies))
+
+def test_analysis_of_huge_space():
+    analysis = ProteinParser().analyze("C1 + (B1 | B2 + B3 | B4 + [B4]){100}")
+    assert analysis == DefinitionAnalysis(101, 201, False, {
+        "C1": (1, 1), "B1": (0, 100), "B2": (0, 100), "B3": (0, 100), "B4": (0, 200),
+    })
+
+def test_analysis_subunit_order():
+    assert list(analyze("B3 + (B1 | B2) + B3").subunits) == ["B3", "B1", "B2"]
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_composition_counts_match_expansion(protein_definition):
+    expected = Counter(
+        tuple(sorted(Counter(structure.split(" + ") if structure else []).items()))
+        for structure in parse_protein(protein_definition)
+    )
+    assert composition_counts(protein_definition) == dict(expected)
+
+def test_composition_counts_example():
+    counts = ProteinParser().composition_counts("(B1 | B2){3} + [B3]")
+    assert counts[(("B1", 2), ("B2", 1))] == 3
+    assert counts[(("B1", 2), ("B2", 1), ("B3", 1))] == 3
+    assert counts[(("B1", 3),)] == 1
+    assert sum(counts.values()) == 16
+    assert len(counts) == 8
+
+def test_composition_counts_of_huge_space():
+    compiled = compile_protein("(B1 | B2 | B3){60} + [C1]")
+    counts = compiled.composition_counts()
+    assert sum(counts.values()) == compiled.count_structures()
+    assert len(counts) == 2 * 62 * 61 // 2
+    assert counts[(("B1", 60),)] == 1
+    assert counts[(("B1", 59), ("B3", 1), ("C1", 1))] == 60
+
+def test_composition_counts_of_long_definition():
+    protein_definition = " + ".join(f"B{index}" for index in range(10000))
+    assert composition_counts(protein_definition) == {
+        tuple(sorted((f"B{index}", 1) for index in range(10000))): 1
+    }
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_unordered_matches_expansion(protein_definition):
+    expected = Counter(" + ".join(sorted(structure.split(" + "))) for structure in parse_protein(protein_definition))
+    unordered = parse_unordered(protein_definition)
+    assert unordered == dict(expected)
+    assert list(unordered) == sorted(unordered, key=lambda multiset: multiset.split(" + ") if multiset else [])
+
+def test_unordered_example():
+    assert ProteinParser().parse_unordered("(B2 | B1){2} + [C1]") == {
+        "B1 + B1": 1,
+        "B1 + B1 + C1": 1,
+        "B1 + B2": 2,
+        "B1 + B2 + C1": 2,
+        "B2 + B2": 1,
+        "B2 + B2 + C1": 1,
+    }
+    assert list(parse_unordered("B3 + [B2 + B1]").items()) == [("B1 + B2 + B3", 1), ("B3", 1)]
+    assert parse_unordered("B1{0}") == {"": 1}
+
+def test_unordered_of_huge_space():
+    compiled = compile_protein("(B1 | B2){200}")
+    unordered = compiled.unordered()
+    assert len(unordered) == 201
+    assert unordered[" + ".join(["B1"] * 199 + ["B2"])] == 200
+    assert sum(unordered.values()) == 2 ** 200
@@ -0,0 +1,70 @@
+import itertools
+import pytest
+from ppss import ProteinParser, CompiledDefinition, compile_protein, count_distinct, matches, parse_protein
+from ppss.automaton import ProteinAutomaton, DEAD_STATE
+from .definitions import DEFINITIONS
+
+def all_candidates(subunits, max_length):
+    for length in range(max_length + 1):
+        for tokens in itertools.product(subunits, repeat=length):
+            yield list(tokens)
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_automaton_accepts_exactly_the_expansion(protein_definition):
+    parser = ProteinParser()
+    component = parser.parse_component(protein_definition)
+    automaton = ProteinAutomaton(component)
+    expected = {tuple(structure) for structure in parser.expand_protein(component)}
+    assert all(automaton.matches(structure) for structure in expected)
+    subunits = sorted({subunit for structure in expected for subunit in structure} | {"X"})
+    for tokens in all_candidates(subunits, 4):
+        assert automaton.matches(tokens) == (tuple(tokens) in expected)
+
+def test_matches_strings():
+    assert matches("B1 + (B2 | B3) + [B4]", "B1 + B3")
+    assert matches("B1 + (B2 | B3) + [B4]", "B1 + B2 + B4")
+    assert not matches("B1 + (B2 | B3) + [B4]", "B1 + B4")
+    assert not matches("B1 + (B2 | B3) + [B4]", "B1 + B2 + B4 + B4")
+
+def test_matches_empty_structure():
+    assert matches("B1{0}", "")
+    assert not matches("B1", "")
+
+def test_compiled_definition_matches_and_caches_dfa():
+    compiled = CompiledDefinition(ProteinParser().parse_component("(B1 | B2){30}"))
+    structure = ["B1", "B2"] * 15
+    assert compiled.matches(structure)
+    automaton = compiled.automaton
+    states = len(automaton._dfa_sets)
+    assert compiled.matches(structure[::-1])
+    assert compiled.automaton is automaton
+    assert len(automaton._dfa_sets) == states
+
+def test_dead_state():
+    automaton = ProteinAutomaton(ProteinParser().parse_component("B1 + B2"))
+    assert automaton.step(0, "B2") == DEAD_STATE
+    assert not automaton.is_accepting(DEAD_STATE)
+
+def test_matches_invalid_definition():
+    with pytest.raises(ValueError):
+        matches("[B3]", "B3")
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS + ["B1 + (B1 | B1 + B1) + [B1]"])
+def test_count_distinct_matches_expansion(protein_definition):
+    assert count_distinct(protein_definition) == len(set(parse_protein(protein_definition)))
+
+def test_minimized_dfa():
+    automaton = ProteinAutomaton(ProteinParser().parse_component("(B1 | B2){3} + [B3]"))
+    dfa = automaton.minimize()
+    assert dfa.start == len(dfa.accepting) - 1 == 4
+    assert dfa.transitions[dfa.start] == {"B1": 3, "B2": 3}
+    assert dfa.accepting == (True, True, False, False, False)
+    for state, transitions in enumerate(dfa.transitions):
+        assert all(target < state for target in transitions.values())
+
+def test_count_distinct_of_huge_space():
+    compiled = compile_protein("(B1 | B1 + [B2]){40} + [B2]")
+    assert compiled.count_structures() == 3 ** 40 * 2
+    # Each structure is 40 B1s with at most one B2 after each of them
+    assert compiled.count_distinct() == 2 ** 40 + 2 ** 39
+    assert ProteinParser().count_distinct("(B1 | B2 | B3){100}") == 3 ** 100
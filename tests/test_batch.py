@@ -0,0 +1,56 @@
+import pytest
+from ppss import BatchResult, parse_many, iter_parse_many, parse_protein
+from .definitions import DEFINITIONS
+
+# Two of these fail to parse, to check that errors come back in place
+BATCH = (DEFINITIONS + ["[B3]", "A1B2 + C#3"]) * 5
+
+def check_results(results):
+    assert [result.index for result in results] == list(range(len(BATCH)))
+    for result, definition in zip(results, BATCH):
+        assert isinstance(result, BatchResult)
+        assert result.definition == definition
+        try:
+            expected = parse_protein(definition)
+        except ValueError:
+            assert result.structures is None
+            assert isinstance(result.error, ValueError)
+        else:
+            assert result.structures == expected
+            assert result.error is None
+
+def test_parse_many_in_process():
+    check_results(parse_many(BATCH, jobs=1, chunksize=4))
+
+def test_parse_many_with_workers():
+    check_results(parse_many(iter(BATCH), jobs=2, chunksize=3))
+
+def test_iter_parse_many_unordered():
+    results = list(iter_parse_many(BATCH, jobs=2, chunksize=2, ordered=False))
+    check_results(sorted(results, key=lambda result: result.index))
+
+def test_iter_parse_many_reads_input_lazily():
+    consumed = []
+
+    def definitions():
+        # The first definition expands to many structures, so later chunks finish first
+        yield "(B1 | B2){14}"
+        for definition in BATCH * 20:
+            consumed.append(definition)
+            yield definition
+
+    results = iter_parse_many(definitions(), jobs=2, chunksize=2)
+    first = next(results)
+    assert first.index == 0
+    assert len(consumed) < 2 * 2 * 2
+    assert len(list(results)) == len(BATCH) * 20
+
+def test_parse_many_parser_options():
+    results = parse_many(BATCH, jobs=2, chunksize=5, parser_options={"cache_size": 8})
+    check_results(results)
+
+def test_parse_many_invalid_arguments():
+    with pytest.raises(ValueError):
+        iter_parse_many(BATCH, jobs=0)
+    with pytest.raises(ValueError):
+        iter_parse_many(BATCH, chunksize=0)
@@ -0,0 +1,133 @@
+import pytest
+from ppss import ProteinParser, compile_protein, parse_protein
+from ppss.components import (
+    Subunit,
+    Concatenation,
+    Alternation,
+    Multiplicity,
+    OptionalComponent,
+    encode_component,
+    decode_component,
+    format_component,
+    normalize_component,
+)
+
+B1, B2, B3, B4 = (Subunit(id=f"B{index}") for index in range(1, 5))
+
+def test_concatenation_from_left_and_right():
+    assert Concatenation(left=B1, right=B2).components == [B1, B2]
+    assert Concatenation(B1, B2) == Concatenation(components=[B1, B2])
+    concatenation = Concatenation(B1, B2)
+    assert concatenation.left is B1
+    assert concatenation.right is B2
+
+def test_concatenation_left_and_right_of_many_components():
+    concatenation = Concatenation(components=[B1, B2, B3, B4])
+    assert concatenation.right is B4
+    assert concatenation.left == Concatenation(components=[B1, B2, B3])
+    assert concatenation.left.left == Concatenation(B1, B2)
+    assert concatenation.left.left.left is B1
+
+def test_concatenation_invalid_arguments():
+    with pytest.raises(TypeError):
+        Concatenation()
+    with pytest.raises(TypeError):
+        Concatenation(left=B1)
+    with pytest.raises(TypeError):
+        Concatenation(left=B1, right=B2, components=[B1, B2])
+    with pytest.raises(ValueError):
+        Concatenation(components=[B1])
+    with pytest.raises(ValueError):
+        Concatenation(components=[])
+
+def test_parser_builds_flat_concatenations():
+    component = ProteinParser().compile("B1 + B2 + (B3 | B4) + B1").component
+    assert component == Concatenation(components=[B1, B2, Alternation(options=[B3, B4]), B1])
+
+def test_encode_concatenation_records():
+    component = Concatenation(components=[B1, Multiplicity(component=B2, count=2), B3])
+    records = encode_component(component)
+    assert records == [
+        ("subunit", "B1"),
+        ("subunit", "B2"),
+        ("multiplicity", 1, 2),
+        ("subunit", "B3"),
+        ("concatenation", [0, 2, 3]),
+    ]
+    assert decode_component(records) == component
+
+def test_decode_binary_concatenation_records():
+    records = [
+        ("subunit", "B1"),
+        ("subunit", "B2"),
+        ("concatenation", 0, 1),
+        ("subunit", "B3"),
+        ("concatenation", 2, 3),
+    ]
+    component = decode_component(records)
+    assert component == Concatenation(Concatenation(B1, B2), B3)
+    assert format_component(component) == "B1 + B2 + B3"
+
+def test_parser_builds_weights():
+    component = ProteinParser().compile("B1@3 | B2 + [B3]@0.25 | B4").component
+    assert component == Alternation(
+        options=[B1, Concatenation(B2, OptionalComponent(component=B3, weight=0.25)), B4],
+        weights=[3.0, 1.0, 1.0],
+    )
+    assert ProteinParser().compile("B1 | B2").component.weights is None
+
+@pytest.mark.parametrize("protein_definition", [
+    "B1@3 | B2",
+    "B1 + [B2]@0.9 | B3@2",
+    "(B1 + [B2])@2 | B3",
+    "C0 + (B1@0.5 | B2@1.5){2} + [B3 | B4@2]@1e-05",
+    "B1 + [B2]@0.75@4 | B3",
+])
+def test_weighted_definitions_round_trip(protein_definition):
+    compiled = compile_protein(protein_definition)
+    assert compile_protein(compiled.definition) == compiled
+    assert decode_component(encode_component(compiled.component)) == compiled.component
+    assert parse_protein(compiled.definition) == parse_protein(protein_definition)
+
+def test_weights_do_not_change_expansion():
+    assert parse_protein("B1@5 | B2 + [B3]@0@0") == parse_protein("B1 | B2 + [B3]")
+
+def test_encode_weight_records():
+    component = Alternation(options=[B1, OptionalComponent(component=B2, weight=0.5)], weights=[2.0, 1.0])
+    records = encode_component(component)
+    assert records == [
+        ("subunit", "B1"),
+        ("subunit", "B2"),
+        ("optional", 1, 0.5),
+        ("alternation", [0, 2], [2.0, 1.0]),
+    ]
+    assert decode_component(records) == component
+
+def test_normalize_merges_weighted_alternations():
+    nested = Alternation(options=[Alternation(options=[B1, B2], weights=[1.0, 3.0]), B3], weights=[2.0, 1.0])
+    assert normalize_component(nested) == Alternation(options=[B1, B2, B3], weights=[0.5, 1.5, 1.0])
+    unweighted_inside = Alternation(options=[Alternation(options=[B1, B2]), B3], weights=[1.0, 2.0])
+    assert normalize_component(unweighted_inside).weights == [0.5, 0.5, 2.0]
+    weighted_inside = Alternation(options=[Alternation(options=[B1, B2], weights=[1.0, 3.0]), B3])
+    assert normalize_component(weighted_inside).weights == [0.25, 0.75, 1.0]
+    assert format_component(normalize_component(nested)) == "B1@0.5 | B2@1.5 | B3@1"
+    uneven = Alternation(options=[B1, Alternation(options=[B2, B3])])
+    assert normalize_component(uneven).weights == [1, 0.5, 0.5]
+    even = Alternation(options=[Alternation(options=[B1, B2]), Alternation(options=[B3, B4])])
+    assert normalize_component(even).weights is None
+
+def test_invalid_weights():
+    with pytest.raises(ValueError):
+        Alternation(options=[B1, B2], weights=[1.0])
+    with pytest.raises(ValueError):
+        Alternation(options=[B1, B2], weights=[1.0, -1.0])
+    with pytest.raises(ValueError):
+        Alternation(options=[B1, B2], weights=[0.0, 0.0])
+    with pytest.raises(ValueError):
+        Alternation(options=[B1, B2], weights=[1.0, float("nan")])
+    with pytest.raises(ValueError):
+        OptionalComponent(component=B1, weight=1.5)
+    with pytest.raises(ValueError):
+        parse_protein("B1 + [B2]@2")
+    with pytest.raises(ValueError):
+        parse_protein("B1@0 | B2@0")
@@ -0,0 +1,64 @@
+import json
+import pickle
+import pytest
+from ppss import StructureDAG, ProteinParser, compile_protein, parse_dag, parse_protein
+from .definitions import DEFINITIONS
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_dag_matches_parse(protein_definition):
+    dag = parse_dag(protein_definition)
+    expected = parse_protein(protein_definition)
+    assert list(dag) == expected
+    assert [" + ".join(structure) for structure in dag.iter_subunits()] == expected
+    assert dag.size == len(dag) == len(expected)
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_dag_is_topologically_ordered(protein_definition):
+    dag = parse_dag(protein_definition)
+    assert dag.start == 0
+    assert dag.final == dag.state_count - 1
+    assert dag.edges[dag.final] == ()
+    for state, edges in enumerate(dag.edges):
+        assert all(state < target for _, target in edges)
+
+def test_dag_shares_suffixes():
+    # Both alternatives end in the same choice of [B3], which is stored once
+    dag = parse_dag("B1 + (B2 + [B3] | B4 + [B3])")
+    assert dag.state_count == 4
+    assert list(dag) == ["B1 + B2 + B3", "B1 + B2", "B1 + B4 + B3", "B1 + B4"]
+
+def test_dag_of_huge_space():
+    dag = parse_dag("(B1 | B2 | B3){15} + [C1]")
+    assert dag.size == 3 ** 15 * 2
+    assert dag.state_count <= 17
+    structures = iter(dag)
+    assert next(structures) == " + ".join(["B1"] * 15 + ["C1"])
+    assert next(structures) == " + ".join(["B1"] * 15)
+
+def test_dag_export_round_trip():
+    dag = compile_protein("(B1 | B2){2} + [B3]").dag()
+    data = json.loads(json.dumps(dag.to_dict()))
+    assert list(StructureDAG.from_dict(data)) == list(dag)
+    assert list(pickle.loads(pickle.dumps(dag))) == list(dag)
+    dot = dag.to_dot()
+    assert dot.startswith("digraph structures {")
+    assert 'label="B3"' in dot
+    assert "style=dashed" in dot
+
+def test_dag_invalid_edges():
+    with pytest.raises(ValueError):
+        StructureDAG([])
+    with pytest.raises(ValueError):
+        StructureDAG([[("B1", 1)], [("B2", 0)]])
+    with pytest.raises(ValueError):
+        StructureDAG([[("B1", 0)], []])
+
+def test_parser_parse_dag():
+    parser = ProteinParser(cache_size=4)
+    assert list(parser.parse_dag("B1 + [B2]")) == ["B1 + B2", "B1"]
+    with pytest.raises(ValueError):
+        parser.parse_dag("[B1]")
+
+def test_dag_repr():
+    assert repr(parse_dag("B1 + [B2]")) == "<StructureDAG of 2 structures in 3 states>"
+    assert repr(parse_dag("(B1 | B2){15000}")).startswith("<StructureDAG of ~2**15000 structures in ")
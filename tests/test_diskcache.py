@@ -0,0 +1,116 @@
+import os
+import time
+import pytest
+from ppss import DiskCache, ProteinParser, CompiledDefinition, __version__
+
+def test_put_and_get(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get("missing") is None
+    assert cache.get("missing", default=1) == 1
+    cache.put("key", {"value": [1, 2, 3]})
+    assert cache.get("key") == {"value": [1, 2, 3]}
+    assert DiskCache(str(tmp_path)).get("key") == {"value": [1, 2, 3]}
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("key", "value")
+    with open(cache._path("key"), "wb") as f:
+        f.write(b"not a pickle")
+    assert cache.get("key") is None
+    assert not os.path.exists(cache._path("key"))
+
+def test_entry_from_newer_pickle_protocol_is_a_miss(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("key", "value")
+    # A protocol byte this Python does not support makes pickle raise ValueError
+    with open(cache._path("key"), "wb") as f:
+        f.write(b"\x80\xff")
+    assert cache.get("key") is None
+    assert not os.path.exists(cache._path("key"))
+
+def test_opening_and_reading_do_not_scan(tmp_path, monkeypatch):
+    DiskCache(str(tmp_path)).put("key", "value")
+    scans = []
+    entries = DiskCache._entries
+
+    def counting_entries(self):
+        scans.append(self.directory)
+        return entries(self)
+
+    monkeypatch.setattr(DiskCache, "_entries", counting_entries)
+    cache = DiskCache(str(tmp_path))
+    assert cache.get("key") == "value"
+    assert scans == []
+    cache.put("other", "value")
+    cache.put("third", "value")
+    assert len(scans) == 1
+
+def test_no_temporary_files_left_behind(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for index in range(10):
+        cache.put(f"key{index}", index)
+    names = [name for _, _, names in os.walk(str(tmp_path)) for name in names]
+    assert len(names) == 10
+    assert all(name.endswith(DiskCache.SUFFIX) for name in names)
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=10 ** 6)
+    payload = b"x" * 3000
+    for index in range(4):
+        cache.put(f"key{index}", payload)
+        past = time.time() - 100 + index
+        os.utime(cache._path(f"key{index}"), (past, past))
+    assert cache.get("key0") == payload
+    cache.max_bytes = cache.size() - 1
+    cache.evict()
+    assert cache.size() <= cache.max_bytes * 9 // 10
+    assert cache.get("key1") is None
+    assert cache.get("key0") == payload
+
+def test_writes_evict_entries_already_on_disk(tmp_path):
+    payload = b"x" * 3000
+    writer = DiskCache(str(tmp_path))
+    for index in range(4):
+        writer.put(f"key{index}", payload)
+    size = writer.size()
+    cache = DiskCache(str(tmp_path), max_bytes=size)
+    cache.put("key4", payload)
+    assert cache.size() <= size * 9 // 10
+
+def test_clear(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("key", "value")
+    cache.clear()
+    assert cache.get("key") is None
+    assert cache.size() == 0
+
+def test_invalid_max_bytes(tmp_path):
+    with pytest.raises(ValueError):
+        DiskCache(str(tmp_path), max_bytes=0)
+
+def test_parser_shares_compiled_definitions_through_disk(tmp_path, monkeypatch):
+    first = ProteinParser(disk_cache=str(tmp_path))
+    compiled = first.compile("(B1 | B2){2} + [B3]")
+    second = ProteinParser(disk_cache=str(tmp_path), cache_size=8)
+
+    def fail(protein_definition):
+        raise AssertionError("definition was parsed again")
+
+    monkeypatch.setattr(second, "parse_component", fail)
+    cached = second.compile("(B1|B2){2}+[B3]")
+    assert isinstance(cached, CompiledDefinition)
+    assert cached == compiled
+    assert cached.count_structures() == 8
+
+def test_parser_caches_structures_on_disk(tmp_path, monkeypatch):
+    first = ProteinParser(disk_cache=DiskCache(str(tmp_path)), cache_max_structures=10)
+    expected = first.parse("B1 + [B2]")
+    second = ProteinParser(disk_cache=DiskCache(str(tmp_path)), cache_max_structures=10)
+    monkeypatch.setattr(second, "compile", None)
+    assert second.parse("B1 + [B2]") == expected
+
+def test_cache_key_includes_version_and_grammar(tmp_path):
+    parser = ProteinParser(disk_cache=str(tmp_path))
+    key = parser._disk_cache_key("compiled", "B1 + B2")
+    assert key.startswith(__version__)
+    assert key.endswith("B1+B2")
@@ -0,0 +1,49 @@
+import pytest
+from ppss import EncodedStructures, ProteinParser, compile_protein, parse_encoded, parse_protein
+from .definitions import DEFINITIONS
+
+numpy = pytest.importorskip("numpy")
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_encoded_matches_parse(protein_definition):
+    encoded = parse_encoded(protein_definition)
+    expected = parse_protein(protein_definition)
+    assert len(encoded) == len(expected)
+    assert [encoded.decode(index) for index in range(len(encoded))] == expected
+    assert encoded.values.dtype == numpy.int32
+    assert encoded.offsets.dtype == numpy.int64
+    assert encoded.offsets[-1] == len(encoded.values)
+
+def test_encoded_arrays():
+    encoded = parse_encoded("B1 + (B2 | B3) + [B1]")
+    assert encoded.vocabulary == ["B1", "B2", "B3"]
+    assert encoded.values.tolist() == [0, 1, 0, 0, 1, 0, 2, 0, 0, 2]
+    assert encoded.offsets.tolist() == [0, 3, 5, 8, 10]
+    assert encoded.lengths.tolist() == [3, 2, 3, 2]
+    assert encoded[1].tolist() == [0, 1]
+    assert encoded[-1].tolist() == [0, 2]
+    with pytest.raises(IndexError):
+        encoded[4]
+
+def test_encoded_padded_matrix():
+    encoded = parse_encoded("B1 + [B2] + [B3]")
+    assert encoded.to_padded().tolist() == [[0, 1, 2], [0, 1, -1], [0, 2, -1], [0, -1, -1]]
+    assert parse_encoded("B1{0}").to_padded().shape == (1, 0)
+
+def test_shared_vocabulary():
+    vocabulary = {"B3": 0}
+    first = parse_encoded("B1 + B3", vocabulary)
+    second = ProteinParser().parse_encoded("B3 + (B2 | B1)", vocabulary)
+    assert vocabulary == {"B3": 0, "B1": 1, "B2": 2}
+    assert first.values.tolist() == [1, 0]
+    assert second.values.tolist() == [0, 2, 0, 1]
+    assert second.vocabulary == ["B3", "B1", "B2"]
+
+def test_encoded_large_space():
+    compiled = compile_protein("(B1 | B2 | B3){8} + [C1]")
+    encoded = compiled.encoded()
+    assert isinstance(encoded, EncodedStructures)
+    assert len(encoded) == compiled.count_structures()
+    structures = compiled.structures(lazy=True)
+    for index in (0, 1, 777, len(encoded) - 1):
+        assert encoded.decode(index) == structures[index]
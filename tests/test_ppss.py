@@ -1,5 +1,27 @@
+import io
+import json
 import pytest
-from protein_parser import ProteinParser, parse_protein
+import pickle
+import threading
+import time
+from ppss import (
+    ProteinParser,
+    StructureSequence,
+    CompiledDefinition,
+    ExpansionLimitError,
+    parse_protein,
+    compile_protein,
+    expand_to,
+    iter_structures,
+    count_structures,
+    rank,
+    rank_all,
+    get_default_parser,
+    reset_default_parser,
+)
+from ppss.ppss import grammar_digest, load_parser_table, normalize_definition_text
+from ppss import _parser_table
+from .definitions import DEFINITIONS
 
 def test_simple_concatenation():
     protein_definition = "B1 + B1"
@@ -109,4 +131,363 @@ def test_subunits_with_no_separator():
 def test_subunits_with_invalid_characters():
     protein_definition = "A1B2 + C#3"
     with pytest.raises(ValueError):
-        parse_protein(protein_definition)
\ No newline at end of file
+        parse_protein(protein_definition)
+
+def test_multiplicity_with_multi_digit_count():
+    protein_definition = "B1{12}"
+    expected = [" + ".join(["B1"] * 12)]
+    assert parse_protein(protein_definition) == expected
+
+def test_default_parser_is_shared():
+    reset_default_parser()
+    parser = get_default_parser()
+    assert get_default_parser() is parser
+    assert parse_protein("B1 + B2") == ["B1 + B2"]
+    assert get_default_parser() is parser
+
+def test_reset_default_parser():
+    parser = get_default_parser()
+    reset_default_parser()
+    assert get_default_parser() is not parser
+
+def test_default_parser_built_once_across_threads():
+    reset_default_parser()
+    parsers = []
+    threads = [threading.Thread(target=lambda: parsers.append(get_default_parser())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(parser is parsers[0] for parser in parsers)
+
+
+def test_parser_table_matches_grammar():
+    # Regenerate with scripts/generate_parser_table.py after changing the grammar
+    assert _parser_table.GRAMMAR_SHA256 == grammar_digest()
+    assert load_parser_table() is not None
+
+def test_parser_table_agrees_with_compiled_grammar():
+    protein_definition = "(B1 | B2){2} + [B3 + (C1 | C2)] + AA23{3}"
+    from_table = ProteinParser(use_parser_table=True)
+    compiled = ProteinParser(use_parser_table=False)
+    assert from_table.parse(protein_definition) == compiled.parse(protein_definition)
+    with pytest.raises(ValueError):
+        from_table.parse("A1B2 + C#3")
+
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_iter_structures_matches_parse(protein_definition):
+    assert list(iter_structures(protein_definition)) == parse_protein(protein_definition)
+
+def test_iter_structures_is_lazy():
+    structures = iter_structures("(B1 | B2 | B3 | B4){40}")
+    assert next(structures) == " + ".join(["B1"] * 40)
+    assert next(structures) == " + ".join(["B1"] * 39 + ["B2"])
+
+def test_iter_structures_invalid_input():
+    with pytest.raises(ValueError):
+        iter_structures("[B3]")
+
+def test_iter_expand_protein_matches_expand_protein():
+    parser = ProteinParser()
+    component = parser.parse_component("(B1 | B2){2} + [B3 + B4]")
+    assert list(parser.iter_expand_protein(component)) == parser.expand_protein(component)
+
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_count_structures_matches_parse(protein_definition):
+    assert count_structures(protein_definition) == len(parse_protein(protein_definition))
+
+def test_count_structures_big_int():
+    assert count_structures("(B1 | B2 | B3){100} + [C1]") == 3 ** 100 * 2
+
+def test_count_structures_invalid_input():
+    with pytest.raises(ValueError):
+        count_structures("A1B2 + C#3")
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_lazy_parse_matches_parse(protein_definition):
+    expected = parse_protein(protein_definition)
+    structures = parse_protein(protein_definition, lazy=True)
+    assert isinstance(structures, StructureSequence)
+    assert len(structures) == len(expected)
+    assert [structures[i] for i in range(len(structures))] == expected
+    assert list(structures) == expected
+
+def test_lazy_parse_negative_index_and_slices():
+    parser = ProteinParser()
+    protein_definition = "(B1 | B2){2} + [B3]"
+    expected = parser.parse(protein_definition)
+    structures = parser.parse(protein_definition, lazy=True)
+    assert structures[-1] == expected[-1]
+    assert list(structures[2:7:2]) == expected[2:7:2]
+    assert list(structures[::-1]) == expected[::-1]
+    assert list(structures[1:][1:3]) == expected[1:][1:3]
+    with pytest.raises(IndexError):
+        structures[len(expected)]
+
+def test_lazy_parse_huge_space():
+    structures = parse_protein("(B1 | B2 | B3){60} + [C1]", lazy=True)
+    assert structures.size == 3 ** 60 * 2
+    assert structures[0] == " + ".join(["B1"] * 60 + ["C1"])
+    assert structures[structures.size - 1] == " + ".join(["B3"] * 60)
+    assert list(structures[1:3]) == [" + ".join(["B1"] * 60), " + ".join(["B1"] * 59 + ["B2", "C1"])]
+
+def test_lazy_sequence_repr():
+    assert repr(parse_protein("(B1 | B2){3}", lazy=True)) == "<StructureSequence of 8 structures>"
+    # 2 ** 15000 has too many digits for str()
+    assert repr(parse_protein("(B1 | B2){15000}", lazy=True)) == "<StructureSequence of ~2**15000 structures>"
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_rank_matches_list_index(protein_definition):
+    expected = parse_protein(protein_definition)
+    for structure in set(expected):
+        positions = [i for i, other in enumerate(expected) if other == structure]
+        assert rank_all(protein_definition, structure) == positions
+        assert rank(protein_definition, structure) == expected.index(structure)
+
+def test_rank_accepts_subunit_lists():
+    assert rank("B1 + (B2 | B3) + B4", ["B1", "B3", "B4"]) == 1
+
+def test_rank_missing_structure():
+    assert rank_all("B1 + [B2]", "B2") == []
+    with pytest.raises(ValueError):
+        rank("B1 + [B2]", "B2 + B1")
+
+def test_rank_huge_space():
+    structures = parse_protein("(B1 | B2 | B3){60} + [C1]", lazy=True)
+    position = 3 ** 59 + 12345
+    assert rank("(B1 | B2 | B3){60} + [C1]", structures[position]) == position
+
+def test_rank_long_multiplicity():
+    compiled = compile_protein("B1{2000} + [B2]")
+    assert compiled.rank(["B1"] * 2000 + ["B2"]) == 0
+    assert compiled.rank(["B1"] * 2000) == 1
+    assert compiled.rank_all(["B1"] * 1999) == []
+
+def test_lazy_sequence_index_and_contains():
+    structures = parse_protein("(B1 | B1 + [B2]) + [B2]", lazy=True)
+    assert "B1 + B2" in structures
+    assert "B2" not in structures
+    assert structures.count("B1 + B2") == 3
+    assert structures.index("B1 + B2") == 0
+    assert structures.index("B1 + B2", 1) == 3
+    assert structures[1:].index("B1 + B2") == 2
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_compiled_definition_agrees_with_parse(protein_definition):
+    compiled = ProteinParser().compile(protein_definition)
+    expected = parse_protein(protein_definition)
+    assert isinstance(compiled, CompiledDefinition)
+    assert compiled.structures() == expected
+    assert list(compiled.structures(lazy=True)) == expected
+    assert list(compiled.iter_structures()) == expected
+    assert compiled.count_structures() == len(expected)
+    assert all(compiled.matches(structure) for structure in expected)
+    assert compiled.rank(expected[-1]) == expected.index(expected[-1])
+
+def test_compiled_definition_normalises_and_hashes():
+    first = compile_protein("((B1 | (B2)) | (B3 | B4)){1} + (C1)")
+    second = compile_protein("(B1 | B2 | B3 | B4) + C1")
+    assert first.definition == "(B1 | B2 | B3 | B4) + C1"
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+    assert first != compile_protein("(B1 | B3 | B2 | B4) + C1")
+
+def test_compiled_definition_round_trips_through_canonical_text():
+    compiled = compile_protein("B1 + [B2 + (C1 | C2)] + (X{3} | Y){2}")
+    assert compile_protein(compiled.definition) == compiled
+
+def test_compiled_definition_subunits():
+    assert compile_protein("B1 + [B2] + (B1 | C3){2}").subunits == frozenset({"B1", "B2", "C3"})
+
+def test_compiled_definition_pickles():
+    compiled = compile_protein("(B1 | B2){2} + [B3]")
+    compiled.count_structures()
+    compiled.matches("B1 + B2")
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert restored == compiled
+    assert restored.structures() == compiled.structures()
+    assert restored.count_structures() == 8
+    assert restored.matches("B1 + B2")
+
+def test_normalize_definition_text():
+    assert normalize_definition_text("  ( B1 |B2 ) { 2 }\n+ [ B3 ]") == "(B1|B2){2}+[B3]"
+    # Whitespace between two subunit IDs is significant, so it is kept
+    assert normalize_definition_text("A1  B2") == "A1 B2"
+    assert normalize_definition_text("B1 @ 3 | B2 + [ B3 ] @ 0.5") == "B1@3|B2+[B3]@0.5"
+
+def test_parse_cache_hits_on_normalised_text():
+    parser = ProteinParser(cache_size=2)
+    first = parser.compile("(B1 | B2){2} + [B3]")
+    assert parser.compile("(B1|B2){2}+[B3]") is first
+    assert parser.parse(" (B1 | B2){2} +  [B3] ") == parse_protein("(B1 | B2){2} + [B3]")
+    assert parser.cache_info() == (2, 1, 0, 2, 1)
+
+def test_parse_cache_evicts_least_recently_used():
+    parser = ProteinParser(cache_size=2)
+    parser.compile("B1")
+    parser.compile("B2")
+    parser.compile("B1")
+    parser.compile("B3")
+    info = parser.cache_info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+    parser.compile("B1")
+    assert parser.cache_info().hits == 2
+    parser.compile("B2")
+    assert parser.cache_info().misses == 4
+
+def test_parse_cache_expanded_results(monkeypatch):
+    expected = parse_protein("(B1 | B2){3}")
+    expansions = []
+    structures_method = CompiledDefinition.structures
+
+    def counting_structures(self, lazy=False, timeout=None, unique=False):
+        expansions.append(self.definition)
+        return structures_method(self, lazy, timeout, unique)
+
+    monkeypatch.setattr(CompiledDefinition, "structures", counting_structures)
+    parser = ProteinParser(cache_size=4, cache_max_structures=4)
+    structures = parser.parse("B1 + [B2]")
+    structures.append("mutated")
+    assert parser.parse("B1 + [B2]") == ["B1 + B2", "B1"]
+    assert expansions == ["B1 + [B2]"]
+    # Definitions with more than cache_max_structures are expanded on every call
+    assert parser.parse("(B1 | B2){3}") == expected
+    assert parser.parse("(B1|B2){3}") == expected
+    assert expansions[1:] == ["(B1 | B2){3}"] * 2
+    info = parser.cache_info()
+    assert (info.misses, info.currsize) == (2, 2)
+
+def test_parse_cache_clear_and_errors():
+    parser = ProteinParser(cache_size=4)
+    parser.compile("B1")
+    parser.cache_clear()
+    assert parser.cache_info() == (0, 0, 0, 4, 0)
+    with pytest.raises(ValueError):
+        parser.parse("[B3]")
+    assert parser.cache_info().currsize == 0
+    with pytest.raises(ValueError):
+        ProteinParser(cache_size=0)
+
+def test_expand_long_concatenation():
+    subunits = [f"B{i}" for i in range(10000)]
+    protein_definition = " + ".join(subunits)
+    compiled = compile_protein(protein_definition)
+    assert parse_protein(protein_definition) == [protein_definition]
+    assert list(compiled.iter_structures()) == [protein_definition]
+    assert compiled.count_structures() == 1
+    assert compiled.structures(lazy=True)[0] == protein_definition
+    assert compiled.rank(subunits) == 0
+    assert compiled.matches(subunits)
+    assert pickle.loads(pickle.dumps(compiled)) == compiled
+
+def test_expand_long_concatenation_with_choices():
+    protein_definition = " + ".join(["(B1 | B2)"] * 5000 + ["[C1]"])
+    compiled = compile_protein(protein_definition)
+    assert compiled.count_structures() == 2 ** 5001
+    structures = compiled.iter_structures()
+    assert next(structures) == " + ".join(["B1"] * 5000 + ["C1"])
+    assert next(structures) == " + ".join(["B1"] * 5000)
+    last = ["B2"] * 5000
+    assert compiled.rank(last) == 2 ** 5001 - 1
+
+def test_expand_deeply_nested_definition():
+    depth = 5000
+    protein_definition = "(" * depth + "B1 | B2" + ") + B3" * depth
+    expected = [" + ".join([subunit] + ["B3"] * depth) for subunit in ["B1", "B2"]]
+    assert parse_protein(protein_definition) == expected
+    compiled = compile_protein(protein_definition)
+    assert list(compiled.iter_structures()) == expected
+    assert compiled.rank_all(expected[1]) == [1]
+    assert pickle.loads(pickle.dumps(compiled)).structures() == expected
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_expand_to_text(protein_definition):
+    output = io.StringIO()
+    written = expand_to(protein_definition, output, buffer_size=16)
+    expected = parse_protein(protein_definition)
+    assert written == len(expected)
+    assert output.getvalue() == "".join(structure + "\n" for structure in expected)
+
+def test_expand_to_formats():
+    parser = ProteinParser()
+    output = io.StringIO()
+    assert parser.expand_to("B1 + (B2 | B3) + [C1]", output, format="tsv") == 4
+    assert output.getvalue().splitlines() == ["B1\tB2\tC1", "B1\tB2", "B1\tB3\tC1", "B1\tB3"]
+    output = io.BytesIO()
+    compile_protein("B1 + [B2]").expand_to(output, format="jsonl")
+    lines = output.getvalue().decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [["B1", "B2"], ["B1"]]
+    with pytest.raises(ValueError):
+        expand_to("B1", io.StringIO(), format="csv")
+
+def test_expand_to_empty_structure():
+    output = io.StringIO()
+    assert expand_to("B1{0}", output, format="jsonl") == 1
+    assert output.getvalue() == "[]\n"
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_count_tokens(protein_definition):
+    expected = sum(len(structure) for structure in ProteinParser().iter_expand_protein(
+        compile_protein(protein_definition).component
+    ))
+    assert compile_protein(protein_definition).count_tokens() == expected
+
+def test_parse_max_structures():
+    protein_definition = "C0 + (C1 + [B1] + [B2]){8}"
+    with pytest.raises(ExpansionLimitError) as error:
+        parse_protein(protein_definition, max_structures=1000)
+    assert error.value.limit == "max_structures"
+    assert error.value.structures == 4 ** 8
+    assert error.value.tokens == compile_protein(protein_definition).count_tokens()
+    assert isinstance(error.value, ValueError)
+    assert len(parse_protein("(B1 | B2){3}", max_structures=8)) == 8
+
+def test_parse_max_tokens():
+    with pytest.raises(ExpansionLimitError) as error:
+        ProteinParser().parse("B1 + (B2 | B3){2}", max_tokens=11)
+    assert (error.value.limit, error.value.structures, error.value.tokens) == ("max_tokens", 4, 12)
+    assert len(parse_protein("B1 + (B2 | B3){2}", max_tokens=12)) == 4
+    with pytest.raises(ExpansionLimitError):
+        parse_protein("(B1 | B2){40}", lazy=True, max_tokens=10 ** 6)
+
+def test_parse_timeout():
+    with pytest.raises(ExpansionLimitError) as error:
+        parse_protein("(B1 | B2 | B3){20}", timeout=0.01)
+    assert error.value.limit == "timeout"
+    assert error.value.structures == 3 ** 20
+    assert parse_protein("B1 + [B2]", timeout=10) == ["B1 + B2", "B1"]
+
+def test_limits_on_counts_past_the_str_digit_limit():
+    # 2 ** 15000 has more than 4300 digits, too many to format with str()
+    with pytest.raises(ExpansionLimitError) as error:
+        parse_protein("(B1 | B2){15000}", max_structures=1000)
+    assert error.value.limit == "max_structures"
+    assert "~2**4096" in str(error.value)
+    assert error.value.structures == error.value.tokens == 2 ** 4096
+    with pytest.raises(ExpansionLimitError) as error:
+        compile_protein("(B1 | B2){15000}").structures(timeout=0.0)
+    assert error.value.limit == "timeout"
+
+def test_limits_on_nested_huge_multiplicities():
+    start = time.monotonic()
+    with pytest.raises(ExpansionLimitError) as error:
+        parse_protein("((B1|B2){99999999}){999}", max_structures=1000)
+    assert error.value.limit == "max_structures"
+    with pytest.raises(ExpansionLimitError) as error:
+        parse_protein("C0 + ((B1|B2){99999999}){999} + [B3]", max_tokens=10 ** 6)
+    assert error.value.limit == "max_tokens"
+    assert time.monotonic() - start < 5
+    # Exact counts below the bound are unchanged
+    with pytest.raises(ExpansionLimitError) as error:
+        parse_protein("(B1 | B2){100} + B1{0}", max_tokens=10)
+    assert error.value.structures == 2 ** 100
+    assert error.value.tokens == 100 * 2 ** 100
+
+def test_expansion_limit_error_pickles():
+    error = ExpansionLimitError("too big", "max_structures", 10, 20)
+    copy = pickle.loads(pickle.dumps(error))
+    assert (str(copy), copy.limit, copy.structures, copy.tokens) == ("too big", "max_structures", 10, 20)
@@ -0,0 +1,107 @@
+from collections import Counter
+import pytest
+from ppss import ProteinParser, compile_protein, parse_protein, probability, sample, sample_weighted
+from ppss.ppss import _probability
+from ppss.sampling import IndexPermutation, sample_indices
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 16, 17, 100, 1000])
+def test_permutation_is_bijection(size):
+    permutation = IndexPermutation(size, seed=size)
+    assert sorted(permutation) == list(range(size))
+    assert len(permutation) == size
+
+def test_permutation_depends_on_seed():
+    assert list(IndexPermutation(1000, seed=1)) == list(IndexPermutation(1000, seed=1))
+    assert list(IndexPermutation(1000, seed=1)) != list(IndexPermutation(1000, seed=2))
+    with pytest.raises(ValueError):
+        IndexPermutation(0)
+    with pytest.raises(IndexError):
+        IndexPermutation(10)[10]
+
+def test_sample_without_replacement_of_huge_space():
+    size = 3 ** 100
+    indices = sample_indices(size, 1000, seed=0, replace=False)
+    assert len(set(indices)) == 1000
+    assert all(0 <= index < size for index in indices)
+
+def test_sample_matches_lazy_sequence():
+    compiled = compile_protein("(B1 | B2 | B3){30} + [C1]")
+    structures = compiled.structures(lazy=True)
+    drawn = compiled.sample(5, seed=7)
+    assert drawn == [structures[index] for index in sample_indices(len(structures), 5, seed=7)]
+    assert drawn == sample("(B1 | B2 | B3){30} + [C1]", 5, seed=7)
+
+def test_sample_all_without_replacement():
+    protein_definition = "(B1 | B1 + [B2]) + [B2]"
+    drawn = ProteinParser().sample(protein_definition, 6, seed="all", replace=False)
+    assert Counter(drawn) == Counter(parse_protein(protein_definition))
+
+def test_sample_is_uniform():
+    drawn = Counter(sample("(B1 | B2){2}", 4000, seed=3))
+    assert set(drawn) == {"B1 + B1", "B1 + B2", "B2 + B1", "B2 + B2"}
+    assert all(800 < count < 1200 for count in drawn.values())
+
+def test_sample_invalid_k():
+    with pytest.raises(ValueError):
+        sample("B1 + [B2]", 3, replace=False)
+    with pytest.raises(ValueError):
+        sample("B1 + [B2]", -1)
+    assert sample("B1 + [B2]", 0) == []
+
+@pytest.mark.parametrize("protein_definition", [
+    "B1 | B2",
+    "B1@3 | B2 + [B3]@0.25 | B4",
+    "(B1 | B1 + [B2]@0.1) + [B2]@0.3@4 | B3@0",
+    "C0 + (B1@2 | B2){3} + [B3 | B4@3]@0.9",
+])
+def test_probabilities_sum_to_one(protein_definition):
+    structures = set(parse_protein(protein_definition))
+    assert sum(probability(protein_definition, structure) for structure in structures) == pytest.approx(1.0)
+
+def test_probability_example():
+    parser = ProteinParser()
+    assert parser.probability("B1@3 | B2", "B1") == pytest.approx(0.75)
+    assert parser.probability("B1 + [B2]@0.9", ["B1", "B2"]) == pytest.approx(0.9)
+    assert parser.probability("B1 + [B2]", "B1") == pytest.approx(0.5)
+    # All three ways of producing B1 + B2 add up
+    assert parser.probability("(B1 | B1 + [B2]@0.5) + [B2]@0.5", "B1 + B2") == pytest.approx(0.25 + 0.125 + 0.125)
+    assert parser.probability("B1@3 | B2", "B3") == 0.0
+    assert parser.probability("B1@1 | B2@0", "B2") == 0.0
+
+@pytest.mark.parametrize("protein_definition", [
+    "B1 | (B2 | B3)",
+    "(B1 | B2 | B3) | B4",
+    "((B1 | B2) | B3) + [B4 | (B5 | B6 | B7)]",
+    "(B1 | (B2 | B3)@3) | B4@2",
+])
+def test_probability_survives_flattening(protein_definition):
+    # Normalising must not change the probabilities of the tree as written
+    parsed = ProteinParser().parse_component(protein_definition)
+    compiled = compile_protein(protein_definition)
+    for structure in set(parse_protein(protein_definition)):
+        tokens = structure.split(" + ")
+        assert compiled.probability(tokens) == pytest.approx(_probability(parsed, tokens))
+
+def test_nested_alternations_compile_apart():
+    assert compile_protein("B1 | (B2 | B3)").probability("B1") == pytest.approx(0.5)
+    assert compile_protein("B1 | (B2 | B3)") != compile_protein("B1 | B2 | B3")
+    assert compile_protein("(B1 | B2) | (B3 | B4)") == compile_protein("B1 | B2 | B3 | B4")
+
+def test_probability_of_huge_space():
+    compiled = compile_protein("(B1@3 | B2){200} + [C1]@0.1")
+    assert compiled.probability(["B1"] * 200) == pytest.approx(0.75 ** 200 * 0.9)
+
+def test_sample_weighted_follows_probabilities():
+    protein_definition = "B1@3 | B2 + [B3]@0.25"
+    drawn = Counter(sample_weighted(protein_definition, 8000, seed=5))
+    for structure, count in drawn.items():
+        assert count / 8000 == pytest.approx(probability(protein_definition, structure), abs=0.02)
+    assert set(drawn) == {"B1", "B2", "B2 + B3"}
+    assert "B2" not in sample_weighted("B1@1 | B2@0", 200, seed=1)
+
+def test_sample_weighted_is_reproducible():
+    compiled = compile_protein("C0 + (B1@2 | B2){30} + [B3]")
+    assert compiled.sample_weighted(10, seed="x") == ProteinParser().sample_weighted("C0 + (B1@2 | B2){30} + [B3]", 10, seed="x")
+    assert all(compiled.matches(structure) for structure in compiled.sample_weighted(10))
+    with pytest.raises(ValueError):
+        compiled.sample_weighted(-1)
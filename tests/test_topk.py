@@ -0,0 +1,48 @@
+import math
+import pytest
+from ppss import ProteinParser, compile_protein, parse_protein, top_k
+from .definitions import DEFINITIONS
+
+SCORES = {"B1": 1.5, "B2": -0.5, "B3": 2.0, "B4": 0.0, "C0": 1.0, "C1": -1.0, "C2": 3.0, "C3": 0.5,
+          "D1": 9.0, "AA23": 2.5, "XYZ789": -2.0, "BB12": 0.25, "CC34": -1.5}
+
+def brute_force(protein_definition, k, score):
+    structures = parse_protein(protein_definition)
+    scored = [
+        (sum(score[subunit] for subunit in structure.split(" + ") if subunit), position, structure)
+        for position, structure in enumerate(structures)
+    ]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [(structure, total) for total, _, structure in scored[:k]]
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+@pytest.mark.parametrize("k", [1, 3, 100])
+def test_top_k_matches_brute_force(protein_definition, k):
+    expected = brute_force(protein_definition, k, SCORES)
+    result = top_k(protein_definition, k, SCORES)
+    assert [structure for structure, _ in result] == [structure for structure, _ in expected]
+    assert [total for _, total in result] == pytest.approx([total for _, total in expected])
+
+def test_top_k_ties_keep_expansion_order():
+    assert top_k("(B1 | B2){2}", 4, {"B1": 1, "B2": 1}) == [
+        ("B1 + B1", 2.0), ("B1 + B2", 2.0), ("B2 + B1", 2.0), ("B2 + B2", 2.0)
+    ]
+
+def test_top_k_of_huge_space():
+    compiled = compile_protein("C0 + (B1 | B2 | B3){20} + [C1]")
+    assert compiled.count_structures() > 10 ** 9
+    scores = {"C0": 0.0, "B1": math.log(0.7), "B2": math.log(0.2), "B3": math.log(0.1), "C1": math.log(0.5)}
+    best = compiled.top_k(100, scores)
+    assert len(best) == 100
+    assert best[0] == ("C0 + " + " + ".join(["B1"] * 20), pytest.approx(20 * math.log(0.7)))
+    assert best[1][0] == "C0 + " + " + ".join(["B1"] * 20 + ["C1"])
+    assert all(first[1] >= second[1] for first, second in zip(best, best[1:]))
+
+def test_top_k_score_function_and_errors():
+    parser = ProteinParser()
+    assert parser.top_k("B1 + [B22] | B333", 2, len) == [("B1 + B22", 5.0), ("B333", 4.0)]
+    assert parser.top_k("B1 + [B2]", 0, SCORES) == []
+    with pytest.raises(ValueError):
+        parser.top_k("B1 + [B2]", -1, SCORES)
+    with pytest.raises(ValueError):
+        parser.top_k("B1 + [B9]", 1, SCORES)
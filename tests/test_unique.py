@@ -0,0 +1,66 @@
+import pytest
+from ppss import ProteinParser, compile_protein, iter_structures, parse_protein
+from ppss.automaton import ProteinAutomaton
+from ppss.unique import iter_deduplicated, iter_dfa_structures
+from .definitions import DEFINITIONS
+
+DEFINITIONS = DEFINITIONS + ["B1 + (B1 | B1 + B1) + [B10]"]
+
+def sorted_unique(protein_definition):
+    return sorted(set(parse_protein(protein_definition)))
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_unique_matches_deduplicated_parse(protein_definition):
+    expected = sorted_unique(protein_definition)
+    assert parse_protein(protein_definition, unique=True) == expected
+    assert list(iter_structures(protein_definition, unique=True)) == expected
+
+@pytest.mark.parametrize("protein_definition", DEFINITIONS)
+def test_unique_fallback_matches_dfa(protein_definition):
+    compiled = compile_protein(protein_definition)
+    expected = sorted_unique(protein_definition)
+    assert list(compiled.iter_unique_structures(max_dfa_states=0)) == expected
+    assert list(compiled.iter_unique_structures(max_dfa_states=0, max_in_memory=1)) == expected
+
+def test_unique_example():
+    parser = ProteinParser()
+    assert parser.parse("(B1 | B1 + [B2]) + [B2]") == ["B1 + B2", "B1", "B1 + B2 + B2", "B1 + B2", "B1 + B2", "B1"]
+    assert parser.parse("(B1 | B1 + [B2]) + [B2]", unique=True) == ["B1", "B1 + B2", "B1 + B2 + B2"]
+
+def test_unique_sorts_by_subunit_ids():
+    # "B1 + B2" sorts before "B10" because B1 sorts before B10
+    assert parse_protein("(B10 | B1 + B2 | B1)", unique=True) == ["B1", "B1 + B2", "B10"]
+
+def test_unique_of_huge_space():
+    compiled = compile_protein("(B1 | B1 + [B2]){12}")
+    assert compiled.count_structures() == 3 ** 12
+    structures = compiled.iter_structures(unique=True)
+    assert next(structures) == " + ".join(["B1"] * 12)
+    assert next(structures) == " + ".join(["B1"] * 12 + ["B2"])
+    assert compiled.automaton.dfa_state_count < 200
+
+def test_unique_with_timeout_and_limits():
+    parser = ProteinParser(cache_size=4)
+    assert parser.parse("B1 + [B1] + [B1]", unique=True, timeout=10, max_structures=4) == [
+        "B1", "B1 + B1", "B1 + B1 + B1"
+    ]
+    with pytest.raises(ValueError):
+        parser.parse("B1 + [B2]", lazy=True, unique=True)
+
+def test_dfa_structures_reuse_list():
+    automaton = ProteinAutomaton(ProteinParser().parse_component("B1 + [B2 + [B3]]"))
+    assert automaton.determinize()
+    assert [list(tokens) for tokens in iter_dfa_structures(automaton)] == [["B1"], ["B1", "B2"], ["B1", "B2", "B3"]]
+
+def test_determinize_limit():
+    automaton = ProteinAutomaton(ProteinParser().parse_component("(B1 | B2) + B3"))
+    assert not automaton.determinize(max_states=1)
+    assert automaton.determinize()
+    assert automaton.determinize(max_states=automaton.dfa_state_count)
+
+def test_deduplicated_spills_to_disk(tmp_path):
+    structures = [f"B{index % 7}" for index in range(100)]
+    assert list(iter_deduplicated(structures, max_in_memory=2, directory=str(tmp_path))) == sorted(set(structures))
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(ValueError):
+        list(iter_deduplicated(structures, max_in_memory=0))